@@ -2,11 +2,21 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from pathlib import Path
 
 import click
 
-from .core.config import config_dict, configuration_file  # noqa: F401
+from .core.alternate import alternate_stats
+from .core.client import stats
+from .core.compress import write_export
+from .core.config import (
+    config_dict,  # noqa: F401
+    configuration_file,  # noqa: F401
+    validate_store_config,
+)
+from .core.download import download, response_file_name
+from .core.stream import NotHTMLError
 from .core.website import Website
 from .tui.tui import main as tui_main
 
@@ -65,9 +75,63 @@ def list_websites() -> None:
     click.echo(f"\nTotal: {len(websites_info)} websites supported\n")
 
 
-@click.command(
-    help="Read newspaper articles in textual format. Launches TUI by default."
+def show_progress(done: int, total: int | None) -> None:
+    """Display the progress of a download on stderr."""
+    if total:
+        message = f"{done / 2**20:.1f}/{total / 2**20:.1f} MB"
+        message += f" ({100 * done // total}%)"
+    else:
+        message = f"{done / 2**20:.1f} MB"
+    click.echo(f"\r{message}", nl=False, err=True)
+
+
+def store_enabled(store: bool | None) -> bool:
+    """Whether articles should be stored, defaulting to the configuration."""
+    if store is None:
+        return validate_store_config().enabled
+    return store
+
+
+def setup_logging(verbose: int) -> None:
+    """Configure logging according to the verbosity level."""
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(levelname)s: %(message)s",
+    )
+    logger = logging.getLogger()
+
+    if verbose == 1:
+        logger.setLevel(logging.INFO)
+    elif verbose > 1:
+        logger.setLevel(logging.DEBUG)
+
+
+class KiosqueGroup(click.Group):
+    """Command group falling back to the ``read`` command.
+
+    ``kiosque <url_or_alias>`` is a shortcut for ``kiosque read
+    <url_or_alias>``, and ``kiosque`` alone launches the TUI.
+    """
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] != "--help":
+            args = ["read", *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(
+    cls=KiosqueGroup,
+    invoke_without_command=True,
+    help="Read newspaper articles in textual format. Launches TUI by default.",
 )
+@click.pass_context
+def main(ctx: click.Context) -> None:
+    # Launch TUI by default when no arguments provided
+    if ctx.invoked_subcommand is None:
+        tui_main()
+
+
+@main.command(help="Read an article, or download the latest issue (alias).")
 @click.argument("url_or_alias", required=False)
 @click.argument("output", type=click.File("w"), required=False, default=None)
 @click.option("-v", "--verbose", count=True, help="Verbosity level")
@@ -77,11 +141,25 @@ def list_websites() -> None:
     is_flag=True,
     help="List all supported websites",
 )
-def main(
+@click.option(
+    "--segments",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of parallel segments when downloading issues",
+)
+@click.option(
+    "--store/--no-store",
+    default=None,
+    help="Store the article in the database (default: configuration)",
+)
+def read(
     url_or_alias: str | None,
     output: Path | None,
     verbose: int,
     show_list: bool,
+    segments: int,
+    store: bool | None,
 ) -> None:
     # Handle --list-websites flag
     if show_list:
@@ -93,48 +171,40 @@ def main(
         tui_main()
         return
 
-    # Configure logging
-    logging.basicConfig(
-        level=logging.WARNING,
-        format="%(levelname)s: %(message)s",
-    )
-    logger = logging.getLogger()
-
-    if verbose == 1:
-        logger.setLevel(logging.INFO)
-    elif verbose > 1:
-        logger.setLevel(logging.DEBUG)
+    setup_logging(verbose)
 
     if isinstance(output, str):
         output = Path(output)
 
-    library: dict[str, type[Website]] = dict()
-
-    for key, value in config_dict.items():
-        if not key.startswith("http"):
-            continue
-
-        logging.debug(f"Parsing configuration for {key}")
-        if not key.endswith("/"):
-            key += "/"
-
-        library[key] = website = Website.instance(key).__class__
-
-        if "alias" in value:
-            for alias in value["alias"].split(","):
-                logging.debug(f"Setting alias '{alias}' for {website}")
-                website.alias.append(alias)
-
-            for alias in website.alias:
-                library[alias] = website
-
+    # Aliases are resolved from a static index: the website module is only
+    # imported when its alias (or one of its URLs) is actually used.
+    library = Website.aliases()
     logging.debug(f"List of aliases: {library}")
 
     try:
         if url_or_alias == "tui":
             tui_main()
         elif url_or_alias in library:
-            library[url_or_alias]().save_latest_issue()
+            instance = Website.instance(url_or_alias)
+            instance.save_latest_issue(
+                segments=segments, progress=show_progress
+            )
+            click.echo(err=True)
+        elif store_enabled(store):
+            from .core.batch import extract_article
+            from .core.store import ArticleStore
+
+            extraction = extract_article(url_or_alias, signed=True)
+            article = extraction.article
+            with ArticleStore() as article_store:
+                article_store.add(article)
+            if output is None:
+                path = write_export(
+                    extraction.file_name, article.text, article.url
+                )
+                logging.warning(f"Export to {path.absolute()}")
+            else:
+                output.write(article.text)  # type: ignore
         elif output is None or isinstance(output, Path):
             instance = Website.instance(url_or_alias)
             instance.write_text(url_or_alias, output)
@@ -143,6 +213,22 @@ def main(
             instance = Website.instance(url_or_alias)
             content = instance.full_text(url_or_alias)
             output.write(content)
+    except NotHTMLError as e:
+        # Route PDF files, images, etc. to a plain download
+        logging.warning(f"{e}, downloading it instead")
+        try:
+            path = download(
+                e.url, Path("."), response_file_name, progress=show_progress
+            )
+        except Exception as download_error:
+            logging.error(f"Failed to download {e.url}: {download_error}")
+            if verbose > 0:
+                raise
+            raise click.ClickException(
+                f"Failed to download {e.url}: {download_error}"
+            )
+        click.echo(err=True)
+        click.echo(f"Downloaded {path}")
     except ValueError as e:
         logging.error(str(e))
         raise click.ClickException(str(e))
@@ -157,3 +243,340 @@ def main(
             raise click.ClickException(
                 f"An error occurred. Use -v for more details: {e}"
             )
+    finally:
+        logging.debug(f"HTTP connections: {stats}")
+        logging.debug(f"Alternate pages: {alternate_stats}")
+
+
+@main.command(help="Download new PDF issues of all configured publications.")
+@click.option(
+    "-d",
+    "--directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("."),
+    show_default=True,
+    help="Directory where issues are stored",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="First day to download, for publications with dated URLs",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="Last day to download (default: today)",
+)
+@click.option(
+    "--segments",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of parallel segments for each download",
+)
+@click.option("-v", "--verbose", count=True, help="Verbosity level")
+def issues(
+    directory: Path,
+    since: datetime | None,
+    until: datetime | None,
+    segments: int,
+    verbose: int,
+) -> None:
+    from .core.issues import sync_issues
+
+    setup_logging(verbose)
+
+    if since is not None and until is not None and until < since:
+        raise click.BadParameter("--until must not be before --since")
+
+    downloaded = sync_issues(directory, since, until, segments=segments)
+    logging.debug(f"HTTP connections: {stats}")
+    for path in downloaded:
+        click.echo(f"Downloaded {path}")
+    if not downloaded:
+        click.echo("No new issue")
+
+
+@main.command(
+    help="Print the metadata of articles as JSON lines, reading only the "
+    "<head> of each page. URLs are read from stdin if none is given."
+)
+@click.argument("urls", nargs=-1)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Number of concurrent requests",
+)
+@click.option("-v", "--verbose", count=True, help="Verbosity level")
+def meta(urls: tuple[str, ...], jobs: int, verbose: int) -> None:
+    import json
+
+    from .core.meta import iter_metadata
+
+    setup_logging(verbose)
+
+    if not urls:
+        stdin = click.get_text_stream("stdin")
+        urls = tuple(line.strip() for line in stdin if line.strip())
+
+    for record in iter_metadata(urls, jobs=jobs):
+        click.echo(json.dumps(record, ensure_ascii=False))
+    logging.debug(f"HTTP connections: {stats}")
+
+
+@main.command(help="Extract many articles, read from stdin if none is given.")
+@click.argument("urls", nargs=-1)
+@click.option(
+    "-d",
+    "--directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory where Markdown files are written",
+)
+@click.option(
+    "--store/--no-store",
+    default=None,
+    help="Store articles in the database (default: configuration)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Extract articles even if they are already stored or exported",
+)
+@click.option(
+    "--skip-duplicates",
+    is_flag=True,
+    help="Skip near-duplicates of stored or already extracted articles",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Number of concurrent extractions",
+)
+@click.option("-v", "--verbose", count=True, help="Verbosity level")
+def batch(
+    urls: tuple[str, ...],
+    directory: Path | None,
+    store: bool | None,
+    force: bool,
+    skip_duplicates: bool,
+    jobs: int,
+    verbose: int,
+) -> None:
+    from .core.batch import run_batch
+    from .core.store import ArticleStore
+
+    setup_logging(verbose)
+
+    if not urls:
+        stdin = click.get_text_stream("stdin")
+        urls = tuple(line.strip() for line in stdin if line.strip())
+
+    if not store_enabled(store) and directory is None:
+        raise click.UsageError("Nothing to do: use --store and/or --directory")
+
+    article_store = ArticleStore() if store_enabled(store) else None
+    try:
+        result = run_batch(
+            urls,
+            directory=directory,
+            store=article_store,
+            jobs=jobs,
+            force=force,
+            skip_duplicates=skip_duplicates,
+        )
+    finally:
+        if article_store is not None:
+            article_store.close()
+    logging.debug(f"HTTP connections: {stats}")
+
+    click.echo(
+        f"{result.extracted} extracted, {len(result.unchanged)} unchanged, "
+        f"{len(result.skipped)} skipped, {len(result.failed)} failed"
+    )
+    if result.failed:
+        raise SystemExit(1)
+
+
+@main.command(help="Search the stored articles (SQLite FTS5 query syntax).")
+@click.argument("query")
+@click.option(
+    "-n",
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Maximum number of results",
+)
+def search(query: str, limit: int) -> None:
+    from .core.store import ArticleStore
+
+    with ArticleStore() as article_store:
+        try:
+            results = article_store.search(query, limit=limit)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for result in results:
+        click.echo(f"{result.id:>6}  {result.date or '':10}  {result.title}")
+        click.echo(f"        {result.url}")
+        click.echo(f"        {' '.join(result.snippet.split())}")
+
+
+@main.command(help="Print a stored article, by id or URL.")
+@click.argument("id_or_url")
+def show(id_or_url: str) -> None:
+    from .core.store import ArticleStore
+
+    with ArticleStore() as article_store:
+        key: int | str = int(id_or_url) if id_or_url.isdigit() else id_or_url
+        if isinstance(key, str):
+            from .core.batch import article_key
+
+            key = article_key(key)
+        article = article_store.get(key)
+    if article is None:
+        raise click.ClickException(f"No stored article for {id_or_url}")
+    click.echo(article.text)
+
+
+@main.command(
+    help="Extract archived articles again with the current website rules, "
+    "without network access (all archived articles if no URL is given)."
+)
+@click.argument("urls", nargs=-1)
+@click.option(
+    "--archive-dir",
+    type=click.Path(file_okay=False, exists=True, path_type=Path),
+    default=None,
+    help="Directory of the WARC files (default: configuration)",
+)
+@click.option(
+    "-d",
+    "--directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory where Markdown files are written",
+)
+@click.option(
+    "--store/--no-store",
+    default=None,
+    help="Store articles in the database (default: configuration)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes (default: number of CPUs)",
+)
+@click.option("-v", "--verbose", count=True, help="Verbosity level")
+def reextract(
+    urls: tuple[str, ...],
+    archive_dir: Path | None,
+    directory: Path | None,
+    store: bool | None,
+    jobs: int | None,
+    verbose: int,
+) -> None:
+    from .core.archive import archive_directory
+    from .core.batch import reextract as reextract_articles
+    from .core.store import ArticleStore
+
+    setup_logging(verbose)
+
+    if not store_enabled(store) and directory is None:
+        raise click.UsageError("Nothing to do: use --store and/or --directory")
+
+    article_store = ArticleStore() if store_enabled(store) else None
+    try:
+        result = reextract_articles(
+            archive_dir or archive_directory(),
+            urls or None,
+            directory=directory,
+            store=article_store,
+            jobs=jobs,
+        )
+    finally:
+        if article_store is not None:
+            article_store.close()
+
+    click.echo(f"{result.extracted} extracted, {len(result.failed)} failed")
+    if result.failed:
+        raise SystemExit(1)
+
+
+@main.command(
+    help="Train new versions of the per-site compression dictionaries, "
+    "from archived web pages and stored articles (all sites if none given)."
+)
+@click.argument("sites", nargs=-1)
+@click.option(
+    "-k",
+    "--kind",
+    type=click.Choice(["html", "md"]),
+    multiple=True,
+    default=["html", "md"],
+    help="Train dictionaries for web pages and/or Markdown texts",
+)
+@click.option("-v", "--verbose", count=True, help="Verbosity level")
+def train(sites: tuple[str, ...], kind: tuple[str, ...], verbose: int) -> None:
+    import importlib.util
+
+    from .core.compress import (
+        MIN_SAMPLES,
+        collect_samples,
+        dictionaries,
+        site_key,
+    )
+
+    setup_logging(verbose)
+
+    if importlib.util.find_spec("zstandard") is None:
+        raise click.ClickException(
+            "Compression requires the zstandard package "
+            "(pip install kiosque[zstd])"
+        )
+
+    # Accept URLs as well as site names
+    selected = {site_key(site) if "/" in site else site for site in sites}
+    for k in kind:
+        samples = collect_samples(k)  # type: ignore
+        for site in sorted(selected or samples):
+            site_samples = samples.get(site, [])
+            if not selected and len(site_samples) < MIN_SAMPLES:
+                continue  # only report missing samples when asked for
+            try:
+                path = dictionaries.train(site, k, site_samples)  # type: ignore
+            except ValueError as e:
+                click.echo(str(e), err=True)
+                continue
+            ratio = dictionaries.ratio(site_samples[-100:], site, k)  # type: ignore
+            click.echo(
+                f"{path.name}: {len(site_samples)} samples, "
+                f"compression ratio {ratio:.1f}"
+            )
+
+
+@main.command(help="Print exported articles, compressed or not.")
+@click.argument(
+    "files",
+    nargs=-1,
+    required=True,
+    type=click.Path(dir_okay=False, exists=True, path_type=Path),
+)
+def decompress(files: tuple[Path, ...]) -> None:
+    from .core.compress import read_export
+
+    for path in files:
+        try:
+            click.echo(read_export(path))
+        except (KeyError, ValueError) as e:
+            raise click.ClickException(f"Cannot read {path}: {e}")
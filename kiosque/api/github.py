@@ -4,6 +4,7 @@ from typing import Any
 import httpx
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
+from ..core.client import api_async_client, api_client
 from ..core.config import config_dict
 
 
@@ -53,10 +54,8 @@ class GitHubAPI:
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
-        self.client = httpx.Client(headers=self.headers, timeout=30.0)
-        self.async_client = httpx.AsyncClient(
-            headers=self.headers, timeout=30.0
-        )
+        self.client = api_client(headers=self.headers, timeout=30.0)
+        self.async_client = api_async_client(headers=self.headers, timeout=30.0)
 
     async def get_user_async(self) -> dict[str, Any]:
         """Get the authenticated user's information."""
@@ -0,0 +1,161 @@
+"""Local mirror of Raindrop.io bookmarks.
+
+Bookmarks are kept in a SQLite database, keyed by their id, so that the TUI
+can display them as soon as it starts. The mirror is then kept up to date
+with delta syncs: only the bookmarks updated since the previous sync are
+downloaded (see ``RaindropAPI.get_updates_async()``).
+
+Deletions do not show in deltas: the whole library is downloaded again
+(reconciled) when the number of bookmarks online does not match the mirror,
+or every ``reconcile_interval`` seconds (see the ``[tui]`` section).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable
+
+from ..core.config import data_dir
+from .raindrop import RaindropAPI, RaindropItem
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS raindrops (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    last_update TEXT NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS raindrops_created ON raindrops(created);
+CREATE TABLE IF NOT EXISTS sync (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def default_mirror_path() -> Path:
+    return data_dir / "raindrop.db"
+
+
+class RaindropMirror:
+    """SQLite mirror of Raindrop.io bookmarks."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_mirror_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> RaindropMirror:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM raindrops"
+        ).fetchone()[0]
+
+    def items(self) -> list[RaindropItem]:
+        """Return all bookmarks, most recent first."""
+        rows = self.connection.execute(
+            "SELECT item FROM raindrops ORDER BY created DESC, id DESC"
+        )
+        return [RaindropItem.model_validate_json(item) for (item,) in rows]
+
+    def state(self) -> tuple[int, str | None]:
+        """Return the number of bookmarks and the last update."""
+        return self.connection.execute(
+            "SELECT COUNT(*), MAX(last_update) FROM raindrops"
+        ).fetchone()
+
+    def last_updates(self) -> dict[int, str]:
+        """Return the last update of each bookmark, by id."""
+        rows = self.connection.execute("SELECT id, last_update FROM raindrops")
+        return dict(rows.fetchall())
+
+    def upsert(self, items: Iterable[RaindropItem]) -> int:
+        """Insert or update bookmarks, in a single transaction."""
+        rows = [
+            (
+                item.id_,
+                item.created.isoformat(),
+                item.lastUpdate.isoformat(),
+                item.model_dump_json(by_alias=True),
+            )
+            for item in items
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO raindrops "
+                "(id, created, last_update, item) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def delete(self, ids: Iterable[int]) -> int:
+        with self.connection:
+            cursor = self.connection.executemany(
+                "DELETE FROM raindrops WHERE id = ?", [(id_,) for id_ in ids]
+            )
+        return cursor.rowcount
+
+    def replace(self, items: list[RaindropItem]) -> int:
+        """Replace all bookmarks with a full download of the library.
+
+        Returns:
+            The number of bookmarks deleted since the previous download.
+        """
+        known = self.last_updates().keys()
+        deleted = known - {item.id_ for item in items}
+        self.delete(deleted)
+        self.upsert(items)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync (key, value) "
+                "VALUES ('reconciled', ?)",
+                (now,),
+            )
+        return len(deleted)
+
+    @property
+    def reconciled(self) -> datetime | None:
+        """When the whole library was last downloaded."""
+        row = self.connection.execute(
+            "SELECT value FROM sync WHERE key = 'reconciled'"
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def reconcile_due(self, interval: int) -> bool:
+        """Whether the whole library should be downloaded again."""
+        reconciled = self.reconciled
+        if reconciled is None:
+            return True
+        age = datetime.now(timezone.utc) - reconciled
+        return age > timedelta(seconds=interval)
+
+    async def update(self, api: RaindropAPI) -> list[RaindropItem] | None:
+        """Download the bookmarks updated since the previous sync.
+
+        Returns:
+            The updated bookmarks, or None if bookmarks were deleted online:
+            the library must then be reconciled.
+        """
+        known = self.last_updates()
+        updates, count = await api.get_updates_async(
+            lambda item: known.get(item.id_) == item.lastUpdate.isoformat()
+        )
+        self.upsert(updates)
+        if count != len(self):
+            logging.info(f"{len(self)} bookmarks in the mirror, {count} online")
+            return None
+        return updates
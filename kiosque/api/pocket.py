@@ -1,7 +1,6 @@
 from typing import Iterator, Literal, TypedDict
 
-import httpx
-
+from ..core.client import api_async_client, api_client
 from ..core.config import config_dict
 
 
@@ -44,8 +43,8 @@ class PocketAPI:
 
         self.consumer_key = pocket_config.get("consumer_key")
         self.access_token = pocket_config.get("access_token")
-        self.client = httpx.Client()
-        self.async_client = httpx.AsyncClient()
+        self.client = api_client()
+        self.async_client = api_async_client()
 
     def __len__(self):
         return len(self.json["list"])
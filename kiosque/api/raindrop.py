@@ -1,11 +1,18 @@
+import asyncio
+import math
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 from typing import Any, Literal
 
-import httpx
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
+from ..core.client import api_async_client, api_client
 from ..core.config import config_dict
 
+# Maximum number of bookmarks per page allowed by the API
+MAX_PER_PAGE = 50
+MAX_CONCURRENT_PAGES = 6
+
 
 class RaindropTag(BaseModel):
     """Model representing a tag in a Raindrop item."""
@@ -68,10 +75,10 @@ class RaindropAPI:
         )
 
         self.token = raindrop_config.get("token")
-        self.client = httpx.Client(
+        self.client = api_client(
             headers={"Authorization": f"Bearer {self.token}"}
         )
-        self.async_client = httpx.AsyncClient(
+        self.async_client = api_async_client(
             headers={"Authorization": f"Bearer {self.token}"}
         )
 
@@ -103,20 +110,86 @@ class RaindropAPI:
         response.raise_for_status()
         return [RaindropItem(**item) for item in response.json()["items"]]
 
-    async def get_items_async(
-        self, page: int = 0, cumul: None | list[RaindropItem] = None
-    ) -> list[RaindropItem]:
+    async def _get_page_async(
+        self, page: int, perpage: int = MAX_PER_PAGE, sort: str = "-created"
+    ) -> tuple[list[RaindropItem], int]:
+        """Return the bookmarks of a page, and the total number of bookmarks."""
         response = await self.async_client.get(
-            f"https://api.raindrop.io/rest/v1/raindrops/0?page={page}"
+            "https://api.raindrop.io/rest/v1/raindrops/0",
+            params={"page": page, "perpage": perpage, "sort": sort},
         )
         response.raise_for_status()
         json = response.json()
-        if cumul is None:
-            cumul = []
-        cumul.extend([RaindropItem(**item) for item in json["items"]])
-        if len(cumul) == json["count"]:
-            return cumul
-        return await self.get_items_async(page=page + 1, cumul=cumul)
+        return [RaindropItem(**item) for item in json["items"]], json["count"]
+
+    async def iter_items_async(
+        self, concurrency: int = MAX_CONCURRENT_PAGES
+    ) -> AsyncIterator[tuple[int, list[RaindropItem]]]:
+        """Yield all bookmarks, page by page, as soon as each page lands.
+
+        The first page tells the number of bookmarks: the other pages are
+        then fetched concurrently, so pages may come in any order.
+
+        Args:
+            concurrency: Maximum number of pages fetched at the same time
+
+        Yields:
+            The page number and its bookmarks
+        """
+        items, count = await self._get_page_async(0)
+        yield 0, items
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> tuple[int, list[RaindropItem]]:
+            async with semaphore:
+                items, _ = await self._get_page_async(page)
+            return page, items
+
+        tasks = [
+            asyncio.create_task(fetch(page))
+            for page in range(1, math.ceil(count / MAX_PER_PAGE))
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The consumer stopped early, or a page failed
+            for task in tasks:
+                task.cancel()
+
+    async def get_updates_async(
+        self, unchanged: Callable[[RaindropItem], bool]
+    ) -> tuple[list[RaindropItem], int]:
+        """Return the bookmarks updated since a previous download.
+
+        Pages are read sorted by last update, and reading stops at the
+        first unchanged bookmark: bookmarks deleted (or moved to the trash)
+        since the previous download can not be noticed this way.
+
+        Args:
+            unchanged: Whether a bookmark is the same as previously downloaded
+
+        Returns:
+            The updated bookmarks, most recently updated first, and the
+            total number of bookmarks.
+        """
+        updates: list[RaindropItem] = []
+        page = 0
+        while True:
+            items, count = await self._get_page_async(page, sort="-lastUpdate")
+            for item in items:
+                if unchanged(item):
+                    return updates, count
+                updates.append(item)
+            if len(items) < MAX_PER_PAGE:
+                return updates, count
+            page += 1
+
+    async def get_items_async(self) -> list[RaindropItem]:
+        """Return all bookmarks, most recent first."""
+        pages = {page: items async for page, items in self.iter_items_async()}
+        return [item for page in sorted(pages) for item in pages[page]]
 
     def get_collections(self) -> list[dict[str, Any]]:
         response = self.client.get(
@@ -0,0 +1,162 @@
+"""Lighter representations of articles (AMP pages, print versions, APIs).
+
+Some websites serve their articles in much lighter forms than the full
+page: AMP pages, print versions or the WordPress REST API. A Website can
+map an article URL to such a representation with ``alternate_url()``, and
+parse it with ``alternate_page()``. The full page is still fetched when the
+alternate representation is missing or does not contain the article.
+
+The helpers below build the most common alternate URLs, and the statistics
+record how many bytes were saved for each website.
+"""
+
+from __future__ import annotations
+
+import html
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+# Stop trying the alternate representation of a website after this number
+# of consecutive fallbacks to the full page
+MAX_FALLBACKS = 3
+
+
+class AlternateStats:
+    """Bytes read with alternate representations and full pages, per site.
+
+    Bytes saved are estimated from the average size of the full pages of
+    the same website.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sites: dict[str, dict[str, int]] = {}
+        self.consecutive_fallbacks: dict[str, int] = {}
+
+    def _site(self, site: str) -> dict[str, int]:
+        return self.sites.setdefault(
+            site,
+            {
+                "alternate": 0,
+                "alternate_bytes": 0,
+                "full": 0,
+                "full_bytes": 0,
+                "fallbacks": 0,
+            },
+        )
+
+    def record(self, site: str, kind: str, size: int) -> None:
+        """Record a page read, kind being "alternate" or "full"."""
+        with self.lock:
+            entry = self._site(site)
+            entry[kind] += 1
+            entry[f"{kind}_bytes"] += size
+            if kind == "alternate":
+                self.consecutive_fallbacks[site] = 0
+
+    def fallback(self, site: str) -> None:
+        with self.lock:
+            self._site(site)["fallbacks"] += 1
+            count = self.consecutive_fallbacks.get(site, 0) + 1
+            self.consecutive_fallbacks[site] = count
+
+    def enabled(self, site: str) -> bool:
+        """Check whether the alternate representation is worth a try."""
+        with self.lock:
+            count = self.consecutive_fallbacks.get(site, 0)
+        return count < MAX_FALLBACKS
+
+    def saved(self, site: str) -> int | None:
+        """Estimate the number of bytes saved, if full pages were read."""
+        with self.lock:
+            entry = self.sites.get(site)
+            if entry is None or entry["full"] == 0:
+                return None
+            average = entry["full_bytes"] / entry["full"]
+            return int(entry["alternate"] * average - entry["alternate_bytes"])
+
+    def as_dict(self) -> dict[str, dict[str, int | None]]:
+        with self.lock:
+            sites = {site: dict(entry) for site, entry in self.sites.items()}
+        return {
+            site: {**entry, "saved_bytes": self.saved(site)}
+            for site, entry in sites.items()
+        }
+
+    def __repr__(self) -> str:
+        return f"AlternateStats({self.as_dict()})"
+
+
+alternate_stats = AlternateStats()
+
+
+def amp_url(url: str) -> str:
+    """Return the AMP version of a URL, with the common /amp/ suffix."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") + "/amp/"
+    return urlunsplit(parts._replace(path=path, fragment=""))
+
+
+def print_url(url: str, param: str = "output=print") -> str:
+    """Return the print version of a URL, e.g. with ``?output=print``."""
+    parts = urlsplit(url)
+    query = f"{parts.query}&{param}" if parts.query else param
+    return urlunsplit(parts._replace(query=query, fragment=""))
+
+
+def wp_json_url(url: str) -> str:
+    """Return the WordPress REST API URL of the post published at url."""
+    parts = urlsplit(url)
+    slug = parts.path.rstrip("/").split("/")[-1]
+    return urlunsplit(
+        parts._replace(
+            path="/wp-json/wp/v2/posts",
+            query=f"slug={slug}&_embed=author",
+            fragment="",
+        )
+    )
+
+
+def wp_json_page(
+    c: httpx.Response, article_html: str = "<article>{}</article>"
+) -> BeautifulSoup | None:
+    """Build a web page from a WordPress REST API response.
+
+    The header fields are rendered as the meta tags Website looks for, and
+    the content of the post is inserted in article_html, so that the
+    article_node of the website finds it.
+
+    Returns:
+        None if no post matches the slug.
+    """
+    posts = c.json()
+    if not isinstance(posts, list) or not posts:
+        return None
+    post = posts[0]
+
+    def text(rendered: str) -> str:
+        return BeautifulSoup(rendered, features="lxml").get_text().strip()
+
+    meta = {
+        "og:title": text(post["title"]["rendered"]),
+        "og:description": text(post.get("excerpt", {}).get("rendered", "")),
+        "og:url": post.get("link", ""),
+    }
+    if published := post.get("date_gmt"):
+        meta["article:published_time"] = f"{published}Z"
+    authors = post.get("_embedded", {}).get("author", [])
+    if names := [a["name"] for a in authors if "name" in a]:
+        meta["article:author"] = ", ".join(names)
+
+    head = "".join(
+        f'<meta property="{key}" content="{html.escape(value)}">'
+        for key, value in meta.items()
+    )
+    body = article_html.format(post["content"]["rendered"])
+    return BeautifulSoup(
+        f"<html><head>{head}</head><body>{body}</body></html>",
+        features="lxml",
+    )
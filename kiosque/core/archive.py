@@ -0,0 +1,289 @@
+"""Archive of the fetched web pages in WARC files.
+
+When the ``[archive]`` section of the configuration is enabled, every web
+page read by Kiosque is appended to a compressed WARC file (one per day,
+one gzip member per record, as most WARC tools expect). Records are tagged
+with the article being extracted, so that ``kiosque reextract`` can replay
+them through the current website rules, without any network access.
+
+When compression is enabled, records are rather compressed with the
+Zstandard dictionary of their website (see ``core/compress.py``), one frame
+per record, each preceded by a skippable frame with its length, so that
+records can be skipped without being decompressed.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import gzip
+import io
+import struct
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+import httpx
+
+from . import compress as compress_module
+from .compress import dictionaries, site_key
+from .config import data_dir, validate_archive_config
+
+# The article being extracted in the current thread, if any
+current_article: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_article", default=None
+)
+
+ARTICLE_HEADER = "WARC-Kiosque-Article"
+
+# Headers describing the transfer, not the content (which is decoded)
+TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Zstandard skippable frame, holding the length of the next record
+SKIPPABLE_MAGIC = 0x184D2A50
+
+CHUNK_SIZE = 2**16
+
+
+@dataclass
+class WarcRecord:
+    url: str
+    article: str | None
+    date: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    truncated: bool = False
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+        )
+
+
+class WarcArchive:
+    """Thread-safe writer of WARC files in a directory."""
+
+    def __init__(self, directory: Path, compressed: bool = False) -> None:
+        self.directory = directory
+        self.compressed = compressed
+        self.lock = threading.Lock()
+
+    def path(self, date: datetime) -> Path:
+        suffix = "zst" if self.compressed else "gz"
+        return self.directory / f"kiosque-{date:%Y%m%d}.warc.{suffix}"
+
+    def write(
+        self, c: httpx.Response, content: bytes, truncated: bool = False
+    ) -> None:
+        """Append a response (with its decoded content) to the archive."""
+        now = datetime.now(timezone.utc)
+        # Replay the final response for the requested URL
+        request = c.history[0].request if c.history else c.request
+        status = f"HTTP/1.1 {c.status_code} {c.reason_phrase}\r\n"
+        headers = "".join(
+            f"{key}: {value}\r\n"
+            for key, value in c.headers.multi_items()
+            if key.lower() not in TRANSFER_HEADERS
+        )
+        headers += f"Content-Length: {len(content)}\r\n"
+        block = (status + headers + "\r\n").encode("latin-1") + content
+
+        warc_headers = {
+            "WARC-Type": "response",
+            "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+            "WARC-Date": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "WARC-Target-URI": str(request.url),
+            "Content-Type": "application/http;msgtype=response",
+            "Content-Length": str(len(block)),
+        }
+        if truncated:
+            warc_headers["WARC-Truncated"] = "unspecified"
+        if (article := current_article.get()) is not None:
+            warc_headers[ARTICLE_HEADER] = article
+        record = (
+            (
+                "WARC/1.1\r\n"
+                + "".join(f"{k}: {v}\r\n" for k, v in warc_headers.items())
+                + "\r\n"
+            ).encode()
+            + block
+            + b"\r\n\r\n"
+        )
+        if self.compressed:
+            frame = dictionaries.compress(
+                record, site_key(str(request.url)), "html"
+            )
+            member = struct.pack("<III", SKIPPABLE_MAGIC, 4, len(frame))
+            member += frame
+        else:
+            member = gzip.compress(record)
+
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self.path(now).open("ab") as fh:
+                fh.write(member)
+
+
+def _read_headers(fh: BinaryIO) -> dict[str, str] | None:
+    line = fh.readline()
+    while line == b"\r\n":  # separators between records
+        line = fh.readline()
+    if not line:
+        return None
+    if not line.startswith(b"WARC/"):
+        raise ValueError(f"Invalid WARC record: {line!r}")
+    headers = {}
+    while (line := fh.readline()) not in (b"\r\n", b""):
+        key, _, value = line.decode().partition(":")
+        headers[key.strip()] = value.strip()
+    return headers
+
+
+def _zstd_members(fh: BinaryIO) -> Iterator[tuple[int, bytes]]:
+    """Iterate over the offsets and records of a .warc.zst file."""
+    offset = 0
+    while header := fh.read(12):
+        magic, size, length = struct.unpack("<III", header)
+        if magic != SKIPPABLE_MAGIC or size != 4:
+            raise ValueError(f"Invalid record at offset {offset}")
+        yield offset, dictionaries.decompress(fh.read(length))
+        offset += 12 + length
+
+
+def _gzip_members(fh: BinaryIO) -> Iterator[tuple[int, bytes]]:
+    """Iterate over the offsets and contents of the members of a gzip file."""
+    offset = 0
+    data = b""
+    while True:
+        start = offset
+        decompressor = zlib.decompressobj(wbits=31)
+        chunks: list[bytes] = []
+        while not decompressor.eof:
+            if not data and not (data := fh.read(CHUNK_SIZE)):
+                if start == offset:
+                    return
+                raise ValueError(f"Truncated record at offset {start}")
+            chunks.append(decompressor.decompress(data))
+            offset += len(data) - len(decompressor.unused_data)
+            data = decompressor.unused_data
+        yield start, b"".join(chunks)
+
+
+def _members(path: Path, offset: int = 0) -> Iterator[tuple[int, bytes]]:
+    """Iterate over the compressed members of a WARC file, from offset.
+
+    Each member holds one record (or a few, if written by another tool).
+    """
+    read = _zstd_members if path.suffix == ".zst" else _gzip_members
+    with path.open("rb") as fh:
+        fh.seek(offset)
+        for start, member in read(fh):
+            yield offset + start, member
+
+
+def _read_records(fh: BinaryIO) -> Iterator[WarcRecord]:
+    while (headers := _read_headers(fh)) is not None:
+        block = fh.read(int(headers["Content-Length"]))
+        if headers.get("WARC-Type") != "response":
+            continue
+        head, _, content = block.partition(b"\r\n\r\n")
+        status_line, *lines = head.decode("latin-1").split("\r\n")
+        http_headers = [
+            (key.strip(), value.strip())
+            for key, _, value in (line.partition(":") for line in lines)
+        ]
+        yield WarcRecord(
+            url=headers["WARC-Target-URI"],
+            article=headers.get(ARTICLE_HEADER),
+            date=headers["WARC-Date"],
+            status_code=int(status_line.split()[1]),
+            headers=http_headers,
+            content=content,
+            truncated="WARC-Truncated" in headers,
+        )
+
+
+def read_archive(path: Path) -> Iterator[WarcRecord]:
+    """Iterate over the response records of a WARC file."""
+    for _, member in _members(path):
+        yield from _read_records(io.BytesIO(member))
+
+
+@dataclass(frozen=True)
+class RecordLocation:
+    """Where to find the record of a URL in the archive."""
+
+    path: Path
+    offset: int  # of the compressed member holding the record
+    url: str
+
+
+def archived_articles(directory: Path) -> dict[str, list[RecordLocation]]:
+    """Index the records of all WARC files by article.
+
+    Only the headers of records are kept in memory, with the location of
+    the latest record of each URL: see ``load_records()``.
+    """
+    articles: dict[str, dict[str, RecordLocation]] = {}
+    for path in sorted(directory.glob("*.warc.*")):
+        for offset, member in _members(path):
+            fh = io.BytesIO(member)
+            while (headers := _read_headers(fh)) is not None:
+                fh.seek(int(headers["Content-Length"]), io.SEEK_CUR)
+                article = headers.get(ARTICLE_HEADER)
+                if headers.get("WARC-Type") != "response" or article is None:
+                    continue
+                url = headers["WARC-Target-URI"]
+                records = articles.setdefault(article, {})
+                records[url] = RecordLocation(path, offset, url)
+    return {
+        article: list(records.values()) for article, records in articles.items()
+    }
+
+
+def load_records(locations: list[RecordLocation]) -> list[WarcRecord]:
+    """Read the records of an article from the archive."""
+    records = []
+    for location in locations:
+        _, member = next(_members(location.path, location.offset))
+        records.extend(
+            record
+            for record in _read_records(io.BytesIO(member))
+            if record.url == location.url
+        )
+    return records
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serve archived responses, and nothing else."""
+
+    def __init__(self, records: list[WarcRecord]) -> None:
+        self.load(records)
+
+    def load(self, records: list[WarcRecord]) -> None:
+        """Serve these records instead of the previous ones."""
+        self.records = {record.url: record for record in records}
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        record = self.records.get(str(request.url))
+        if record is None:
+            raise httpx.ConnectError(
+                f"{request.url} is not archived", request=request
+            )
+        return record.to_response(request)
+
+
+def archive_directory() -> Path:
+    return validate_archive_config().directory or data_dir / "archive"
+
+
+archive: WarcArchive | None = None
+if validate_archive_config().enabled:
+    archive = WarcArchive(archive_directory(), compress_module.enabled)
@@ -0,0 +1,401 @@
+"""Extraction of many articles at once.
+
+Articles are extracted concurrently in worker threads (network and pandoc
+bound), while writes happen in the calling thread: Markdown files in an
+output directory, and/or the article store, in transactions of
+``BATCH_SIZE`` articles. Without an output directory, URLs already in the
+store are skipped. Near-duplicates of stored (or extracted) articles may
+also be skipped, before their conversion by pandoc. Exports are
+incremental: unchanged articles are not extracted again (see
+``core/manifest.py``).
+
+Archived articles (see ``core/archive.py``) are extracted again in worker
+processes (CPU bound), replaying the archived responses instead of
+accessing the network.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import stamina
+
+from . import archive as archive_module
+from . import client as client_module
+from .archive import (
+    RecordLocation,
+    ReplayTransport,
+    archived_articles,
+    load_records,
+)
+from .canonical import canonical_index, normalize_url
+from .compress import write_export
+from .dedup import DuplicateArticleError, LSHIndex, signature
+from .manifest import (
+    ExportManifest,
+    ManifestEntry,
+    check_unchanged,
+    content_hash,
+    extraction_version,
+)
+from .store import Article, ArticleStore
+from .website import Website
+
+BATCH_SIZE = 50
+
+
+@dataclass
+class BatchResult:
+    extracted: int = 0
+    written: list[Path] = field(default_factory=list)
+    stored: int = 0
+    unchanged: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class Extraction:
+    """An extracted article, and what incremental exports need to know."""
+
+    article: Article
+    file_name: Path  # default name of the Markdown file
+    version: str
+    updated_time: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def extract_article(
+    url: str, index: LSHIndex | None = None, *, signed: bool = False
+) -> Extraction:
+    """Extract an article.
+
+    Args:
+        url: The URL of the article.
+        index: Signatures of known articles, if near-duplicates are to be
+            skipped. The signature of the article is added to the index.
+        signed: Compute the signature of the article (to be stored), even
+            without index.
+
+    Raises:
+        DuplicateArticleError: If the article is a near-duplicate of an
+            article of the index.
+    """
+    instance = Website.instance(url)
+    key = instance.canonical(url)
+    sig = None
+    if signed or index is not None:
+        sig = signature(instance.plain_text(url))
+    if (
+        index is not None
+        and sig is not None
+        and (duplicate := index.claim(key, sig))
+    ):
+        raise DuplicateArticleError(url, duplicate)
+    try:
+        header = instance.header(url)
+        content = instance.content(url)
+    except Exception:
+        if index is not None:
+            index.remove(key)
+        raise
+    article = Article(
+        url=key,
+        site=instance.base_url,
+        title=instance.title(url),
+        author=instance.author(url),
+        date=instance.date(url),
+        description=instance.description(url),
+        text=f"{header}\n{content}",
+        signature=sig,
+    )
+    etag, last_modified = instance.validators(url)
+    return Extraction(
+        article=article,
+        file_name=instance.text_file_name(url),
+        version=extraction_version(instance),
+        updated_time=instance.updated_time(url),
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+
+def export_article(
+    url: str,
+    entry: ManifestEntry | None,
+    index: LSHIndex | None = None,
+    *,
+    signed: bool = False,
+) -> Extraction | ManifestEntry:
+    """Extract an article, unless its previous export is up to date.
+
+    Returns:
+        The extracted article, or the (refreshed) manifest entry of the
+        previous export if the article is unchanged.
+    """
+    if entry is not None:
+        unchanged = check_unchanged(Website.instance(url), url, entry)
+        if unchanged is not None:
+            return unchanged
+    return extract_article(url, index, signed=signed)
+
+
+def article_key(url: str) -> str:
+    """Return the key of an article in the store."""
+    website = Website.website_class(url)
+    if website is None:
+        return url
+    return website.canonical(url)
+
+
+def archive_key(url: str) -> str:
+    """Return the key of an article in the archive (its normalized URL)."""
+    key = normalize_url(url)
+    website = Website.website_class(key)
+    if website is None:
+        return key
+    return normalize_url(url, website.query_params)
+
+
+def run_batch(
+    urls: Iterable[str],
+    *,
+    directory: Path | None = None,
+    store: ArticleStore | None = None,
+    jobs: int = 4,
+    force: bool = False,
+    skip_duplicates: bool = False,
+) -> BatchResult:
+    """Extract articles concurrently.
+
+    Articles exported before in the directory are only extracted again if
+    they changed (see ``core/manifest.py``). Without a directory, articles
+    already in the store are skipped.
+
+    Args:
+        urls: The URLs of the articles.
+        directory: Where to write Markdown files, if any.
+        store: Where to store articles, if any.
+        jobs: The number of concurrent extractions.
+        force: Extract all articles, even if stored or exported before.
+        skip_duplicates: Skip near-duplicates of stored articles, and of
+            articles extracted before in the batch.
+    """
+    result = BatchResult()
+    manifest = ExportManifest(directory) if directory is not None else None
+    todo: dict[str, ManifestEntry | None] = {}
+    for url in dict.fromkeys(urls):
+        key = article_key(url)
+        entry = None
+        if manifest is not None and not force:
+            entry = manifest.get(key)
+        if (
+            directory is None
+            and store is not None
+            and not force
+            and key in store
+        ):
+            result.skipped.append(url)
+        else:
+            todo[url] = entry
+    if result.skipped:
+        logging.info(f"Skipping {len(result.skipped)} stored article(s)")
+
+    index = None
+    if skip_duplicates:
+        index = LSHIndex(store.signatures() if store is not None else None)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                export_article, url, entry, index, signed=store is not None
+            ): url
+            for url, entry in todo.items()
+        }
+        _collect(futures, directory, store, result, manifest)
+
+    return result
+
+
+def _export(
+    directory: Path,
+    extraction: Extraction,
+    manifest: ExportManifest | None,
+    result: BatchResult,
+) -> None:
+    """Write an article, unless the same text has been exported before."""
+    article = extraction.article
+    text_hash = content_hash(article.text)
+    previous = manifest.get(article.url) if manifest is not None else None
+    if previous is not None and previous.hash == text_hash:
+        path = directory / previous.path
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = write_export(
+            directory / extraction.file_name, article.text, article.url
+        )
+        result.written.append(path)
+        if previous is not None and previous.path != str(
+            path.relative_to(directory)
+        ):
+            (directory / previous.path).unlink(missing_ok=True)
+    if manifest is not None:
+        manifest.set(
+            article.url,
+            ManifestEntry(
+                path=str(path.relative_to(directory)),
+                hash=text_hash,
+                version=extraction.version,
+                etag=extraction.etag,
+                last_modified=extraction.last_modified,
+                updated_time=extraction.updated_time,
+            ),
+        )
+
+
+def _collect(
+    futures: dict[Future[Extraction | ManifestEntry], str],
+    directory: Path | None,
+    store: ArticleStore | None,
+    result: BatchResult,
+    manifest: ExportManifest | None = None,
+) -> None:
+    """Write the extracted articles as they come."""
+    pending: list[Article] = []
+
+    def flush() -> None:
+        if store is not None and pending:
+            result.stored += store.add_many(pending)
+        pending.clear()
+        if manifest is not None:
+            manifest.save()
+
+    for future in as_completed(futures):
+        url = futures[future]
+        try:
+            extraction = future.result()
+        except DuplicateArticleError as e:
+            logging.info(str(e))
+            result.skipped.append(url)
+            continue
+        except Exception as e:
+            logging.warning(f"Failed to extract {url}: {e}")
+            result.failed[url] = str(e)
+            continue
+        if isinstance(extraction, ManifestEntry):
+            if manifest is not None:
+                manifest.set(article_key(url), extraction)
+            result.unchanged.append(url)
+            continue
+        result.extracted += 1
+        if directory is not None:
+            _export(directory, extraction, manifest, result)
+        pending.append(extraction.article)
+        if len(pending) >= BATCH_SIZE:
+            flush()
+    flush()
+
+
+# -- Re-extraction from the WARC archive --
+
+
+# The records of the article being extracted again by a worker process
+replay = ReplayTransport([])
+
+
+def _init_replay() -> None:
+    """Set up a worker process for replaying archived responses.
+
+    The worker never accesses the network, and has nothing to learn nor to
+    archive. Website modules import the shared client by name: its
+    transport is replaced, rather than the client itself.
+    """
+    stamina.set_active(False)
+    archive_module.archive = None
+    canonical_index.state_file = None
+    client = client_module.client
+    client._transport = replay
+    client._mounts = {}  # e.g. proxies from the environment
+
+
+def _reextract(
+    url: str, locations: list[RecordLocation], signed: bool
+) -> Extraction:
+    # Records are only read by the worker, one article at a time
+    records = load_records(locations)
+    replay.load(records)
+    website = Website.website_class(url)
+    if website is not None:
+        website.connected = True  # no login either
+    # The page was fetched at its own URL, which the archive key may not be
+    fetched = next((r.url for r in records if archive_key(r.url) == url), url)
+    return extract_article(fetched, signed=signed)
+
+
+def _select_archived(
+    articles: dict[str, list[RecordLocation]],
+    urls: Iterable[str],
+    result: BatchResult,
+) -> dict[str, list[RecordLocation]]:
+    """Return the archived articles of some URLs, or of their canonical URLs.
+
+    URLs which are not archived are reported as failed in result.
+    """
+    # Records are tagged with normalized URLs, which may share a canonical URL
+    aliases: defaultdict[str, set[str]] = defaultdict(set)
+    for key in articles:
+        aliases[canonical_index.get(key)].add(key)
+    selected: dict[str, list[RecordLocation]] = {}
+    for url in urls:
+        keys = {archive_key(url), *aliases[article_key(url)]} & articles.keys()
+        if not keys:
+            result.failed[url] = "not archived"
+        selected.update((key, articles[key]) for key in keys)
+    return selected
+
+
+def reextract(
+    archive_directory: Path,
+    urls: Iterable[str] | None = None,
+    *,
+    directory: Path | None = None,
+    store: ArticleStore | None = None,
+    jobs: int | None = None,
+) -> BatchResult:
+    """Extract archived articles again, with the current website rules.
+
+    Args:
+        archive_directory: The directory of the WARC files.
+        urls: The articles to extract (default: all archived articles).
+        directory: Where to write Markdown files, if any.
+        store: Where to store articles, if any.
+        jobs: The number of worker processes (default: number of CPUs).
+    """
+    result = BatchResult()
+    articles = archived_articles(archive_directory)
+    if urls is not None:
+        articles = _select_archived(articles, urls, result)
+    logging.info(f"Re-extracting {len(articles)} archived article(s)")
+    manifest = ExportManifest(directory) if directory is not None else None
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_replay
+    ) as executor:
+        futures = {
+            executor.submit(_reextract, url, locations, store is not None): url
+            for url, locations in articles.items()
+        }
+        _collect(futures, directory, store, result, manifest)  # type: ignore
+
+    return result
@@ -0,0 +1,28 @@
+"""Cooperative cancellation of extractions running in threads.
+
+A thread cannot be interrupted: an extraction rather checks, at the
+boundaries of its stages (fetch, parse, convert), whether it is still
+wanted, and stops with ``ExtractionCancelled`` otherwise. The caller sets
+the event of the extraction in ``cancel_event`` before running it.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+
+# Set when the extraction running in the current thread is cancelled
+cancel_event: contextvars.ContextVar[threading.Event | None] = (
+    contextvars.ContextVar("cancel_event", default=None)
+)
+
+
+class ExtractionCancelled(Exception):
+    """Raised at a stage boundary of a cancelled extraction."""
+
+
+def checkpoint(stage: str) -> None:
+    """Stop the current extraction before a stage, if it was cancelled."""
+    event = cancel_event.get()
+    if event is not None and event.is_set():
+        raise ExtractionCancelled(f"Extraction cancelled before {stage}")
@@ -0,0 +1,181 @@
+"""Canonical URLs, used as identity for articles and as cache keys.
+
+The same article is often bookmarked or shared under many URLs: with
+tracking parameters (``utm_*``, ``xtor``, ``at_medium``...), fragments, AMP
+paths, mobile hosts, or plain ``http://``. ``normalize_url()`` removes this
+noise; websites may restrict the query parameters to an allowlist (see
+``Website.query_params``).
+
+Pages also advertise their canonical URL with ``<link rel="canonical">``.
+These are learned (and remembered across runs) by ``CanonicalIndex``, so
+that ``canonical_url()`` maps a URL to the URL of the real article.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .config import cache_dir
+
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "mtm_", "mc_", "itm_")
+TRACKING_PARAMS = {
+    "amp",
+    "cmpid",
+    "dclid",
+    "fbclid",
+    "gclid",
+    "igshid",
+    "msclkid",
+    "ocid",
+    "outputtype",
+    "ref_src",
+    "s_cid",
+    "smid",
+    "smtyp",
+    "xtor",
+}
+MOBILE_PREFIXES = ("m.", "mobile.", "amp.")
+
+# Canonical URLs with a path shorter than this fraction of the path of the
+# page are rather a section, a consent page or a paywall than the article
+MIN_PATH_RATIO = 1 / 3
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def _normalize_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    for prefix in MOBILE_PREFIXES:
+        if host.startswith(prefix):
+            return "www." + host.removeprefix(prefix)
+    # e.g. en.m.wikipedia.org
+    return host.replace(".m.", ".")
+
+
+def _normalize_path(path: str) -> str:
+    segments = path.split("/")
+    if len(segments) > 2 and segments[1] == "amp":  # /amp/article
+        del segments[1]
+    if segments[-1] == "amp":  # /article/amp
+        segments[-1] = ""
+    elif len(segments) > 2 and segments[-2:] == ["amp", ""]:  # /article/amp/
+        del segments[-2]
+    segments[-1] = segments[-1].replace(".amp.", ".")  # article.amp.html
+    return "/".join(segments) or "/"
+
+
+def normalize_url(url: str, query_params: list[str] | None = None) -> str:
+    """Remove the noise from a URL.
+
+    Args:
+        url: Any URL of an article.
+        query_params: The query parameters to keep (all of them but the
+            tracking parameters if None).
+
+    Returns:
+        The URL with ``https://``, without mobile host, AMP path, fragment
+        nor tracking parameters, and with sorted query parameters.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url  # not a web page, e.g. an alias
+
+    host = _normalize_host(parts.hostname)
+    if parts.port is not None and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if query_params is None:
+        params = [(k, v) for k, v in params if not _is_tracking(k)]
+    else:
+        params = [(k, v) for k, v in params if k in query_params]
+
+    return urlunsplit(
+        (
+            "https",
+            host,
+            _normalize_path(parts.path),
+            urlencode(sorted(params)),
+            "",
+        )
+    )
+
+
+def _site(url: str) -> str:
+    return (urlsplit(url).hostname or "").removeprefix("www.")
+
+
+def _plausible_path(url: str, canonical: str) -> bool:
+    """Check whether the path of canonical may be the article at url."""
+    path = urlsplit(canonical).path.rstrip("/")
+    source = urlsplit(url).path.rstrip("/")
+    return bool(path) and len(path) >= MIN_PATH_RATIO * len(source)
+
+
+class CanonicalIndex:
+    """Canonical URLs learned from ``<link rel="canonical">``."""
+
+    def __init__(self, state_file: Path | None) -> None:
+        self.state_file = state_file
+        self.canonical: dict[str, str] = {}
+        if state_file is not None and state_file.exists():
+            try:
+                self.canonical = json.loads(state_file.read_text())
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring corrupted file {state_file}")
+        self.lock = threading.Lock()
+
+    def get(self, url: str) -> str:
+        with self.lock:
+            return self.canonical.get(url, url)
+
+    def learn(self, url: str, canonical: str) -> None:
+        """Remember that url (normalized) is an alias of canonical.
+
+        Canonical URLs pointing to another website are ignored. Otherwise,
+        the canonical URL found by the latest fetch of url replaces the one
+        learned before; if it is the home page or a much shorter path (a
+        consent page, a paywall, etc.), the URL stands for itself.
+        """
+        if _site(url) != _site(canonical):
+            return
+        canonical = normalize_url(canonical)
+        if url == canonical or not _plausible_path(url, canonical):
+            self.forget(url)
+            return
+        with self.lock:
+            if self.canonical.get(url) == canonical:
+                return
+            self.canonical[url] = canonical
+            logging.debug(f"Canonical URL for {url}: {canonical}")
+            self._save()
+
+    def forget(self, url: str) -> None:
+        """Forget the canonical URL learned for url, if any."""
+        with self.lock:
+            if self.canonical.pop(url, None) is None:
+                return
+            logging.debug(f"Forget canonical URL for {url}")
+            self._save()
+
+    def _save(self) -> None:
+        if self.state_file is not None:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.state_file.with_suffix(".tmp")
+            temp.write_text(json.dumps(self.canonical))
+            temp.replace(self.state_file)
+
+
+canonical_index = CanonicalIndex(cache_dir / "canonical.json")
+
+
+def canonical_url(url: str, query_params: list[str] | None = None) -> str:
+    """Return the canonical URL of an article, as learned so far."""
+    return canonical_index.get(normalize_url(url, query_params))
@@ -1,89 +1,192 @@
+import importlib.util
 import logging
+import threading
+from typing import Any
 
 import httpx
 import stamina
 
-from .config import validate_proxy_config
+from .config import cache_dir, validate_http_config, validate_proxy_config
+from .proxy import AsyncRoutingTransport, ProxyRouter, RoutingTransport
+
+
+class ConnectionStats:
+    """Connection reuse statistics of the HTTP clients.
+
+    Statistics are collected through the ``trace`` extension of httpcore,
+    installed on every request by an event hook.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+
+    def trace(self, event: str, info: dict[str, Any]) -> None:
+        with self.lock:
+            if event == "connection.connect_tcp.complete":
+                self.connections += 1
+            elif event == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+            elif event == "http11.send_request_headers.started":
+                self.requests += 1
+            elif event == "http2.send_request_headers.started":
+                self.requests += 1
+                self.http2_requests += 1
+
+    async def atrace(self, event: str, info: dict[str, Any]) -> None:
+        self.trace(event, info)
+
+    @property
+    def reused(self) -> int:
+        """Number of requests sent on an already open connection."""
+        return max(self.requests - self.connections, 0)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "tls_handshakes": self.tls_handshakes,
+            "http2_requests": self.http2_requests,
+        }
+
+    def __repr__(self) -> str:
+        entries = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"ConnectionStats({entries})"
+
+
+stats = ConnectionStats()
+
+
+def _trace_hook(request: httpx.Request) -> None:
+    request.extensions["trace"] = stats.trace
+
+
+async def _async_trace_hook(request: httpx.Request) -> None:
+    request.extensions["trace"] = stats.atrace
+
+
+http_config = validate_http_config()
+http2 = http_config.http2
+if http2 and importlib.util.find_spec("h2") is None:
+    logging.warning(
+        "HTTP/2 requires the h2 package (pip install kiosque[http2]), "
+        "falling back to HTTP/1.1"
+    )
+    http2 = False
+
+limits = httpx.Limits(
+    max_connections=http_config.max_connections,
+    max_keepalive_connections=http_config.max_keepalive_connections,
+    keepalive_expiry=http_config.keepalive_expiry,
+)
+client_options: dict[str, Any] = dict(
+    follow_redirects=True, timeout=http_config.timeout
+)
 
 # Initialize client with optional proxy support
 proxy_config = validate_proxy_config()
 proxy_url = proxy_config.url if proxy_config else None
 
 # TODO: Async client infrastructure available for future async implementations
-# Currently, TUI uses asyncio.to_thread() to run sync methods in thread pool
+# Currently, TUI runs sync methods in a thread pool (see tui/executor.py)
 # This async client can be used when refactoring website scrapers to async
-if proxy_url:
-    # For SOCKS proxies, we need to use httpx_socks transport
-    if proxy_url.startswith("socks"):
-        from httpx_socks import AsyncProxyTransport, SyncProxyTransport
-
-        transport = SyncProxyTransport.from_url(proxy_url)
-        async_transport = AsyncProxyTransport.from_url(proxy_url)
-        client = httpx.Client(
-            follow_redirects=True, timeout=30.0, transport=transport
-        )
-        async_client = httpx.AsyncClient(
-            follow_redirects=True, timeout=30.0, transport=async_transport
-        )
-        logging.info(f"Using SOCKS proxy: {proxy_url}")
-    else:
-        # For HTTP/HTTPS proxies, httpx handles them natively
-        client = httpx.Client(
-            follow_redirects=True, timeout=30.0, proxy=proxy_url
-        )
-        async_client = httpx.AsyncClient(
-            follow_redirects=True, timeout=30.0, proxy=proxy_url
-        )
-        logging.info(f"Using HTTP proxy: {proxy_url}")
+if proxy_config is not None:
+    # Requests are routed per host, directly or through the pool of proxies
+    router = ProxyRouter(proxy_config, cache_dir / "proxy-hosts.json")
+    client = httpx.Client(
+        transport=RoutingTransport(router, http2=http2, limits=limits),
+        event_hooks={"request": [_trace_hook]},
+        **client_options,
+    )
+    async_client = httpx.AsyncClient(
+        transport=AsyncRoutingTransport(router, http2=http2, limits=limits),
+        event_hooks={"request": [_async_trace_hook]},
+        **client_options,
+    )
+    logging.info(
+        f"Using proxy: {', '.join(proxy_config.urls)} "
+        f"(mode: {proxy_config.mode})"
+    )
 else:
-    client = httpx.Client(follow_redirects=True, timeout=30.0)
-    async_client = httpx.AsyncClient(follow_redirects=True, timeout=30.0)
-
-client.headers.update(
-    {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/131.0.0.0 Safari/537.36"
-        ),
-        "Accept": (
-            "text/html,application/xhtml+xml,application/xml;q=0.9,"
-            "image/avif,image/webp,image/apng,*/*;q=0.8,"
-            "application/signed-exchange;v=b3;q=0.7"
-        ),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "DNT": "1",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-    }
-)
-
-async_client.headers.update(
-    {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/131.0.0.0 Safari/537.36"
-        ),
-        "Accept": (
-            "text/html,application/xhtml+xml,application/xml;q=0.9,"
-            "image/avif,image/webp,image/apng,*/*;q=0.8,"
-            "application/signed-exchange;v=b3;q=0.7"
-        ),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "DNT": "1",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-    }
-)
+    client = httpx.Client(
+        http2=http2,
+        limits=limits,
+        event_hooks={"request": [_trace_hook]},
+        **client_options,
+    )
+    async_client = httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        event_hooks={"request": [_async_trace_hook]},
+        **client_options,
+    )
+
+browser_headers = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;q=0.9,"
+        "image/avif,image/webp,image/apng,*/*;q=0.8,"
+        "application/signed-exchange;v=b3;q=0.7"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+}
+
+client.headers.update(browser_headers)
+async_client.headers.update(browser_headers)
+
+
+# -- Shared connection pool for API clients (Raindrop.io, GitHub, Pocket) --
+
+
+class _SharedHTTPTransport(httpx.HTTPTransport):
+    """Transport shared by several clients: closing a client keeps it open."""
+
+    def close(self) -> None:
+        pass
+
+
+class _SharedAsyncHTTPTransport(httpx.AsyncHTTPTransport):
+    """Transport shared by several clients: closing a client keeps it open."""
+
+    async def aclose(self) -> None:
+        pass
+
+
+api_transport = _SharedHTTPTransport(http2=http2, limits=limits)
+api_async_transport = _SharedAsyncHTTPTransport(http2=http2, limits=limits)
+
+
+def api_client(**kwargs: Any) -> httpx.Client:
+    """Return a client for an API, sharing the pool of API connections."""
+    return httpx.Client(
+        transport=api_transport,
+        event_hooks={"request": [_trace_hook]},
+        **kwargs,
+    )
+
+
+def api_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """Return an async client for an API, sharing the pool of connections."""
+    return httpx.AsyncClient(
+        transport=api_async_transport,
+        event_hooks={"request": [_async_trace_hook]},
+        **kwargs,
+    )
 
 
 # Retry configuration for HTTP requests
@@ -110,7 +213,7 @@ def post_with_retry(url: str, **kwargs) -> httpx.Response:
 
 # TODO: Async HTTP methods for future use
 # These are ready for when website scrapers are refactored to be fully async
-# Currently unused - TUI runs sync methods via asyncio.to_thread()
+# Currently unused - TUI runs sync methods in a thread pool
 @stamina.retry(
     on=httpx.HTTPError,
     attempts=3,
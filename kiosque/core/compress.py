@@ -0,0 +1,241 @@
+"""Zstandard compression of exports and archives, with per-site dictionaries.
+
+Articles from a same website share most of their HTML markup and a good
+part of their Markdown boilerplate: a dictionary trained on samples of a
+website captures this redundancy, so that each entry (an exported file, an
+archived web page) can still be compressed on its own, and decompressed
+without reading anything else.
+
+Dictionaries are trained on demand (``kiosque train``) from the archived
+web pages (``html``) and the stored articles (``md``). Each training
+produces a new version: older versions are kept, since the dictionary of a
+compressed entry is found from the dictionary ID in its frame header.
+
+This requires the optional zstandard package (``pip install kiosque[zstd]``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Literal
+from urllib.parse import urlparse
+
+from .config import data_dir, validate_compression_config
+
+if TYPE_CHECKING:
+    import zstandard
+
+Kind = Literal["html", "md"]
+
+MIN_SAMPLES = 8
+MAX_SAMPLES = 1000
+
+compression_config = validate_compression_config()
+enabled = compression_config.enabled
+if enabled and importlib.util.find_spec("zstandard") is None:
+    logging.warning(
+        "Compression requires the zstandard package "
+        "(pip install kiosque[zstd]), files are written uncompressed"
+    )
+    enabled = False
+
+
+def site_key(url: str) -> str:
+    """Return the name of the website of a URL, for its dictionaries."""
+    host = urlparse(url).hostname or ""
+    return host.removeprefix("www.")
+
+
+def dictionary_id(site: str, kind: Kind, version: int) -> int:
+    """Return a stable dictionary ID (IDs below 32768 are reserved)."""
+    return 32768 + zlib.crc32(f"{site}.{kind}.v{version}".encode()) % (
+        2**31 - 32768
+    )
+
+
+class DictionaryStore:
+    """Versioned Zstandard dictionaries, one series per website and kind.
+
+    Dictionaries are files named ``{site}.{kind}.v{version}.zdict``, in the
+    format of ``zstd --train``: they can also be used with the zstd command
+    line tool (``zstd -d -D``).
+    """
+
+    def __init__(
+        self, directory: Path, level: int = 12, size: int = 110 * 1024
+    ) -> None:
+        self.directory = directory
+        self.level = level
+        self.size = size
+        self.lock = threading.Lock()
+        self.latest: dict[tuple[str, Kind], zstandard.ZstdCompressionDict] = {}
+        self.by_id: dict[int, zstandard.ZstdCompressionDict] | None = None
+
+    def path(self, site: str, kind: Kind, version: int) -> Path:
+        return self.directory / f"{site}.{kind}.v{version}.zdict"
+
+    def versions(self, site: str, kind: Kind) -> list[int]:
+        return sorted(
+            int(path.suffixes[-2].removeprefix(".v"))
+            for path in self.directory.glob(f"{site}.{kind}.v*.zdict")
+        )
+
+    def load(self, path: Path) -> zstandard.ZstdCompressionDict:
+        import zstandard
+
+        return zstandard.ZstdCompressionDict(path.read_bytes())
+
+    def dictionary(
+        self, site: str, kind: Kind
+    ) -> zstandard.ZstdCompressionDict | None:
+        """Return the latest dictionary of a website, if any."""
+        with self.lock:
+            if (site, kind) not in self.latest:
+                versions = self.versions(site, kind)
+                if not versions:
+                    return None
+                zdict = self.load(self.path(site, kind, versions[-1]))
+                zdict.precompute_compress(level=self.level)
+                self.latest[site, kind] = zdict
+            return self.latest[site, kind]
+
+    def find(self, dict_id: int) -> zstandard.ZstdCompressionDict:
+        """Return the dictionary with a given ID, whatever its version."""
+        with self.lock:
+            if self.by_id is None or dict_id not in self.by_id:
+                self.by_id = {}
+                for path in self.directory.glob("*.zdict"):
+                    zdict = self.load(path)
+                    self.by_id[zdict.dict_id()] = zdict
+            if dict_id not in self.by_id:
+                raise KeyError(f"Unknown dictionary {dict_id}")
+            return self.by_id[dict_id]
+
+    def train(self, site: str, kind: Kind, samples: list[bytes]) -> Path:
+        """Train a new version of the dictionary of a website.
+
+        Raises:
+            ValueError: If there are not enough samples.
+        """
+        import zstandard
+
+        if len(samples) < MIN_SAMPLES:
+            raise ValueError(
+                f"Not enough samples for {site} ({kind}): "
+                f"{len(samples)} < {MIN_SAMPLES}"
+            )
+        version = max(self.versions(site, kind), default=0) + 1
+        try:
+            zdict = zstandard.train_dictionary(
+                self.size,
+                samples[-MAX_SAMPLES:],
+                dict_id=dictionary_id(site, kind, version),
+                level=self.level,
+            )
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Training failed for {site} ({kind}): {e}")
+
+        path = self.path(site, kind, version)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_bytes(zdict.as_bytes())
+        temp.replace(path)
+        with self.lock:
+            self.latest.pop((site, kind), None)
+            self.by_id = None
+        logging.info(f"Dictionary written to {path}")
+        return path
+
+    def compress(self, data: bytes, site: str, kind: Kind) -> bytes:
+        """Compress data into a single frame, with the website dictionary.
+
+        Data is compressed without a dictionary until one is trained.
+        """
+        import zstandard
+
+        # Compressors are not thread-safe, dictionaries are
+        compressor = zstandard.ZstdCompressor(
+            level=self.level,
+            dict_data=self.dictionary(site, kind),
+            write_checksum=True,
+        )
+        return compressor.compress(data)
+
+    def decompress(self, frame: bytes) -> bytes:
+        """Decompress a single frame, with the dictionary it was made with."""
+        import zstandard
+
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        decompressor = zstandard.ZstdDecompressor(
+            dict_data=self.find(dict_id) if dict_id else None
+        )
+        return decompressor.decompress(frame)
+
+    def ratio(self, samples: Iterable[bytes], site: str, kind: Kind) -> float:
+        """Return the compression ratio achieved on samples."""
+        samples = list(samples)
+        compressed = sum(
+            len(self.compress(data, site, kind)) for data in samples
+        )
+        return sum(len(data) for data in samples) / max(compressed, 1)
+
+
+def collect_samples(kind: Kind) -> dict[str, list[bytes]]:
+    """Gather training samples per website, oldest first.
+
+    Web pages (``html``) come from the WARC archive, Markdown texts (``md``)
+    from the article store.
+    """
+    samples: dict[str, list[bytes]] = {}
+    if kind == "html":
+        from .archive import archive_directory, read_archive
+
+        directory = archive_directory()
+        for path in sorted(directory.glob("*.warc.*")):
+            for record in read_archive(path):
+                site = samples.setdefault(site_key(record.url), [])
+                site.append(record.content)
+    else:
+        from .store import ArticleStore, default_store_path
+
+        if not default_store_path().exists():
+            return samples
+        with ArticleStore() as store:
+            for url, text in store.texts():
+                site = samples.setdefault(site_key(url), [])
+                site.append(text.encode())
+    return samples
+
+
+dictionaries = DictionaryStore(
+    compression_config.directory or data_dir / "dictionaries",
+    level=compression_config.level,
+    size=compression_config.dictionary_size * 1024,
+)
+
+
+def write_export(path: Path, text: str, url: str) -> Path:
+    """Write an exported article atomically, compressed when configured.
+
+    Returns:
+        The path of the written file (``.zst`` is appended if compressed).
+    """
+    content = text.encode()
+    if enabled:
+        path = path.with_name(f"{path.name}.zst")
+        content = dictionaries.compress(content, site_key(url), "md")
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.write_bytes(content)
+    temp.replace(path)
+    return path
+
+
+def read_export(path: Path) -> str:
+    """Read an exported article, compressed or not."""
+    if path.suffix == ".zst":
+        return dictionaries.decompress(path.read_bytes()).decode()
+    return path.read_text()
@@ -2,8 +2,10 @@ import configparser
 import logging
 import os
 from pathlib import Path
+from typing import Literal
+from urllib.parse import urlparse
 
-from appdirs import user_config_dir
+from appdirs import user_cache_dir, user_config_dir, user_data_dir
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
 
@@ -30,6 +32,27 @@ class RaindropConfig(BaseModel):
         return v.strip()
 
 
+PROXY_SCHEMES = ["http://", "https://", "socks4://", "socks5://"]
+
+
+def _validate_proxy_url(v: str) -> str:
+    v = v.strip()
+    if not v:
+        raise ValueError("Proxy URL cannot be empty")
+    # Basic validation that it looks like a URL
+    if not any(v.startswith(proto) for proto in PROXY_SCHEMES):
+        raise ValueError(
+            "Proxy URL must start with http://, https://, socks4://, or socks5://"
+        )
+    return v
+
+
+def _split_list(v: str | list[str]) -> list[str]:
+    if isinstance(v, str):
+        return [item.strip() for item in v.split(",") if item.strip()]
+    return v
+
+
 class ProxyConfig(BaseModel):
     """Model for proxy configuration."""
 
@@ -38,22 +61,42 @@ class ProxyConfig(BaseModel):
         min_length=1,
         description="Proxy URL (e.g., socks5://localhost:1080, http://proxy:8080)",
     )
+    pool: list[str] = Field(
+        default_factory=list,
+        description="Comma-separated list of fallback proxy URLs",
+    )
+    mode: Literal["all", "hosts", "auto"] = Field(
+        default="all",
+        description=(
+            "all: route all traffic through the proxy; "
+            "hosts: only route the listed hosts; "
+            "auto: also retry through the proxy on geo-blocking errors"
+        ),
+    )
+    hosts: list[str] = Field(
+        default_factory=list,
+        description="Comma-separated list of hosts routed through the proxy",
+    )
 
     @field_validator("url")
     @classmethod
     def validate_url(cls, v: str) -> str:
-        v = v.strip()
-        if not v:
-            raise ValueError("Proxy URL cannot be empty")
-        # Basic validation that it looks like a URL
-        if not any(
-            v.startswith(proto)
-            for proto in ["http://", "https://", "socks4://", "socks5://"]
-        ):
-            raise ValueError(
-                "Proxy URL must start with http://, https://, socks4://, or socks5://"
-            )
-        return v
+        return _validate_proxy_url(v)
+
+    @field_validator("pool", mode="before")
+    @classmethod
+    def validate_pool(cls, v: str | list[str]) -> list[str]:
+        return [_validate_proxy_url(url) for url in _split_list(v)]
+
+    @field_validator("hosts", mode="before")
+    @classmethod
+    def validate_hosts(cls, v: str | list[str]) -> list[str]:
+        return [host.lower().lstrip(".") for host in _split_list(v)]
+
+    @property
+    def urls(self) -> list[str]:
+        """All proxy URLs, the main one first."""
+        return [self.url, *(url for url in self.pool if url != self.url)]
 
 
 class GitHubConfig(BaseModel):
@@ -79,6 +122,37 @@ class TUIConfig(BaseModel):
         ge=60,
         description="Auto-refresh interval in seconds (minimum 60)",
     )
+    reconcile_interval: int = Field(
+        default=86400,
+        ge=0,
+        description="Interval in seconds between full downloads of the "
+        "Raindrop.io library, to notice deleted bookmarks",
+    )
+    prefetch_previews: int = Field(
+        default=3,
+        ge=0,
+        description="Number of bookmarks after the current one whose "
+        "preview is extracted in the background (0 to disable)",
+    )
+    preview_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Number of previews extracted at the same time in the "
+        "background",
+    )
+    extraction_threads: int = Field(
+        default=4,
+        ge=2,
+        description="Number of threads extracting previews: one more than "
+        "the previews extracted in the background, for previews asked for "
+        "meanwhile",
+    )
+    preview_max_age: int = Field(
+        default=604800,
+        ge=0,
+        description="Time in seconds during which cached previews are "
+        "displayed instead of extracted again",
+    )
 
     @field_validator("refresh_interval")
     @classmethod
@@ -88,11 +162,109 @@ class TUIConfig(BaseModel):
         return v
 
 
+class HTTPConfig(BaseModel):
+    """Model for HTTP client configuration."""
+
+    http2: bool = Field(
+        default=False,
+        description="Enable HTTP/2 (requires the h2 package)",
+    )
+    timeout: float = Field(
+        default=30.0, gt=0, description="Timeout of requests in seconds"
+    )
+    max_connections: int = Field(
+        default=100, ge=1, description="Maximum number of connections"
+    )
+    max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Maximum number of idle connections kept alive",
+    )
+    keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0,
+        description="Time in seconds an idle connection is kept alive",
+    )
+    max_page_size: float = Field(
+        default=10.0,
+        gt=0,
+        description="Maximum size of a web page in MB",
+    )
+
+
+class StoreConfig(BaseModel):
+    """Model for the article store configuration."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Store every extracted article in the database",
+    )
+    path: Path | None = Field(
+        default=None,
+        description="Path to the SQLite database (default: data directory)",
+    )
+
+    @field_validator("path")
+    @classmethod
+    def expand_path(cls, v: Path | None) -> Path | None:
+        return v.expanduser() if v is not None else None
+
+
+class ArchiveConfig(BaseModel):
+    """Model for the WARC archive configuration."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Append every fetched web page to WARC files",
+    )
+    directory: Path | None = Field(
+        default=None,
+        description="Directory of the WARC files (default: data directory)",
+    )
+
+    @field_validator("directory")
+    @classmethod
+    def expand_directory(cls, v: Path | None) -> Path | None:
+        return v.expanduser() if v is not None else None
+
+
+class CompressionConfig(BaseModel):
+    """Model for the Zstandard compression configuration."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Compress exported articles and archived web pages",
+    )
+    level: int = Field(
+        default=12, ge=1, le=22, description="Zstandard compression level"
+    )
+    dictionary_size: int = Field(
+        default=110, ge=1, description="Size of trained dictionaries in KB"
+    )
+    directory: Path | None = Field(
+        default=None,
+        description="Directory of the dictionaries (default: data directory)",
+    )
+
+    @field_validator("directory")
+    @classmethod
+    def expand_directory(cls, v: Path | None) -> Path | None:
+        return v.expanduser() if v is not None else None
+
+
 config_dir = Path(user_config_dir("kiosque"))
 if xdg_config := os.getenv("XDG_CONFIG_HOME"):
     config_dir = Path(xdg_config) / "kiosque"
 configuration_file = config_dir / "kiosque.conf"
 
+cache_dir = Path(user_cache_dir("kiosque"))
+if xdg_cache := os.getenv("XDG_CACHE_HOME"):
+    cache_dir = Path(xdg_cache) / "kiosque"
+
+data_dir = Path(user_data_dir("kiosque"))
+if xdg_data := os.getenv("XDG_DATA_HOME"):
+    data_dir = Path(xdg_data) / "kiosque"
+
 if not config_dir.exists():
     configuration_template = """
 # [https://www.nytimes.com/]
@@ -118,6 +290,11 @@ if not config_dir.exists():
 # TUI configuration (optional)
 # [tui]
 # refresh_interval = 600  # Auto-refresh interval (default: 10 min)
+# reconcile_interval = 86400  # Full Raindrop.io download (default: 1 day)
+# prefetch_previews = 3  # Previews prefetched after the current bookmark
+# preview_workers = 2  # Previews extracted at the same time
+# extraction_threads = 4  # Threads extracting previews (more than above)
+# preview_max_age = 604800  # Cached previews are kept 7 days
 #
 # Proxy configuration (optional, for geo-blocked websites)
 # Supports HTTP, HTTPS, SOCKS4, and SOCKS5 proxies
@@ -125,6 +302,40 @@ if not config_dir.exists():
 # url = socks5://localhost:1080
 # or
 # url = http://proxy.example.com:8080
+# pool = socks5://backup1:1080, socks5://backup2:1080  # fallback proxies
+# mode = all  # all (default), hosts (only hosts below), or auto (hosts below
+#             # plus hosts answering 403/406/451, learned automatically)
+# hosts = lesechos.fr, courrierinternational.com
+#
+# HTTP client configuration (optional)
+# [http]
+# http2 = true  # requires the h2 package: pip install kiosque[http2]
+# max_connections = 100
+# max_keepalive_connections = 20
+# keepalive_expiry = 30  # seconds
+# max_page_size = 10  # MB, larger pages are not parsed
+#
+# Store extracted articles in a searchable database (kiosque search)
+# [store]
+# enabled = true
+# path = ~/.local/share/kiosque/articles.db
+#
+# Archive fetched web pages in WARC files (kiosque reextract)
+# [archive]
+# enabled = true
+# directory = ~/.local/share/kiosque/archive
+#
+# Compress exports and archives with per-site Zstandard dictionaries
+# (requires the zstandard package: pip install kiosque[zstd])
+# [compression]
+# enabled = true
+# level = 12  # 1 (fast) to 22 (small)
+# dictionary_size = 110  # KB
+# directory = ~/.local/share/kiosque/dictionaries
+#
+# Per-site maximum page size in MB (host names, subdomains included)
+# [max_page_size]
+# www.example.com = 50
 
     """
 
@@ -142,6 +353,16 @@ for key, value in config.items():
         config_dict[key] = dict((key, value) for key, value in value.items())
 
 
+def is_website_section(key: str) -> bool:
+    """Check whether a configuration section is the URL of a website.
+
+    Other sections (``[http]``, ``[proxy]``, ``[tui]``, etc.) configure
+    kiosque itself.
+    """
+    parts = urlparse(key)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+
 def validate_raindrop_config() -> RaindropConfig | None:
     """Validate Raindrop.io configuration if present.
 
@@ -225,6 +446,92 @@ def validate_proxy_config() -> ProxyConfig | None:
         raise
 
 
+def validate_store_config() -> StoreConfig:
+    """Validate the article store configuration if present.
+
+    Returns:
+        StoreConfig with default values if not present, or configured
+        values if present.
+
+    Raises:
+        ValidationError: If configuration is present but invalid.
+    """
+    store_data = config_dict.get("store")
+    if store_data is None:
+        return StoreConfig()  # Use defaults
+
+    try:
+        return StoreConfig(**store_data)  # ty: ignore[invalid-argument-type]
+    except ValidationError as e:
+        logging.error(f"Invalid store configuration: {e}")
+        raise
+
+
+def validate_archive_config() -> ArchiveConfig:
+    """Validate the WARC archive configuration if present.
+
+    Returns:
+        ArchiveConfig with default values if not present, or configured
+        values if present.
+
+    Raises:
+        ValidationError: If configuration is present but invalid.
+    """
+    archive_data = config_dict.get("archive")
+    if archive_data is None:
+        return ArchiveConfig()  # Use defaults
+
+    try:
+        return ArchiveConfig(**archive_data)  # ty: ignore[invalid-argument-type]
+    except ValidationError as e:
+        logging.error(f"Invalid archive configuration: {e}")
+        raise
+
+
+def validate_compression_config() -> CompressionConfig:
+    """Validate the Zstandard compression configuration if present.
+
+    Returns:
+        CompressionConfig with default values if not present, or configured
+        values if present.
+
+    Raises:
+        ValidationError: If configuration is present but invalid.
+    """
+    compression_data = config_dict.get("compression")
+    if compression_data is None:
+        return CompressionConfig()  # Use defaults
+
+    try:
+        return CompressionConfig(**compression_data)  # ty: ignore[invalid-argument-type]
+    except ValidationError as e:
+        logging.error(f"Invalid compression configuration: {e}")
+        raise
+
+
+def validate_page_size_config() -> dict[str, float]:
+    """Validate the per-site maximum page sizes if present.
+
+    Returns:
+        A dictionary mapping host names to a size in MB (possibly empty).
+
+    Raises:
+        ValueError: If a size is not a positive number.
+    """
+    sizes: dict[str, float] = {}
+    for host, value in config_dict.get("max_page_size", {}).items():
+        try:
+            size = float(value)
+        except ValueError:
+            size = 0.0
+        if size <= 0:
+            msg = f"Invalid maximum page size for {host}: {value}"
+            logging.error(msg)
+            raise ValueError(msg)
+        sizes[host.lower()] = size
+    return sizes
+
+
 def validate_tui_config() -> TUIConfig:
     """Validate TUI configuration if present.
 
@@ -244,3 +551,24 @@ def validate_tui_config() -> TUIConfig:
     except ValidationError as e:
         logging.error(f"Invalid TUI configuration: {e}")
         raise
+
+
+def validate_http_config() -> HTTPConfig:
+    """Validate HTTP client configuration if present.
+
+    Returns:
+        HTTPConfig with default values if not present, or configured
+        values if present.
+
+    Raises:
+        ValidationError: If configuration is present but invalid.
+    """
+    http_data = config_dict.get("http")
+    if http_data is None:
+        return HTTPConfig()  # Use defaults
+
+    try:
+        return HTTPConfig(**http_data)  # ty: ignore[invalid-argument-type]
+    except ValidationError as e:
+        logging.error(f"Invalid HTTP configuration: {e}")
+        raise
@@ -0,0 +1,145 @@
+"""Detection of near-duplicate articles.
+
+Wire stories (AFP, Reuters, AP) are published almost verbatim by many
+newspapers. Each article gets a MinHash signature of the word shingles of
+its cleaned text: the proportion of equal values in two signatures
+estimates the Jaccard similarity of the two texts.
+
+Signatures are split into bands: articles sharing a band are candidates
+(locality-sensitive hashing), so that looking for the near-duplicates of an
+article does not compare it with all the other ones.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import unicodedata
+import zlib
+from array import array
+
+NUM_PERM = 128
+BANDS = 32  # of 4 rows: texts 40% similar are likely to become candidates
+SHINGLE_SIZE = 5
+THRESHOLD = 0.7
+# Shorter texts (empty extractions, teasers) have no signature: they would
+# all look alike
+MIN_SHINGLES = 10
+
+PRIME = 4_294_967_291  # largest prime below 2**32
+_random = random.Random(42)  # signatures must be stable across runs
+PERMUTATIONS = [
+    (_random.randrange(1, PRIME), _random.randrange(PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+class DuplicateArticleError(ValueError):
+    """The article is a near-duplicate of an already known article."""
+
+    def __init__(self, url: str, duplicate_of: str) -> None:
+        self.url = url
+        self.duplicate_of = duplicate_of
+        super().__init__(f"{url} is a near-duplicate of {duplicate_of}")
+
+
+def shingles(text: str) -> set[int]:
+    """Hash the sequences of words of a text, ignoring case and accents."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    words = re.findall(r"\w+", text)
+    return {
+        zlib.crc32(" ".join(words[i : i + SHINGLE_SIZE]).encode())
+        for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))
+    }
+
+
+def signature(text: str) -> bytes | None:
+    """Compute the MinHash signature of a text.
+
+    Returns:
+        None if the text is too short to be compared.
+    """
+    hashes = shingles(text)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    return array(
+        "I", (min((a * h + b) % PRIME for h in hashes) for a, b in PERMUTATIONS)
+    ).tobytes()
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    a, b = array("I", first), array("I", second)
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def bands(sig: bytes) -> list[bytes]:
+    size = len(sig) // BANDS
+    return [sig[i : i + size] for i in range(0, len(sig), size)]
+
+
+class LSHIndex:
+    """Thread-safe index of signatures, by URL."""
+
+    def __init__(self, signatures: dict[str, bytes] | None = None) -> None:
+        self.lock = threading.RLock()
+        self.signatures: dict[str, bytes] = {}
+        self.buckets: list[dict[bytes, set[str]]] = [{} for _ in range(BANDS)]
+        for url, sig in (signatures or {}).items():
+            self._add(url, sig)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _add(self, url: str, sig: bytes) -> None:
+        self.signatures[url] = sig
+        for bucket, band in zip(self.buckets, bands(sig)):
+            bucket.setdefault(band, set()).add(url)
+
+    def _query(self, sig: bytes) -> list[tuple[str, float]]:
+        candidates = set()
+        for bucket, band in zip(self.buckets, bands(sig)):
+            candidates |= bucket.get(band, set())
+        similar = (
+            (url, similarity(sig, self.signatures[url])) for url in candidates
+        )
+        return sorted(
+            ((url, s) for url, s in similar if s >= THRESHOLD),
+            key=lambda item: -item[1],
+        )
+
+    def add(self, url: str, sig: bytes) -> None:
+        with self.lock:
+            self.remove(url)
+            self._add(url, sig)
+
+    def remove(self, url: str) -> None:
+        with self.lock:
+            sig = self.signatures.pop(url, None)
+            if sig is None:
+                return
+            for bucket, band in zip(self.buckets, bands(sig)):
+                bucket[band].discard(url)
+
+    def query(self, sig: bytes, exclude: str | None = None) -> list[str]:
+        """Return the near-duplicates of a signature, most similar first."""
+        with self.lock:
+            return [url for url, _ in self._query(sig) if url != exclude]
+
+    def claim(self, url: str, sig: bytes) -> str | None:
+        """Add a signature, unless a near-duplicate is already indexed.
+
+        Checking and adding happen at once, so that two threads extracting
+        the same story do not both claim it.
+
+        Returns:
+            The URL of the near-duplicate, if any.
+        """
+        with self.lock:
+            for other, _ in self._query(sig):
+                if other != url:
+                    return other
+            self.add(url, sig)
+            return None
@@ -0,0 +1,275 @@
+"""Streamed download of large files (e.g. PDF issues of magazines).
+
+Files are streamed to a partial file in the target directory, so memory
+stays flat whatever the file size. The partial file is named after the URL:
+an interrupted download resumes with a ``Range`` request on the next run.
+When the server supports ranges, the file can also be downloaded in several
+parallel segments. The size (and optionally the SHA-256 checksum) of the
+file is verified before it is atomically renamed to its final name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+from urllib.parse import unquote
+
+import httpx
+import stamina
+
+from .client import client
+
+CHUNK_SIZE = 1 << 16  # 64 kB
+
+# Ranges apply to the encoded representation: avoid compression
+DOWNLOAD_HEADERS = {"Accept-Encoding": "identity"}
+
+ProgressCallback = Callable[[int, int | None], None]
+
+
+class _Progress:
+    """Thread-safe byte counter forwarding to a progress callback."""
+
+    def __init__(
+        self, callback: ProgressCallback | None, total: int | None
+    ) -> None:
+        self.callback = callback
+        self.total = total
+        self.done = 0
+        self.lock = threading.Lock()
+
+    def advance(self, size: int) -> None:
+        with self.lock:
+            self.done += size
+            if self.callback is not None:
+                self.callback(self.done, self.total)
+
+
+def partial_path(directory: Path, url: str) -> Path:
+    """Return the path of the partial file used to download url."""
+    digest = hashlib.sha1(url.encode()).hexdigest()[:16]
+    return directory / f".kiosque-{digest}.part"
+
+
+def _size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
+
+
+def _total_size(c: httpx.Response, offset: int) -> int | None:
+    """Return the full size of the resource, if announced by the server."""
+    if c.status_code == 206:
+        match = re.match(r"bytes \d+-\d+/(\d+)", c.headers["Content-Range"])
+        return int(match.group(1)) if match else None
+    length = c.headers.get("Content-Length")
+    return int(length) + offset if length is not None else None
+
+
+def _write(c: httpx.Response, part: Path, append: bool, progress: _Progress):
+    with part.open("ab" if append else "wb") as fh:
+        for chunk in c.iter_bytes(CHUNK_SIZE):
+            fh.write(chunk)
+            progress.advance(len(chunk))
+
+
+@stamina.retry(on=httpx.HTTPError, attempts=5, timeout=None)
+def _fetch(
+    url: str,
+    part: Path,
+    progress: _Progress,
+    start: int = 0,
+    end: int | None = None,
+) -> None:
+    """Download bytes start to end (included) of url into part.
+
+    Every attempt resumes from the current size of the partial file.
+    """
+    offset = _size(part)
+    if end is not None and start + offset > end:
+        return  # segment already complete
+
+    headers = dict(DOWNLOAD_HEADERS)
+    if start + offset > 0 or end is not None:
+        last = "" if end is None else str(end)
+        headers["Range"] = f"bytes={start + offset}-{last}"
+
+    with client.stream("GET", url, headers=headers) as c:
+        if c.status_code == 416 and end is None:
+            return  # nothing left to download
+        c.raise_for_status()
+        if c.status_code != 206 and "Range" in headers:
+            if end is not None:
+                raise ValueError(f"Server ignored the range request for {url}")
+            # The server sends the full file again: start over
+            progress.advance(-offset)
+            offset = 0
+        _write(c, part, offset > 0, progress)
+
+
+def _fetch_segments(
+    url: str, part: Path, total: int, segments: int, progress: _Progress
+) -> None:
+    """Download url in parallel segments, then concatenate them into part."""
+    bounds = [total * i // segments for i in range(segments + 1)]
+    paths = [part.with_name(f"{part.name}.{i}") for i in range(segments)]
+    progress.advance(sum(_size(path) for path in paths))
+
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        futures = [
+            executor.submit(
+                _fetch, url, path, progress, bounds[i], bounds[i + 1] - 1
+            )
+            for i, path in enumerate(paths)
+        ]
+        for future in futures:
+            future.result()
+
+    with part.open("wb") as fh:
+        for path in paths:
+            with path.open("rb") as segment:
+                shutil.copyfileobj(segment, fh, CHUNK_SIZE)
+    for path in paths:
+        path.unlink()
+
+
+def response_file_name(c: httpx.Response) -> str:
+    """Return the file name of a response, for generic downloads.
+
+    The ``Content-Disposition`` header is used if present, then the last
+    segment of the URL path.
+    """
+    disposition = c.headers.get("Content-Disposition", "")
+    if match := re.search(r'filename="?([^";]+)"?', disposition):
+        name = unquote(match.group(1))
+    else:
+        name = unquote(c.url.path.rstrip("/").split("/")[-1])
+    return Path(name).name or "download"
+
+
+def sha256sum(path: Path) -> str:
+    """Compute the SHA-256 checksum of a file without loading it in memory."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def download(
+    url: str,
+    directory: Path,
+    file_name: Callable[[httpx.Response], str],
+    *,
+    segments: int = 1,
+    sha256: str | None = None,
+    progress: ProgressCallback | None = None,
+    headers: dict[str, str] | None = None,
+    skip_existing: bool = False,
+) -> Path | None:
+    """Download url into directory and return the path of the file.
+
+    Args:
+        url: The URL of the file to download.
+        directory: The directory where the file is written.
+        file_name: A function returning the name of the file from the
+            response headers (e.g. ``Content-Disposition``).
+        segments: Number of parallel segments, if the server supports
+            range requests.
+        sha256: The expected SHA-256 checksum of the file, if known.
+        progress: A function called with the number of downloaded bytes
+            and the total size of the file (if known).
+        headers: Additional headers for the request, e.g. conditional
+            headers (``If-None-Match``, ``If-Modified-Since``).
+        skip_existing: Do not download the file again if a file with the
+            same name already exists in directory.
+
+    Returns:
+        The path of the file, or None if the server answered that the
+        resource was not modified.
+
+    Raises:
+        ValueError: If the downloaded file fails size or checksum
+            verification.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    part = partial_path(directory, url)
+    offset = _size(part)
+
+    request_headers = {**DOWNLOAD_HEADERS, **(headers or {})}
+    if offset > 0:
+        logging.info(f"Resume download of {url} at byte {offset}")
+        request_headers["Range"] = f"bytes={offset}-"
+
+    with client.stream("GET", url, headers=request_headers) as c:
+        if c.status_code == 304:
+            logging.info(f"Not modified: {url}")
+            return None
+        if c.status_code == 416 and offset > 0:
+            # The partial file is not consistent with the remote file
+            logging.warning(f"Discarding partial download of {url}")
+            part.unlink()
+            return download(
+                url,
+                directory,
+                file_name,
+                segments=segments,
+                sha256=sha256,
+                progress=progress,
+                headers=headers,
+                skip_existing=skip_existing,
+            )
+        c.raise_for_status()
+
+        target = directory / file_name(c)
+        if skip_existing and target.exists():
+            logging.info(f"Already downloaded: {target}")
+            return target
+        if c.status_code != 206:
+            offset = 0
+        total = _total_size(c, offset)
+        accept_ranges = c.status_code == 206 or (
+            c.headers.get("Accept-Ranges") == "bytes"
+        )
+        counter = _Progress(progress, total)
+        counter.advance(offset)
+
+        segmented = segments > 1 and accept_ranges and total and offset == 0
+        complete = False
+        if not segmented:
+            try:
+                _write(c, part, offset > 0, counter)
+                complete = True
+            except httpx.HTTPError as e:
+                logging.warning(f"Download of {url} interrupted: {e}")
+
+    if segmented:
+        assert total is not None
+        _fetch_segments(url, part, total, segments, counter)
+    elif not complete:
+        # Resume from where the partial file stops
+        counter.done = _size(part)
+        _fetch(url, part, counter)
+
+    size = _size(part)
+    if total is not None and size != total:
+        if size > total:
+            part.unlink()
+        raise ValueError(
+            f"Incomplete download of {url}: {size} bytes out of {total}"
+        )
+
+    checksum = sha256sum(part)
+    logging.info(f"SHA-256 of {target.name}: {checksum}")
+    if sha256 is not None and checksum != sha256.lower():
+        part.unlink()
+        raise ValueError(
+            f"Checksum mismatch for {url}: expected {sha256}, got {checksum}"
+        )
+
+    part.replace(target)
+    return target
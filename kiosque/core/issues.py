@@ -0,0 +1,196 @@
+"""Synchronise the PDF issues of all configured publications.
+
+Every configured publication implementing ``latest_issue_url()`` is checked
+concurrently. Downloaded issues are recorded in a small state file in the
+target directory, together with the ``ETag`` and ``Last-Modified`` headers
+of the response: the next synchronisation sends conditional requests and
+only downloads editions which are not already present.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import httpx
+
+from .config import config_dict, is_website_section
+from .download import download
+from .website import Website
+
+STATE_FILE = ".kiosque-issues.json"
+
+
+class IssueState:
+    """Record of the issues downloaded in a directory."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.path = directory / STATE_FILE
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text())
+        self.lock = threading.Lock()
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Return the conditional headers for a previously downloaded URL."""
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry is None or not (self.directory / entry["file"]).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, url: str, path: Path, headers: Mapping[str, str]) -> None:
+        with self.lock:
+            self.entries[url] = {
+                "file": path.name,
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+            }
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            content = json.dumps(self.entries, indent=2, sort_keys=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(content)
+        temp.replace(self.path)
+
+
+def issue_websites() -> list[type[Website]]:
+    """Return the configured websites providing PDF issues."""
+    websites: list[type[Website]] = []
+    for key in config_dict:
+        if not is_website_section(key):
+            continue
+        if not key.endswith("/"):
+            key += "/"
+        website = Website.website_class(key)
+        if website is None:
+            logging.warning(f"Unsupported website in configuration: {key}")
+            continue
+        if website.latest_issue_url is Website.latest_issue_url:
+            continue
+        if website not in websites:
+            websites.append(website)
+    return websites
+
+
+def dates(since: datetime, until: datetime) -> Iterator[datetime]:
+    """Iterate over all days between since and until (included)."""
+    day = since
+    while day.date() <= until.date():
+        yield day
+        day += timedelta(days=1)
+
+
+def sync_website(
+    website: type[Website],
+    directory: Path,
+    state: IssueState,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    segments: int = 1,
+) -> list[Path]:
+    """Download the new issues of one publication."""
+    instance = website()
+    instance.ensure_login()
+
+    if since is not None and website.issue_url is not Website.issue_url:
+        urls = [
+            instance.issue_url(date)
+            for date in dates(since, until or datetime.now(since.tzinfo))
+        ]
+    else:
+        if since is not None:
+            logging.info(f"{website.__name__} only provides its latest issue")
+        urls = [instance.latest_issue_url()]
+
+    downloaded = []
+    for url in urls:
+        response: dict[str, Any] = {}
+
+        def file_name(c: httpx.Response) -> str:
+            name = Path(instance.file_name(c)).with_suffix(".pdf").name
+            response["headers"] = c.headers
+            response["existing"] = (directory / name).exists()
+            return name
+
+        try:
+            path = download(
+                url,
+                directory,
+                file_name,
+                segments=segments,
+                headers=state.conditional_headers(url),
+                skip_existing=True,
+            )
+        except httpx.HTTPStatusError as e:
+            if len(urls) == 1:
+                raise
+            # Missing editions are expected when iterating over dates
+            logging.warning(f"No issue at {url}: {e.response.status_code}")
+            continue
+
+        if path is None:  # Not modified
+            continue
+        if not response["existing"]:
+            downloaded.append(path)
+        state.record(url, path, response["headers"])
+
+    return downloaded
+
+
+def sync_issues(
+    directory: Path,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    segments: int = 1,
+) -> list[Path]:
+    """Download the new issues of all configured publications.
+
+    Args:
+        directory: The directory where issues are stored.
+        since: First day of the date range, for publications with a
+            predictable URL scheme. Other publications only download their
+            latest issue.
+        until: Last day of the date range (default: today).
+        segments: Number of parallel segments for each download.
+
+    Returns:
+        The list of newly downloaded files.
+    """
+    state = IssueState(directory)
+    websites = issue_websites()
+    downloaded: list[Path] = []
+
+    if not websites:
+        logging.warning("No configured publication provides PDF issues")
+        return downloaded
+
+    with ThreadPoolExecutor(max_workers=len(websites)) as executor:
+        futures = {
+            executor.submit(
+                sync_website, website, directory, state, since, until, segments
+            ): website
+            for website in websites
+        }
+        for future in as_completed(futures):
+            website = futures[future]
+            try:
+                downloaded.extend(future.result())
+            except Exception as e:
+                logging.error(f"Failed to synchronise {website.__name__}: {e}")
+
+    state.save()
+    return downloaded
@@ -0,0 +1,145 @@
+"""State of incremental exports.
+
+A manifest in the export directory remembers, for each article, the file
+it was written to, a hash of its text, the version of the extraction rules,
+and what tells whether the article changed online: HTTP validators (ETag,
+Last-Modified) and the modification time advertised by the page.
+
+When an export is run again, each exported article is checked with a
+conditional request, reading at most the ``<head>`` of the page: articles
+are only extracted again when they changed, or when the rules of their
+website changed (``Website.version``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from .stream import StreamedPage, fetch_until
+from .website import Website
+
+MANIFEST_NAME = ".kiosque-manifest.json"
+
+# Bump when changes in core/ alter the extracted texts
+EXTRACTION_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    path: str  # relative to the export directory
+    hash: str
+    version: str
+    etag: str | None = None
+    last_modified: str | None = None
+    updated_time: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def extraction_version(website: Website) -> str:
+    return f"{EXTRACTION_VERSION}.{website.version}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ExportManifest:
+    """Exported articles of a directory, by URL."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.path = directory / MANIFEST_NAME
+        self.entries: dict[str, ManifestEntry] = {}
+        self.lock = threading.Lock()
+        if self.path.exists():
+            try:
+                self.entries = {
+                    url: ManifestEntry(**entry)
+                    for url, entry in json.loads(self.path.read_text()).items()
+                }
+            except (json.JSONDecodeError, TypeError):
+                logging.warning(f"Ignoring corrupted manifest {self.path}")
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def get(self, url: str) -> ManifestEntry | None:
+        """Return the entry of an article, if its file still exists."""
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry is None or not (self.directory / entry.path).exists():
+            return None
+        return entry
+
+    def set(self, url: str, entry: ManifestEntry) -> None:
+        with self.lock:
+            self.entries[url] = entry
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        with self.lock:
+            content = json.dumps(
+                {url: asdict(entry) for url, entry in self.entries.items()},
+                indent=1,
+            )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(content)
+        temp.replace(self.path)
+
+
+def _same_validators(page: StreamedPage, entry: ManifestEntry) -> bool:
+    if page.etag is not None:
+        return page.etag == entry.etag
+    return page.last_modified is not None and (
+        page.last_modified == entry.last_modified
+    )
+
+
+def check_unchanged(
+    website: Website, url: str, entry: ManifestEntry
+) -> ManifestEntry | None:
+    """Check whether an exported article is still up to date.
+
+    Returns:
+        The entry, with refreshed validators, if the article is unchanged;
+        None if it must be extracted again.
+    """
+    if entry.version != extraction_version(website):
+        logging.info(f"Extraction rules changed for {url}")
+        return None
+    # The URL fetched by the extraction, which the validators refer to
+    page = fetch_until(
+        url,
+        head_only=True,
+        headers=entry.conditional_headers(),
+    )
+    if page.not_modified:
+        return entry
+    updated_time = page.find_meta(website.updated_meta)
+    if updated_time is None and entry.updated_time is None:
+        # Without modification time, rely on the validators (the server
+        # may send the same ones, yet ignore conditional requests)
+        if not _same_validators(page, entry):
+            logging.info(f"{url} may have changed")
+            return None
+    elif updated_time != entry.updated_time:
+        logging.info(f"{url} changed (modified {updated_time})")
+        return None
+    return replace(
+        entry,
+        etag=page.etag or entry.etag,
+        last_modified=page.last_modified or entry.last_modified,
+    )
@@ -0,0 +1,48 @@
+"""Head-only metadata of many articles, for link triage.
+
+Each page is only streamed until ``</head>``: the header fields (title,
+author, date, description) are filled from the ``<meta>`` tags and the
+JSON-LD objects, without extracting nor converting the article.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+from .canonical import canonical_index, normalize_url
+from .stream import fetch_until
+from .website import Website
+
+
+def url_metadata(url: str) -> dict[str, str | None]:
+    """Return the header fields of one URL, supported website or not."""
+    key = normalize_url(url)
+    website = Website.website_class(key)
+    if website is not None:
+        return website().metadata(url)
+    page = fetch_until(url, head_only=True)
+    if page.canonical is not None:
+        canonical_index.learn(key, page.canonical)
+    return {"url": canonical_index.get(key), **Website.page_metadata(page)}
+
+
+def iter_metadata(
+    urls: Iterable[str], jobs: int = 8
+) -> Iterator[dict[str, str | None]]:
+    """Fetch the metadata of several URLs concurrently.
+
+    Records are yielded as soon as they are available, so the order may
+    differ from the order of urls. Failures are reported in an ``error``
+    field rather than interrupting the whole batch.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(url_metadata, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                logging.warning(f"Failed to fetch metadata for {url}: {e}")
+                yield {"url": url, "error": str(e)}
@@ -0,0 +1,191 @@
+"""Per-host routing of requests through a pool of proxies.
+
+Depending on the ``mode`` of the ``[proxy]`` configuration:
+
+- ``all``: every request goes through the proxy (default);
+- ``hosts``: only the configured hosts go through the proxy;
+- ``auto``: same as ``hosts``, but a request answered with a geo-blocking
+  status (403, 406, 451) is retried through the proxy. If the proxy gets
+  through, the host is remembered (across runs) and all its subsequent
+  requests go through the proxy.
+
+When several proxies are configured, each host is assigned a proxy of the
+pool, and the next ones are tried if it fails to connect.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import zlib
+from pathlib import Path
+from typing import Any
+
+import httpx
+from httpx_socks import (
+    ProxyConnectionError,
+    ProxyError,
+    ProxyTimeoutError,
+)
+
+from .config import ProxyConfig
+
+GEO_BLOCKING_STATUS = {403, 406, 451}
+
+PROXY_ERRORS = (
+    httpx.TransportError,
+    ProxyConnectionError,
+    ProxyError,
+    ProxyTimeoutError,
+)
+
+
+def _match(host: str, rules: set[str]) -> bool:
+    """Check whether host or one of its parent domains is in rules."""
+    parts = host.lower().split(".")
+    return any(".".join(parts[i:]) in rules for i in range(len(parts)))
+
+
+class ProxyRouter:
+    """Routing decisions, shared by the sync and async transports."""
+
+    def __init__(self, config: ProxyConfig, state_file: Path | None) -> None:
+        self.mode = config.mode
+        self.urls = config.urls
+        self.hosts = set(config.hosts)
+        self.state_file = state_file
+        self.learned: set[str] = set()
+        if state_file is not None and state_file.exists():
+            self.learned = set(json.loads(state_file.read_text()))
+        self.lock = threading.Lock()
+
+    def use_proxy(self, host: str) -> bool:
+        if self.mode == "all":
+            return True
+        return _match(host, self.hosts) or host in self.learned
+
+    def should_retry(self, host: str, status_code: int) -> bool:
+        """Check whether a direct response should be retried via a proxy."""
+        return self.mode == "auto" and status_code in GEO_BLOCKING_STATUS
+
+    def learn(self, host: str) -> None:
+        """Remember that host needs a proxy."""
+        with self.lock:
+            if host in self.learned:
+                return
+            self.learned.add(host)
+            logging.info(f"Routing {host} through the proxy from now on")
+            if self.state_file is not None:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                self.state_file.write_text(json.dumps(sorted(self.learned)))
+
+    def proxy_order(self, host: str) -> list[int]:
+        """Return the indices of the proxies to try for host, in order."""
+        n = len(self.urls)
+        first = zlib.crc32(host.encode()) % n
+        return [(first + i) % n for i in range(n)]
+
+
+def _proxy_transport(url: str, **kwargs: Any) -> httpx.BaseTransport:
+    if url.startswith("socks"):
+        from httpx_socks import SyncProxyTransport
+
+        return SyncProxyTransport.from_url(url, **kwargs)
+    return httpx.HTTPTransport(proxy=url, **kwargs)
+
+
+def _async_proxy_transport(url: str, **kwargs: Any) -> httpx.AsyncBaseTransport:
+    if url.startswith("socks"):
+        from httpx_socks import AsyncProxyTransport
+
+        return AsyncProxyTransport.from_url(url, **kwargs)
+    return httpx.AsyncHTTPTransport(proxy=url, **kwargs)
+
+
+class RoutingTransport(httpx.BaseTransport):
+    """Transport sending each request directly or through a proxy."""
+
+    def __init__(self, router: ProxyRouter, **kwargs: Any) -> None:
+        self.router = router
+        self.direct = httpx.HTTPTransport(**kwargs)
+        self.proxies = [_proxy_transport(url, **kwargs) for url in router.urls]
+
+    def _handle_via_proxy(self, request: httpx.Request) -> httpx.Response:
+        order = self.router.proxy_order(request.url.host)
+        for i in order:
+            try:
+                return self.proxies[i].handle_request(request)
+            except PROXY_ERRORS as e:
+                logging.warning(f"Proxy {self.router.urls[i]} failed: {e}")
+                if i == order[-1]:
+                    raise
+        raise AssertionError("unreachable")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if self.router.use_proxy(host):
+            return self._handle_via_proxy(request)
+
+        response = self.direct.handle_request(request)
+        if self.router.should_retry(host, response.status_code):
+            logging.info(
+                f"{host} answered {response.status_code}, "
+                "retrying through the proxy"
+            )
+            response.close()
+            response = self._handle_via_proxy(request)
+            if response.status_code not in GEO_BLOCKING_STATUS:
+                self.router.learn(host)
+        return response
+
+    def close(self) -> None:
+        self.direct.close()
+        for transport in self.proxies:
+            transport.close()
+
+
+class AsyncRoutingTransport(httpx.AsyncBaseTransport):
+    """Async transport sending each request directly or through a proxy."""
+
+    def __init__(self, router: ProxyRouter, **kwargs: Any) -> None:
+        self.router = router
+        self.direct = httpx.AsyncHTTPTransport(**kwargs)
+        self.proxies = [
+            _async_proxy_transport(url, **kwargs) for url in router.urls
+        ]
+
+    async def _handle_via_proxy(self, request: httpx.Request) -> httpx.Response:
+        order = self.router.proxy_order(request.url.host)
+        for i in order:
+            try:
+                return await self.proxies[i].handle_async_request(request)
+            except PROXY_ERRORS as e:
+                logging.warning(f"Proxy {self.router.urls[i]} failed: {e}")
+                if i == order[-1]:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        host = request.url.host
+        if self.router.use_proxy(host):
+            return await self._handle_via_proxy(request)
+
+        response = await self.direct.handle_async_request(request)
+        if self.router.should_retry(host, response.status_code):
+            logging.info(
+                f"{host} answered {response.status_code}, "
+                "retrying through the proxy"
+            )
+            await response.aclose()
+            response = await self._handle_via_proxy(request)
+            if response.status_code not in GEO_BLOCKING_STATUS:
+                self.router.learn(host)
+        return response
+
+    async def aclose(self) -> None:
+        await self.direct.aclose()
+        for transport in self.proxies:
+            await transport.aclose()
@@ -0,0 +1,214 @@
+"""Local SQLite store of extracted articles, with full-text search.
+
+Articles (header fields and Markdown text) are stored in a single SQLite
+database, indexed with FTS5. The index is an external content table kept
+in sync by triggers, so the text is only stored once.
+
+The MinHash signatures of articles (see ``core/dedup.py``) are stored
+alongside, to look for near-duplicates.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .config import data_dir, validate_store_config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    site TEXT,
+    title TEXT,
+    author TEXT,
+    date TEXT,
+    description TEXT,
+    text TEXT NOT NULL,
+    added TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, author, description, text,
+    content='articles',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    signature BLOB NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, author, description, text)
+    VALUES (new.id, new.title, new.author, new.description, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(
+        articles_fts, rowid, title, author, description, text
+    )
+    VALUES ('delete', old.id, old.title, old.author, old.description, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(
+        articles_fts, rowid, title, author, description, text
+    )
+    VALUES ('delete', old.id, old.title, old.author, old.description, old.text);
+    INSERT INTO articles_fts(rowid, title, author, description, text)
+    VALUES (new.id, new.title, new.author, new.description, new.text);
+END;
+"""
+
+
+@dataclass
+class Article:
+    """An extracted article, as stored in the database."""
+
+    url: str
+    site: str | None
+    title: str | None
+    author: str | None
+    date: str | None
+    description: str | None
+    text: str  # Markdown, with the header
+    id: int | None = None
+    added: str | None = None
+    signature: bytes | None = None  # MinHash of the cleaned text
+
+
+@dataclass
+class SearchResult:
+    id: int
+    url: str
+    title: str | None
+    date: str | None
+    snippet: str
+
+
+def default_store_path() -> Path:
+    return validate_store_config().path or data_dir / "articles.db"
+
+
+class ArticleStore:
+    """SQLite database of extracted articles.
+
+    The connection must only be used from the thread which created it:
+    extraction may run in worker threads, but writes are expected to be
+    gathered and committed in batches with ``add_many()``.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> ArticleStore:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __contains__(self, url: str) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM articles WHERE url = ?", (url,)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM articles"
+        ).fetchone()[0]
+
+    def add_many(self, articles: Iterable[Article]) -> int:
+        """Insert (or replace) articles in a single transaction.
+
+        Returns:
+            The number of articles written.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = [{**asdict(article), "added": now} for article in articles]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO articles "
+                "(url, site, title, author, date, description, text, added) "
+                "VALUES (:url, :site, :title, :author, :date, :description, "
+                ":text, :added) "
+                "ON CONFLICT(url) DO UPDATE SET "
+                "site=excluded.site, title=excluded.title, "
+                "author=excluded.author, date=excluded.date, "
+                "description=excluded.description, text=excluded.text",
+                rows,
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO signatures (article_id, signature) "
+                "SELECT id, :signature FROM articles WHERE url = :url",
+                [row for row in rows if row["signature"] is not None],
+            )
+        logging.info(f"{len(rows)} article(s) written to {self.path}")
+        return len(rows)
+
+    def add(self, article: Article) -> None:
+        self.add_many([article])
+
+    def get(self, id_or_url: int | str) -> Article | None:
+        column = "id" if isinstance(id_or_url, int) else "url"
+        row = self.connection.execute(
+            "SELECT a.*, s.signature FROM articles a "
+            "LEFT JOIN signatures s ON s.article_id = a.id "
+            f"WHERE a.{column} = ?",
+            (id_or_url,),
+        ).fetchone()
+        if row is None:
+            return None
+        return Article(**{f.name: row[f.name] for f in fields(Article)})
+
+    def signatures(self, urls: Iterable[str] | None = None) -> dict[str, bytes]:
+        """Return the signatures of (some of) the stored articles, by URL."""
+        rows = self.connection.execute(
+            "SELECT a.url, s.signature FROM signatures s "
+            "JOIN articles a ON a.id = s.article_id"
+        )
+        signatures = {row["url"]: row["signature"] for row in rows}
+        if urls is None:
+            return signatures
+        return {url: signatures[url] for url in urls if url in signatures}
+
+    def texts(self) -> Iterator[tuple[str, str]]:
+        """Iterate over the URLs and texts of articles, oldest first."""
+        rows = self.connection.execute(
+            "SELECT url, text FROM articles ORDER BY added, id"
+        )
+        for row in rows:
+            yield row["url"], row["text"]
+
+    def search(self, query: str, limit: int = 20) -> list[SearchResult]:
+        """Full-text search, best matches first.
+
+        The query follows the FTS5 syntax: words, "phrases", prefix*,
+        AND/OR/NOT, column filters (e.g. ``author:dupont``).
+
+        Raises:
+            ValueError: If the query is not valid.
+        """
+        try:
+            rows = self.connection.execute(
+                "SELECT a.id, a.url, a.title, a.date, "
+                "snippet(articles_fts, 3, '[', ']', '…', 12) AS snippet "
+                "FROM articles_fts "
+                "JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? "
+                "ORDER BY bm25(articles_fts, 10.0, 5.0, 2.0, 1.0) LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        return [SearchResult(**dict(row)) for row in rows]
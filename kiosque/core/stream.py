@@ -0,0 +1,346 @@
+"""Incremental parsing of streamed HTML pages.
+
+Article pages often carry hundreds of kB of scripts, comments and widgets
+after the article body. Instead of waiting for the full body, the response
+is streamed and, if reading may stop early, fed to an lxml pull parser: the
+``<meta>`` tags are indexed as they arrive, and reading stops as soon as a
+given condition is met (e.g. the article node has been closed, or
+``</head>`` has been reached).
+
+Responses are checked before their body is read: resources which are not
+HTML (PDF, videos, etc.) are rejected with ``NotHTMLError``, and pages
+exceeding their maximum size (``max_page_size`` in the configuration) with
+``PageTooLargeError``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import httpx
+import stamina
+from lxml import etree
+
+from . import archive as archive_module
+from .client import client, http_config
+from .config import validate_page_size_config
+
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+
+# Host name -> maximum page size in MB
+page_sizes = validate_page_size_config()
+
+
+class NotHTMLError(ValueError):
+    """The URL points to a resource which is not a web page."""
+
+    def __init__(self, url: str, content_type: str) -> None:
+        self.url = url
+        self.content_type = content_type
+        super().__init__(f"{url} is not a web page ({content_type})")
+
+
+class PageTooLargeError(ValueError):
+    """The web page exceeds its maximum size."""
+
+    def __init__(self, url: str, max_bytes: int) -> None:
+        self.url = url
+        self.max_bytes = max_bytes
+        super().__init__(
+            f"{url} exceeds the maximum page size of "
+            f"{max_bytes / 2**20:.1f} MB (see max_page_size in the "
+            "configuration file)"
+        )
+
+
+def page_budget(url: str, default: float | None = None) -> int:
+    """Return the maximum number of bytes to read for a web page.
+
+    Args:
+        url: The URL of the page, matched against the ``[max_page_size]``
+            section of the configuration file (parent domains included).
+        default: The maximum size in MB for this website, if the global
+            ``max_page_size`` of the ``[http]`` section does not fit.
+    """
+    parts = httpx.URL(url).host.lower().split(".")
+    for i in range(len(parts)):
+        if (size := page_sizes.get(".".join(parts[i:]))) is not None:
+            return int(size * 2**20)
+    return int((default or http_config.max_page_size) * 2**20)
+
+
+def check_response(c: httpx.Response, max_bytes: int) -> None:
+    """Check the headers of a response before reading its body.
+
+    Raises:
+        NotHTMLError: If the Content-Type is not HTML.
+        PageTooLargeError: If the Content-Length exceeds max_bytes.
+    """
+    content_type = c.headers.get("Content-Type", "")
+    mime_type = content_type.split(";")[0].strip().lower()
+    if mime_type and mime_type not in HTML_CONTENT_TYPES:
+        raise NotHTMLError(str(c.url), mime_type)
+    length = c.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise PageTooLargeError(str(c.url), max_bytes)
+
+
+def is_transient(exc: Exception) -> bool:
+    """Whether a failed request is worth retrying (network errors, 5xx).
+
+    Client errors (404, 403, paywalls) are final, and raised at once.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.is_server_error
+    return isinstance(exc, httpx.TransportError)
+
+
+# Element -> whether it starts a node of interest
+Matcher = Callable[[Any], bool]
+
+
+@dataclass
+class StreamedPage:
+    """The beginning of an HTML page, read from a streamed response."""
+
+    url: str
+    content: bytes
+    encoding: str | None
+    meta: list[dict[str, str]] = field(default_factory=list)
+    title: str | None = None
+    canonical: str | None = None
+    json_ld: list[Any] = field(default_factory=list)
+    complete: bool = True
+    status_code: int = 200
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    def find_meta(self, attrs: dict[str, Any]) -> str | None:
+        """Return the content of the first meta tag matching attrs.
+
+        Follows the BeautifulSoup semantics used by the ``*_meta`` fields
+        of Website: each value is a string or a list of accepted strings.
+        """
+        for meta in self.meta:
+            if all(
+                _match_value(meta.get(key), expected, key)
+                for key, expected in attrs.items()
+            ):
+                return meta.get("content")
+        return None
+
+    def find_json_ld(self, key: str) -> Any:
+        """Return the first value for key in the JSON-LD objects."""
+        for item in _json_ld_items(self.json_ld):
+            if item.get(key):
+                return item[key]
+        return None
+
+
+def _json_ld_items(data: Any) -> Iterator[dict[str, Any]]:
+    """Iterate over the objects of JSON-LD data, including @graph."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_items(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _json_ld_items(data.get("@graph"))
+
+
+def _match_value(value: str | None, expected: Any, key: str) -> bool:
+    if value is None:
+        return expected is False or expected is None
+    if expected is True:
+        return True
+    candidates = [*value.split(), value] if key == "class" else [value]
+    if isinstance(expected, str):
+        return expected in candidates
+    if isinstance(expected, re.Pattern):
+        return any(expected.search(c) for c in candidates)
+    if isinstance(expected, (list, tuple, set)):
+        return any(_match_value(value, e, key) for e in expected)
+    return False
+
+
+def node_matcher(node: str | tuple[str, dict[str, Any]]) -> Matcher:
+    """Build a matcher for lxml elements from a Website node selector.
+
+    Selectors are the ``article_node`` fields: a tag name, or a tag name
+    with a dictionary of attributes (BeautifulSoup semantics).
+    """
+    tag, attrs = (node, {}) if isinstance(node, str) else node
+
+    def match(element: Any) -> bool:
+        if element.tag != tag:
+            return False
+        return all(
+            _match_value(element.get(key), expected, key)
+            for key, expected in attrs.items()
+        )
+
+    return match
+
+
+@stamina.retry(on=is_transient, attempts=3, timeout=None)
+def fetch_limited(url: str, max_bytes: int) -> httpx.Response:
+    """Fetch a resource of any type, aborting if it exceeds max_bytes.
+
+    Raises:
+        PageTooLargeError: If the resource exceeds max_bytes.
+    """
+    with client.stream("GET", url) as c:
+        c.raise_for_status()
+        length = c.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > max_bytes:
+            raise PageTooLargeError(url, max_bytes)
+        chunks: list[bytes] = []
+        size = 0
+        for chunk in c.iter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                raise PageTooLargeError(url, max_bytes)
+        if archive_module.archive is not None:
+            archive_module.archive.write(c, b"".join(chunks))
+    # The content is already decoded
+    headers = httpx.Headers(c.headers)
+    for key in ("Content-Encoding", "Content-Length"):
+        headers.pop(key, None)
+    return httpx.Response(
+        c.status_code,
+        headers=headers,
+        content=b"".join(chunks),
+        request=c.request,
+    )
+
+
+@stamina.retry(on=is_transient, attempts=3, timeout=None)
+def fetch_until(
+    url: str,
+    node: Matcher | None = None,
+    *,
+    head_only: bool = False,
+    max_bytes: int | None = None,
+    headers: dict[str, str] | None = None,
+) -> StreamedPage:
+    """Stream an HTML page until a node has been fully received.
+
+    Args:
+        url: The URL of the page.
+        node: Stop reading once the (outermost) element matching this
+            function has been closed.
+        head_only: Stop reading at the end of ``<head>``.
+        max_bytes: Abort if the page is larger (default: ``page_budget``).
+        headers: Additional request headers, e.g. ``If-None-Match`` for a
+            conditional request.
+
+    Returns:
+        The received content (to be parsed with BeautifulSoup, which copes
+        with truncated documents) and the meta tags found on the way. Meta
+        tags are only indexed with a node or head_only: otherwise the whole
+        page is read without being parsed. An empty page if the server
+        answers 304 Not Modified.
+
+    Raises:
+        NotHTMLError: If the URL points to a PDF, a video, etc. The body is
+            not read.
+        PageTooLargeError: If the page exceeds max_bytes.
+    """
+    if max_bytes is None:
+        max_bytes = page_budget(url)
+    chunks: list[bytes] = []
+    meta: list[dict[str, str]] = []
+    json_ld: list[Any] = []
+    title: str | None = None
+    canonical: str | None = None
+    size, depth, complete = 0, 0, True
+
+    with client.stream("GET", url, headers=headers) as c:
+        etag = c.headers.get("ETag")
+        last_modified = c.headers.get("Last-Modified")
+        if c.status_code == 304:
+            return StreamedPage(
+                url=url,
+                content=b"",
+                encoding=None,
+                status_code=304,
+                etag=etag,
+                last_modified=last_modified,
+            )
+        c.raise_for_status()
+        check_response(c, max_bytes)
+        encoding = c.charset_encoding
+        # Without a condition to stop early, the page is only parsed once,
+        # by the caller
+        parser = None
+        if node is not None or head_only:
+            parser = etree.HTMLPullParser(
+                events=("start", "end"), encoding=encoding
+            )
+        for chunk in c.iter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                raise PageTooLargeError(url, max_bytes)
+            if parser is None:
+                continue
+            parser.feed(chunk)
+            stop = False
+            for event, element in parser.read_events():
+                if event == "end" and element.tag == "meta":
+                    meta.append(dict(element.attrib))
+                elif (
+                    event == "end"
+                    and element.tag == "link"
+                    and element.get("rel", "").lower() == "canonical"
+                ):
+                    canonical = canonical or element.get("href")
+                elif event == "end" and element.tag == "title":
+                    title = title or (element.text or "").strip() or None
+                elif (
+                    event == "end"
+                    and element.tag == "script"
+                    and "ld+json" in element.get("type", "")
+                ):
+                    try:
+                        json_ld.append(json.loads(element.text or ""))
+                    except json.JSONDecodeError:
+                        logging.debug(f"Invalid JSON-LD in {url}")
+                elif event == "end" and head_only and element.tag == "head":
+                    stop = True
+                elif node is not None and node(element):
+                    depth += 1 if event == "start" else -1
+                    stop = event == "end" and depth == 0
+                if stop:
+                    break
+            if stop:
+                complete = False
+                break
+
+        if not complete:
+            logging.debug(f"Stopped reading {url} after {size} bytes")
+        if archive_module.archive is not None:
+            archive_module.archive.write(
+                c, b"".join(chunks), truncated=not complete
+            )
+
+    return StreamedPage(
+        url=url,
+        content=b"".join(chunks),
+        encoding=encoding,
+        meta=meta,
+        title=title,
+        canonical=canonical,
+        json_ld=json_ld,
+        complete=complete,
+        etag=etag,
+        last_modified=last_modified,
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import copy
 import logging
 import re
+import threading
 from datetime import datetime
 from functools import lru_cache
 from importlib import import_module
@@ -15,18 +16,58 @@ from bs4 import BeautifulSoup
 from bs4._typing import _StrainableAttributes
 from bs4.element import Tag
 
+from .alternate import alternate_stats
+from .archive import current_article
+from .cancel import checkpoint
+from .canonical import canonical_index, canonical_url, normalize_url
 from .client import (
     async_get_with_retry,
     client,
     get_with_retry,
     post_with_retry,
 )
-from .config import config_dict
+from .compress import write_export
+from .config import config_dict, is_website_section
+from .download import ProgressCallback, download
+from .stream import (
+    StreamedPage,
+    fetch_limited,
+    fetch_until,
+    node_matcher,
+    page_budget,
+)
+
+# One lock per website: the login state (``connected``, cookies of the
+# shared client) is shared by the instances of a website, and by threads
+_login_locks: dict[type[Website], threading.Lock] = {}
+
+
+def format_date(date: str) -> str:
+    """Format an ISO 8601 datetime as YYYY-MM-DD."""
+    try:
+        dt = datetime.fromisoformat(date.replace("Z", "+00:00"))
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, AttributeError):
+        # If parsing fails, try to extract just the date part
+        return date[:10] if len(date) >= 10 else date
+
+
+def _json_ld_name(author: Any) -> str | None:
+    """Return the name(s) of a JSON-LD author (string, object or list)."""
+    if isinstance(author, str):
+        return author
+    if isinstance(author, dict):
+        return author.get("name")
+    if isinstance(author, list):
+        names = [name for a in author if (name := _json_ld_name(a))]
+        return ", ".join(names) if names else None
+    return None
 
 
 class Website:
     known_websites: ClassVar[list[type["Website"]]] = list()
     _module_cache: ClassVar[dict[str, str]] = {}  # Cache base_url -> module
+    _alias_urls: ClassVar[dict[str, str]] = {}  # Cache alias -> base_url
 
     alias: ClassVar[list[str]] = list()
     base_url: str
@@ -62,6 +103,15 @@ class Website:
         ]
     }
 
+    updated_meta: ClassVar[_StrainableAttributes] = {
+        "property": [
+            "article:modified_time",
+            "og:article:modified_time",
+            "og:updated_time",
+            "og:article:updated_time",
+        ]
+    }
+
     description_meta: ClassVar[_StrainableAttributes] = {
         "property": [
             "og:description",
@@ -71,6 +121,22 @@ class Website:
 
     article_node: str | tuple[str, _StrainableAttributes]
 
+    # Stream the page and stop reading once article_node has been closed.
+    # Only opt in when all the fields of the header are found before the
+    # end of the article node.
+    stop_after_article: ClassVar[bool] = False
+
+    # Query parameters identifying an article (see core/canonical.py), all
+    # parameters but tracking ones are kept if None
+    query_params: ClassVar[list[str] | None] = None
+
+    # Maximum size of a page in MB, if the default value does not fit
+    max_page_size: ClassVar[float | None] = None
+
+    # Bump when the extraction rules change: incremental exports (see
+    # core/manifest.py) then extract the articles of the website again.
+    version: ClassVar[int] = 1
+
     clean_nodes: ClassVar[list[str | tuple[str, _StrainableAttributes]]] = []
     clean_attributes: ClassVar[
         list[str | tuple[str, _StrainableAttributes]]
@@ -89,10 +155,20 @@ class Website:
 
     def __init__(self) -> None:
         self.credentials = config_dict.get(self.base_url, None)
+        # ETag and Last-Modified headers of the pages fetched, by URL
+        self._validators: dict[str, tuple[str | None, str | None]] = {}
+        # URL fetched for each normalized URL (the key of cached pages)
+        self._urls: dict[str, str] = {}
 
     @classmethod
     def _build_module_cache(cls) -> None:
-        """Build cache of base_url -> module_name and alias mappings."""
+        """Build cache of base_url -> module_name and alias mappings.
+
+        The cache is built from the source of the website modules and from
+        the ``alias`` entries in the configuration file: no website module
+        is imported at this stage. The base_url of each alias is kept too,
+        as some modules define several websites.
+        """
         if cls._module_cache:
             return  # Already cached
 
@@ -107,33 +183,86 @@ class Website:
             content = x.read_text()
             module_name = f"kiosque.website.{x.stem}"
 
-            # Extract base_url
-            for line in content.split("\n"):
-                match = base_url_pat.match(line)
-                if match:
-                    cls._module_cache[match.group(1)] = module_name
-                    break
-
-            # Extract aliases
-            for line in content.split("\n"):
-                match = alias_pat.match(line)
-                if match:
-                    # Parse alias list: ["foo", "bar"] or ['foo', 'bar']
-                    aliases_str = match.group(1)
-                    # Simple parsing: extract strings between quotes
-                    alias_items = re.findall(
-                        r'["\']([^"\']+)["\']', aliases_str
-                    )
-                    for alias in alias_items:
-                        cls._module_cache[alias] = module_name
-                    break
+            # Some modules define several websites: one class at a time
+            for block in re.split(r"^class ", content, flags=re.MULTILINE):
+                base_url = None
+                alias_items: list[str] = []
+                for line in block.split("\n"):
+                    # Extract base_url
+                    if match := base_url_pat.match(line):
+                        base_url = match.group(1)
+                        cls._module_cache[base_url] = module_name
+                    # Extract aliases
+                    elif match := alias_pat.match(line):
+                        # Parse alias list: ["foo", "bar"] or ['foo', 'bar']
+                        aliases_str = match.group(1)
+                        # Simple parsing: extract strings between quotes
+                        alias_items = re.findall(
+                            r'["\']([^"\']+)["\']', aliases_str
+                        )
+                for alias in alias_items:
+                    cls._module_cache[alias] = module_name
+                    if base_url is not None:
+                        cls._alias_urls[alias] = base_url
+
+        # Extract aliases from the configuration file
+        for key, value in config_dict.items():
+            if not is_website_section(key) or "alias" not in value:
+                continue
+            if not key.endswith("/"):
+                key += "/"
+            base_url = key.replace("http://", "https://")
+            module_name = cls._module_cache.get(base_url)
+            if module_name is None:
+                logging.warning(f"Aliases defined for unsupported {key}")
+                continue
+            for alias in value["alias"].split(","):
+                logging.debug(f"Setting alias '{alias.strip()}' for {key}")
+                cls._module_cache[alias.strip()] = module_name
+                cls._alias_urls[alias.strip()] = base_url
 
         logging.debug(
             f"Built module cache with {len(cls._module_cache)} entries"
         )
 
     @classmethod
-    def instance(cls, url_or_alias: str) -> Website:
+    def aliases(cls) -> dict[str, str]:
+        """Return all known aliases with the name of their module.
+
+        Aliases come from the website modules and from the configuration
+        file. Website modules are only imported when an alias is used.
+        """
+        cls._build_module_cache()
+        return {
+            key: module_name
+            for key, module_name in cls._module_cache.items()
+            if not key.startswith("http")
+        }
+
+    @classmethod
+    def _website_class(
+        cls, module_name: str, url_or_alias: str
+    ) -> type[Website]:
+        """Return the Website subclass of a module matching the URL."""
+        import_module(module_name)
+        candidates = [
+            website
+            for website in cls.known_websites
+            if website.__module__ == module_name
+        ]
+        url = cls._alias_urls.get(url_or_alias, url_or_alias)
+        for website in candidates:
+            if url.startswith(website.base_url):
+                return website
+        return candidates[-1]
+
+    @classmethod
+    def website_class(cls, url_or_alias: str) -> type[Website] | None:
+        """Return the Website subclass for a URL or an alias, if supported.
+
+        Only the matching website module is imported: the class can be
+        inspected without being instantiated.
+        """
         url_or_alias = url_or_alias.replace("http://", "https://")
 
         # -- First check if the website is already created --
@@ -142,7 +271,7 @@ class Website:
                 url_or_alias.startswith(website.base_url)
                 or url_or_alias in website.alias
             ):
-                return website()
+                return website
 
         # -- Otherwise use cache to find the module --
         cls._build_module_cache()
@@ -151,16 +280,22 @@ class Website:
         for key, module_name in cls._module_cache.items():
             if url_or_alias == key or url_or_alias.startswith(key):
                 logging.info(f"Import {module_name}")
-                globals()[module_name] = import_module(module_name)
-                return cls.known_websites[-1]()
+                return cls._website_class(module_name, url_or_alias)
+
+        return None
+
+    @classmethod
+    def instance(cls, url_or_alias: str) -> Website:
+        key = canonical_url(url_or_alias)
+
+        website = cls.website_class(key)
+        if website is not None:
+            return website()
 
         # -- Attempt to access the website, and fetch for the real URL --
-        c = get_with_retry(url_or_alias)
-        c.raise_for_status()
-        e = BeautifulSoup(c.content, features="lxml")
-        new_url_node = e.find("meta", {"property": "og:url"})
-        new_url: str = new_url_node.attrs["content"] if new_url_node else None  # type: ignore
-        if url_or_alias != new_url and new_url is not None:
+        page = fetch_until(url_or_alias, head_only=True)
+        new_url = page.find_meta({"property": "og:url"})
+        if new_url is not None and canonical_url(new_url) != key:
             cls.url_translation[url_or_alias] = new_url
             return cls.instance(new_url)
 
@@ -200,18 +335,106 @@ class Website:
         self.__class__.connected = True
         return c
 
+    def ensure_login(self) -> None:
+        """Log in, unless connected already.
+
+        Threads extracting articles of the same website concurrently wait
+        for the first one to log in, rather than all logging in.
+        """
+        if self.connected:
+            return
+        with _login_locks.setdefault(type(self), threading.Lock()):
+            if not self.connected:
+                self.login()
+
     # -- Metadata --
 
-    @lru_cache()
+    @classmethod
+    def canonical(cls, url: str) -> str:
+        """Return the canonical URL of an article, used as a cache key."""
+        return canonical_url(url, cls.query_params)
+
     def bs4(self, url: str) -> BeautifulSoup:
-        if not self.connected and self.credentials is not None:
-            self.login()
+        # Pages are cached by their normalized URL, but fetched at the URL
+        # given: a normalized URL (e.g. of a mobile or AMP page) may not
+        # exist, and the canonical URL learned before is checked again
+        key = normalize_url(url, self.query_params)
+        self._urls.setdefault(key, url)
+        return self._bs4(key)
+
+    @lru_cache()
+    def _bs4(self, key: str) -> BeautifulSoup:
+        # Tag the archived responses (if any) with the article
+        token = current_article.set(key)
+        try:
+            return self._fetch(key)
+        finally:
+            current_article.reset(token)
+
+    def _fetch(self, key: str) -> BeautifulSoup:
+        checkpoint("fetch")
+        if self.credentials is not None:
+            self.ensure_login()
+        url = self._urls.get(key, key)
         # Just in case this URL has been redirected...
         url = self.url_translation.get(url, url)
-        c = get_with_retry(url)
-        c.raise_for_status()
+        if (soup := self.alternate_bs4(url)) is not None:
+            return soup
+        node = None
+        if self.stop_after_article and hasattr(self, "article_node"):
+            node = node_matcher(self.article_node)
+        page = fetch_until(
+            url, node, max_bytes=page_budget(url, self.max_page_size)
+        )
+        alternate_stats.record(self.base_url, "full", len(page.content))
+        self._validators[key] = (page.etag, page.last_modified)
+        checkpoint("parse")
+        soup = BeautifulSoup(
+            page.content, features="lxml", from_encoding=page.encoding
+        )
+        canonical = page.canonical
+        if canonical is None and node is None:
+            link = soup.find("link", rel="canonical", href=True)
+            canonical = link.attrs["href"] if link is not None else None
+        if canonical is not None:
+            canonical_index.learn(key, canonical)
+        return soup
+
+    # -- Lighter representations (see core/alternate.py) --
+
+    def alternate_url(self, url: str) -> str | None:
+        """Return the URL of a lighter representation of the article.
+
+        e.g. an AMP page, a print version or a REST API endpoint. Return
+        None (default) to always fetch the full page.
+        """
+        return None
+
+    def alternate_page(self, c: httpx.Response) -> BeautifulSoup | None:
+        """Parse the alternate representation (HTML by default)."""
         return BeautifulSoup(c.content, features="lxml")
 
+    def alternate_bs4(self, url: str) -> BeautifulSoup | None:
+        """Fetch the alternate representation, if it contains the article."""
+        alternate = self.alternate_url(url)
+        if alternate is None or not alternate_stats.enabled(self.base_url):
+            return None
+        try:
+            c = fetch_limited(
+                alternate, page_budget(alternate, self.max_page_size)
+            )
+            checkpoint("parse")
+            soup = self.alternate_page(c)
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logging.info(f"No alternate page at {alternate}: {e}")
+            soup = None
+        if soup is None or self.find_article(soup) is None:
+            logging.info(f"Falling back to the full page of {url}")
+            alternate_stats.fallback(self.base_url)
+            return None
+        alternate_stats.record(self.base_url, "alternate", len(c.content))
+        return soup
+
     def title(self, url: str) -> str | None:
         e = self.bs4(url)
         node = e.find("meta", self.title_meta)
@@ -234,13 +457,25 @@ class Website:
         date = node.attrs.get("content", None)  # type: ignore
         if date is None:
             return None
-        # Parse ISO 8601 datetime and format as YYYY-MM-DD
-        try:
-            dt = datetime.fromisoformat(date.replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, AttributeError):
-            # If parsing fails, try to extract just the date part
-            return date[:10] if len(date) >= 10 else date
+        return format_date(date)
+
+    def updated_time(self, url: str) -> str | None:
+        """Return the time of the last modification of the article."""
+        e = self.bs4(url)
+        node = e.find("meta", self.updated_meta)
+        if node is None:
+            return None
+        return node.attrs.get("content", None)  # type: ignore
+
+    def validators(self, url: str) -> tuple[str | None, str | None]:
+        """Return the ETag and Last-Modified headers of the article page.
+
+        Both are None if the article was read from a lighter representation
+        (see ``alternate_bs4()``).
+        """
+        self.bs4(url)
+        key = normalize_url(url, self.query_params)
+        return self._validators.get(key, (None, None))
 
     def url(self, url: str) -> str:
         return url
@@ -262,16 +497,74 @@ class Website:
         )
         return f"---\n{entries}\n---\n"
 
+    # -- Head-only metadata --
+
+    def metadata(self, url: str) -> dict[str, str | None]:
+        """Return the header fields of an article, reading only its head.
+
+        The page is streamed until ``</head>``: neither ``article()`` nor
+        pandoc are involved.
+        """
+        if self.credentials is not None:
+            self.ensure_login()
+        key = normalize_url(url, self.query_params)
+        url = self.url_translation.get(url, url)
+        page = fetch_until(
+            url,
+            head_only=True,
+            max_bytes=page_budget(url, self.max_page_size),
+        )
+        if page.canonical is not None:
+            canonical_index.learn(key, page.canonical)
+        return {"url": canonical_index.get(key), **self.page_metadata(page)}
+
+    @classmethod
+    def page_metadata(cls, page: StreamedPage) -> dict[str, str | None]:
+        """Fill the header fields from the meta tags, then from JSON-LD.
+
+        Being a classmethod, it also applies to unsupported websites, with
+        the default ``*_meta`` fields.
+        """
+        title = page.find_meta(cls.title_meta)
+        title = title or page.find_json_ld("headline") or page.title
+
+        author = page.find_meta(cls.author_meta)
+        if author is None:
+            author = _json_ld_name(page.find_json_ld("author"))
+
+        date = page.find_meta(cls.date_meta)
+        date = date or page.find_json_ld("datePublished")
+
+        description = page.find_meta(cls.description_meta)
+        description = description or page.find_json_ld("description")
+
+        return {
+            "title": title,
+            "author": author,
+            "date": format_date(date) if isinstance(date, str) else None,
+            "description": description.strip().split("\n")[0]
+            if isinstance(description, str)
+            else None,
+        }
+
     # -- Extract article body --
 
-    def article(self, url: str) -> Tag:
-        e = self.bs4(url)
+    def find_article(self, e: BeautifulSoup) -> Tag | None:
+        """Return the article_node of a page, if present and not empty."""
+        if not hasattr(self, "article_node"):
+            return None
         if isinstance(self.article_node, str):
             article = e.find(self.article_node)
-        elif isinstance(self.article_node, tuple):
+        else:
             article = e.find(*self.article_node)
-        if article is not None:
-            return article  # type: ignore
+        if isinstance(article, Tag) and article.get_text(strip=True):
+            return article
+        return None
+
+    def article(self, url: str) -> Tag:
+        e = self.bs4(url)
+        if (article := self.find_article(e)) is not None:
+            return article
         raise NotImplementedError(
             f"Failed to extract article content from {url}. "
             "The article_node selector may need to be updated."
@@ -303,35 +596,44 @@ class Website:
     def content(self, url: str) -> str:
         article = self.article(url)
         article = self.clean(article)
+        checkpoint("convert")
         return pypandoc.convert_text(str(article), "md", format="html")
 
+    def plain_text(self, url: str) -> str:
+        """Return the cleaned text of the article, without pandoc."""
+        return self.clean(self.article(url)).get_text(" ", strip=True)
+
     def full_text(self, url: str) -> str:
         return f"{self.header(url)}\n{self.content(url)}"
 
+    def text_file_name(self, url: str) -> Path:
+        basename = f"{url.split('/')[-1]}"
+        return Path(f"{self.date(url)}-{basename}").with_suffix(".md")
+
     def write_text(self, url: str, filename: Path | None = None) -> None:
         if filename is None:
-            basename = f"{url.split('/')[-1]}"
-            filename = Path(f"{self.date(url)}-{basename}")
+            filename = self.text_file_name(url)
         filename = filename.with_suffix(".md")
+        filename = write_export(filename, self.full_text(url), url)
         logging.warning(f"Export to {filename.absolute()}")
-        filename.write_text(self.full_text(url))
 
     # -- Async versions for non-blocking operations --
     # TODO: These async methods are available for future full async refactor
-    # Currently, TUI uses asyncio.to_thread() to run sync full_text()
+    # Currently, the TUI runs sync full_text() in its own thread pool
+    # (see tui/executor.py)
     # This approach works with all websites, including those that
     # override article(). To use these async methods:
     #   1. Refactor website-specific article() overrides to be async
     #   2. Make login() async (11 websites have custom login logic)
-    #   3. Update TUI to call async_full_text() directly instead of to_thread()
+    #   3. Update TUI to call async_full_text() directly instead of threads
 
     async def async_bs4(self, url: str) -> BeautifulSoup:
         """Async version of bs4() for non-blocking HTTP requests.
 
         TODO: Make login() async to fully support async flow.
         """
-        if not self.connected and self.credentials is not None:
-            self.login()  # Login is still sync for now
+        if self.credentials is not None:
+            self.ensure_login()  # Login is still sync for now
         # Just in case this URL has been redirected...
         url = self.url_translation.get(url, url)
         c = await async_get_with_retry(url)
@@ -363,13 +665,7 @@ class Website:
         date = node.attrs.get("content", None)  # type: ignore
         if date is None:
             return None
-        # Parse ISO 8601 datetime and format as YYYY-MM-DD
-        try:
-            dt = datetime.fromisoformat(date.replace("Z", "+00:00"))
-            return dt.strftime("%Y-%m-%d")
-        except (ValueError, AttributeError):
-            # If parsing fails, try to extract just the date part
-            return date[:10] if len(date) >= 10 else date
+        return format_date(date)
 
     async def async_url(self, url: str) -> str:
         """Async version of url()."""
@@ -437,7 +733,7 @@ class Website:
     async def async_full_text(self, url: str) -> str:
         """Async version of full_text() for non-blocking article fetching.
 
-        TODO: Currently unused. TUI uses asyncio.to_thread(full_text) instead.
+        TODO: Currently unused. TUI runs full_text() in threads instead.
         This will be useful once all website-specific methods are made async.
         """
         header = await self.async_header(url)
@@ -453,21 +749,44 @@ class Website:
             "publications."
         )
 
+    def issue_url(self, date: datetime) -> str:
+        """Return the URL of the issue published at a given date.
+
+        Only publications with a predictable URL scheme implement this.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support downloading "
+            "PDF issues by date."
+        )
+
     def file_name(self, c: httpx.Response) -> str:
-        if not self.connected:
-            self.login()
-        url = self.latest_issue_url()
-        return Path(url).name
+        """Return the file name of a downloaded issue.
 
-    def get_latest_issue(self) -> httpx.Response:
-        if not self.connected:
-            self.login()
+        Defaults to the last segment of the issue URL, before redirections.
+        """
+        request = (c.history[0] if c.history else c).request
+        return Path(request.url.path).name
+
+    def save_latest_issue(
+        self,
+        directory: Path = Path("."),
+        segments: int = 1,
+        progress: ProgressCallback | None = None,
+    ) -> Path:
+        """Stream the latest issue to a file in directory.
+
+        Interrupted downloads are resumed on the next call. See
+        :func:`kiosque.core.download.download` for details.
+        """
+        self.ensure_login()
         url = self.latest_issue_url()
-        c = get_with_retry(url)
-        return c
-
-    def save_latest_issue(self) -> None:
-        c = self.get_latest_issue()
-        full_path = (Path(".") / self.file_name(c)).with_suffix(".pdf")
-        full_path.write_bytes(c.content)
+        full_path = download(
+            url,
+            directory,
+            lambda c: Path(self.file_name(c)).with_suffix(".pdf").name,
+            segments=segments,
+            progress=progress,
+        )
+        assert full_path is not None  # no conditional request here
         logging.info(f"File written: {full_path}")
+        return full_path
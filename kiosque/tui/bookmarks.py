@@ -0,0 +1,358 @@
+"""Virtualized list of bookmarks.
+
+Bookmarks are lightweight records (``Entry``, ``GitHubEntry``) in a backing
+array: the list only renders the rows in view, line by line, so that its
+cost does not depend on the number of bookmarks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import ClassVar, Generic, Protocol, TypeVar
+
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
+from textual import events
+from textual.binding import Binding, BindingType
+from textual.geometry import Region, Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from .executor import BlockingExecutor
+from .search import SearchIndex
+
+
+class Record(Protocol):
+    title: str
+    url: str
+
+    @property
+    def key(self) -> int: ...
+
+    def search_fields(self) -> dict[str, str | list[str]]: ...
+
+
+R = TypeVar("R", bound=Record)
+T = TypeVar("T")
+
+MAX_CACHED_ROWS = 500
+
+# Beyond this number of changed records, the search index is built again
+MAX_REINDEXED = 200
+
+
+class BookmarkList(ScrollView, Generic[R], can_focus=True):
+    """Scrollable list of bookmarks, with a cursor on the current one."""
+
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("up", "cursor(-1)", "Up", show=False),
+        Binding("down", "cursor(1)", "Down", show=False),
+        Binding("pageup", "page(-1)", "Page up", show=False),
+        Binding("pagedown", "page(1)", "Page down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+    ]
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "bookmark--cursor",
+        "bookmark--date",
+        "bookmark--duplicate",
+        "bookmark--excerpt",
+        "bookmark--faded",
+        "bookmark--gutter",
+        "bookmark--info",
+        "bookmark--tags",
+        "bookmark--title",
+        "bookmark--url",
+    }
+
+    # Lines per bookmark, including the blank separator line
+    ROW_HEIGHT: ClassVar[int] = 6
+
+    cursor: reactive[int] = reactive(0, always_update=True)
+
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self.records: list[R] = []
+        self.index: dict[int, R] = {}
+        self.shown: list[R] = []
+        self.pattern = ""
+        self.faded: set[int] = set()
+        # Built on the first search, then updated with the records
+        self._search: SearchIndex[R] | None = None
+        self._position: dict[int, int] | None = None
+        self._generation = 0  # Incremented when records change
+        # Query and generation of the records shown, to narrow them down
+        self._searched: tuple[str, int] | None = None
+        self._cache: dict[tuple[int, int, bool], list[Strip]] = {}
+
+    # -- Records --
+
+    @property
+    def current(self) -> R | None:
+        if 0 <= self.cursor < len(self.shown):
+            return self.shown[self.cursor]
+        return None
+
+    def prepend(self, records: list[R]) -> None:
+        """Add records on top of the list."""
+        self.records[:0] = records
+        self.index.update((record.key, record) for record in records)
+        self._reindex(records)
+        self.filter(self.pattern)
+
+    def extend(self, records: list[R]) -> None:
+        """Add records at the end of the list."""
+        self.records.extend(records)
+        self.index.update((record.key, record) for record in records)
+        self._reindex(records)
+        self.filter(self.pattern)
+
+    def restore(self, records: list[R], cursor: int, scroll_y: float) -> None:
+        """Display records saved in a snapshot, at the same position."""
+        self.extend(records)
+        self.cursor = cursor
+        self.call_after_refresh(self.scroll_to, y=scroll_y, animate=False)
+
+    def remove(self, record: R) -> None:
+        self.records.remove(record)
+        del self.index[record.key]
+        self.faded.discard(record.key)
+        if self._search is not None:
+            self._search.remove(record)
+        self._position = None
+        self._generation += 1
+        self.filter(self.pattern)
+
+    def sync(
+        self,
+        items: Iterable[T],
+        key: Callable[[T], int],
+        build: Callable[[T], R],
+        outdated: Callable[[R, T], bool],
+        partial: bool = False,
+    ) -> tuple[int, int, int]:
+        """Replace the records with fresh data from the API.
+
+        Items are matched with the current records by key, so that records
+        are only built for new items, or for items changed elsewhere.
+        Records missing from the data are removed, unless the data is
+        partial (still being downloaded): they are then kept after the
+        fresh ones. The list is filtered and rendered once, whatever the
+        number of changes.
+
+        Returns:
+            The number of added, updated and removed records.
+        """
+        records: list[R] = []
+        built: list[R] = []
+        for item in items:
+            record = self.index.get(key(item))
+            if record is None or outdated(record, item):
+                record = build(item)
+                built.append(record)
+            records.append(record)
+        added = sum(record.key not in self.index for record in built)
+        updated = len(built) - added
+
+        index = {record.key: record for record in records}
+        if partial:
+            records.extend(
+                record for record in self.records if record.key not in index
+            )
+            index = {record.key: record for record in records}
+        removed = [
+            record for key, record in self.index.items() if key not in index
+        ]
+        self.faded &= index.keys()
+        self.records, self.index = records, index
+        if self._search is not None:
+            for record in removed:
+                self._search.remove(record)
+        self._reindex(built)
+        self.filter(self.pattern)
+        return added, updated, len(removed)
+
+    def fade(self, record: R) -> None:
+        """Dim a record while an action on it is pending."""
+        self.faded.add(record.key)
+        self.refresh_record(record)
+
+    def refresh_record(self, record: R) -> None:
+        """Render a record again, after its fields changed."""
+        self._reindex([record])
+        for key in [key for key in self._cache if key[0] == record.key]:
+            del self._cache[key]
+        self.refresh()
+
+    def refresh_records(self) -> None:
+        """Render all records again, after their fields changed."""
+        self._cache.clear()
+        self.refresh()
+
+    def _reindex(self, records: list[R]) -> None:
+        self._position = None
+        self._generation += 1
+        if len(records) > MAX_REINDEXED:
+            self._search = None
+        if self._search is not None:
+            for record in records:
+                self._search.add(record)
+
+    async def build_search_index(
+        self, executor: BlockingExecutor | None = None
+    ) -> None:
+        """Build the search index in a thread, ahead of the first search.
+
+        The thread is taken from executor (the default executor if None).
+        """
+        run = asyncio.to_thread if executor is None else executor.run
+        while self._search is None:
+            generation = self._generation
+            index = await run(SearchIndex, list(self.records))
+            # Records may have changed meanwhile
+            if self._search is None and generation == self._generation:
+                self._search = index
+
+    def filter(self, pattern: str) -> None:
+        """Only show the records matching a query, best matches first.
+
+        When the query extends the previous one, and records did not change
+        meanwhile, only the records shown are searched again.
+
+        See ``search.py`` for the syntax of queries.
+        """
+        current = self.current
+        # A new query shows its best match first
+        new_query = pattern.strip() != "" and pattern != self.pattern
+        self.pattern = pattern
+        if pattern.strip() == "":
+            self.shown = list(self.records)
+            self._searched = None
+        else:
+            if self._search is None:
+                self._search = SearchIndex(self.records)
+            if self._position is None:
+                self._position = {
+                    record.key: i for i, record in enumerate(self.records)
+                }
+            among = None
+            if self._searched is not None:
+                previous, generation = self._searched
+                if generation == self._generation and self._search.narrows(
+                    previous, pattern
+                ):
+                    among = [record.key for record in self.shown]
+            keys = self._search.search(pattern, self._position, among)
+            self.shown = [self.index[key] for key in keys]
+            self._searched = (pattern, self._generation)
+        self._update()
+        if new_query:
+            self.cursor = 0
+        elif current in self.shown:
+            self.cursor = self.shown.index(current)  # type: ignore
+        else:
+            self.cursor = min(self.cursor, max(len(self.shown) - 1, 0))
+
+    def _update(self) -> None:
+        self._cache.clear()
+        self.virtual_size = Size(
+            self.scrollable_content_region.width,
+            len(self.shown) * self.ROW_HEIGHT,
+        )
+        self.refresh()
+
+    # -- Rendering --
+
+    def render_record(self, record: R, width: int) -> list[Text]:
+        """Return the lines of a record (but the separator line)."""
+        raise NotImplementedError
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        line = self.scroll_offset.y + y
+        index, offset = divmod(line, self.ROW_HEIGHT)
+        if index >= len(self.shown) or offset == self.ROW_HEIGHT - 1:
+            return Strip.blank(width)
+        record = self.shown[index]
+        selected = index == self.cursor
+        key = (record.key, width, selected)
+        if (strips := self._cache.get(key)) is None:
+            if len(self._cache) > MAX_CACHED_ROWS:
+                self._cache.clear()
+            strips = self._render_strips(record, width, selected)
+            self._cache[key] = strips
+        return strips[offset]
+
+    def _render_strips(
+        self, record: R, width: int, selected: bool
+    ) -> list[Strip]:
+        style = Style()
+        if selected:
+            style = self.get_component_rich_style("bookmark--cursor")
+        if record.key in self.faded:
+            style += self.get_component_rich_style("bookmark--faded")
+        gutter = Segment(
+            "▌ " if selected and self.has_focus else "  ",
+            self.get_component_rich_style("bookmark--gutter") + style,
+        )
+        strips = []
+        for text in self.render_record(record, width - 2):
+            text.truncate(width - 2, overflow="ellipsis", pad=True)
+            segments = [
+                Segment(
+                    segment.text,
+                    style + segment.style if segment.style else style,
+                )
+                for segment in text.render(self.app.console)
+            ]
+            strips.append(Strip([gutter, *segments], width))
+        return strips
+
+    def on_resize(self, event: events.Resize) -> None:
+        self._update()
+
+    def on_focus(self) -> None:
+        self._cache.clear()
+        self.refresh()
+
+    def on_blur(self) -> None:
+        self._cache.clear()
+        self.refresh()
+
+    # -- Cursor --
+
+    def validate_cursor(self, cursor: int) -> int:
+        return max(0, min(cursor, len(self.shown) - 1))
+
+    def watch_cursor(self, cursor: int) -> None:
+        self.scroll_to_region(
+            Region(0, cursor * self.ROW_HEIGHT, 1, self.ROW_HEIGHT - 1),
+            animate=False,
+            force=True,
+        )
+        self.refresh()
+
+    def move_cursor(self, by: int) -> None:
+        self.cursor += by
+
+    def action_cursor(self, by: int) -> None:
+        self.move_cursor(by)
+
+    def action_page(self, direction: int) -> None:
+        rows = max(self.scrollable_content_region.height // self.ROW_HEIGHT, 1)
+        self.move_cursor(direction * rows)
+
+    def action_first(self) -> None:
+        self.cursor = 0
+
+    def action_last(self) -> None:
+        self.cursor = len(self.shown) - 1
+
+    def on_click(self, event: events.Click) -> None:
+        index = (event.y + self.scroll_offset.y) // self.ROW_HEIGHT
+        if index < len(self.shown):
+            self.cursor = index
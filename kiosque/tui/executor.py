@@ -0,0 +1,121 @@
+"""Dedicated thread pool for the blocking work of the TUI.
+
+Article extraction (login, fetch, parse, pandoc) is blocking: it runs in
+a pool of threads of its own, rather than in the default executor of
+asyncio shared with everything else, and so do the other blocking jobs of
+the TUI (search indices, duplicate bookmarks, pruning the preview cache),
+which are then cancelled at exit too. The pool keeps track of its load
+(jobs queued and running) and of the latency of recent jobs, displayed
+at the bottom of the TUI.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Number of recent jobs in the latency statistics
+LATENCY_WINDOW = 50
+
+
+@dataclass
+class ExecutorStats:
+    queued: int
+    active: int
+    workers: int
+    # Seconds spent waiting for a thread, then running, by the last job
+    last_wait: float | None = None
+    last_run: float | None = None
+    # Median time spent running, over recent jobs
+    median_run: float | None = None
+
+    def __str__(self) -> str:
+        text = f"{self.active}/{self.workers} running, {self.queued} queued"
+        if self.last_run is not None and self.last_wait is not None:
+            text += (
+                f" · last job {self.last_run:.1f}s "
+                f"(waited {self.last_wait:.1f}s)"
+            )
+        if self.median_run is not None:
+            text += f" · median {self.median_run:.1f}s"
+        return text
+
+
+class BlockingExecutor:
+    """Thread pool running blocking functions for coroutines.
+
+    Like ``asyncio.to_thread()``, functions run with the context variables
+    of the caller (see ``core/cancel.py``).
+    """
+
+    def __init__(self, workers: int = 4) -> None:
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="kiosque"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        # Wait and run times of recent jobs
+        self._latencies: deque[tuple[float, float]] = deque(
+            maxlen=LATENCY_WINDOW
+        )
+
+    async def run(
+        self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run a blocking function in the pool, and wait for its result."""
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                done = time.perf_counter()
+                with self._lock:
+                    self._active -= 1
+                    self._latencies.append(
+                        (started - submitted, done - started)
+                    )
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Jobs still queued are dropped, running ones go to completion
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            raise
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            stats = ExecutorStats(self._queued, self._active, self.workers)
+            if self._latencies:
+                stats.last_wait, stats.last_run = self._latencies[-1]
+                stats.median_run = statistics.median(
+                    run for _, run in self._latencies
+                )
+        return stats
+
+    def shutdown(self) -> None:
+        """Drop queued jobs, without waiting for the running ones."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
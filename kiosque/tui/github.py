@@ -2,44 +2,71 @@
 
 from __future__ import annotations
 
-import re
 import webbrowser
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import Any, ClassVar
 
 import pyperclip
-from textual.app import ComposeResult
-from textual.binding import Binding
-from textual.containers import Horizontal
-from textual.widgets import Button
+from rich.text import Text
+from textual.binding import Binding, BindingType
 
 from kiosque.api.github import GitHubRepo
-
-if TYPE_CHECKING:
-    pass
-
-
-class GitHubEntry(Button):
-    """Entry for GitHub starred repositories."""
-
-    BINDINGS = [  # noqa: RUF012
-        Binding("o,enter", "enter", "Open in browser", show=False),
-        ("c", "copy", "Copy URL"),
-        ("u", "unstar", "Unstar"),
-        Binding("space", "preview", "Preview README"),
-    ]
+from kiosque.core.canonical import canonical_url
+
+from .bookmarks import BookmarkList
+
+
+class GitHubEntry:
+    """GitHub starred repository, as displayed in the list."""
+
+    __slots__ = (
+        "added",
+        "canonical_url",
+        "description",
+        "language",
+        "owner",
+        "repo_id",
+        "repo_name",
+        "stars",
+        "title",
+        "topics",
+        "updated",
+        "url",
+    )
+
+    # Fields saved in the TUI snapshot
+    SNAPSHOT_FIELDS: ClassVar[tuple[str, ...]] = (
+        "title",
+        "url",
+        "canonical_url",
+        "added",
+        "updated",
+        "description",
+        "language",
+        "stars",
+        "topics",
+        "repo_id",
+        "owner",
+        "repo_name",
+    )
 
     def __init__(self, repo: GitHubRepo):
         self.title = repo.full_name
         self.url = str(repo.html_url)
+        self.canonical_url = canonical_url(self.url)
         self.description = repo.description or ""
         self.language = repo.language or ""
         self.stars = repo.stargazers_count
         self.topics = repo.topics
         self.added = repo.starred_at or repo.created_at
         self.repo_id = repo.id
+        self.updated = repo.updated_at
         self.owner = repo.full_name.split("/")[0]
         self.repo_name = repo.full_name.split("/")[1]
-        super().__init__()
+
+    @property
+    def key(self) -> int:
+        return self.repo_id
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, GitHubEntry):
@@ -49,81 +76,114 @@ class GitHubEntry(Button):
     def __hash__(self) -> int:
         return self.repo_id
 
-    def match(self, pattern: str) -> bool:
-        if pattern == "":
-            return True
-        if next(re.finditer(pattern, self.title, re.IGNORECASE), None):
-            return True
-        if next(re.finditer(pattern, self.description, re.IGNORECASE), None):
-            return True
-        if self.language and next(
-            re.finditer(pattern, self.language, re.IGNORECASE), None
-        ):
-            return True
-        # Search in topics/tags
-        for topic in self.topics:
-            if next(re.finditer(pattern, topic, re.IGNORECASE), None):
-                return True
-        return False
-
-    def compose(self) -> ComposeResult:
-        from rich.text import Text
+    def dump(self) -> list[Any]:
+        return [getattr(self, name) for name in self.SNAPSHOT_FIELDS]
+
+    @classmethod
+    def restore(cls, values: list[Any]) -> GitHubEntry:
+        """Build an entry from the fields saved by ``dump()``."""
+        entry = cls.__new__(cls)
+        for name, value in zip(cls.SNAPSHOT_FIELDS, values):
+            setattr(entry, name, value)
+        entry.added = datetime.fromisoformat(values[3])
+        entry.updated = datetime.fromisoformat(values[4])
+        return entry
+
+    def outdated(self, repo: GitHubRepo) -> bool:
+        """Whether the repository changed since the entry was built."""
+        return repo.updated_at != self.updated
+
+    def search_fields(self) -> dict[str, str | list[str]]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "domain": "github.com",
+            "description": self.description,
+            "language": self.language,
+            "topics": self.topics,
+        }
+
+
+class GitHubList(BookmarkList[GitHubEntry]):
+    """Virtualized list of GitHub starred repositories."""
+
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("o,enter", "enter", "Open in browser", show=False),
+        ("c", "copy", "Copy URL"),
+        ("u", "unstar", "Unstar"),
+        Binding("space", "preview", "Preview README"),
+    ]
 
-        from .tui import TextDisplay
+    ROW_HEIGHT: ClassVar[int] = 5
 
+    def render_record(self, record: GitHubEntry, width: int) -> list[Text]:
         # Title line: repo name + date
-        yield Horizontal(
-            TextDisplay(self.title, id="title", overflow="ellipsis"),
-            TextDisplay(f"{self.added:%d %b %y}", id="date"),
-            id="entrytitle",
+        date = f" {record.added:%d %b %y}"
+        title = Text(
+            record.title,
+            style=self.get_component_rich_style("bookmark--title"),
+        )
+        title.truncate(width - len(date), overflow="ellipsis", pad=True)
+        title.append(
+            date, style=self.get_component_rich_style("bookmark--date")
         )
 
-        # Language and stars line with Rich Text markup for colors
-        lang_stars = f"{self.language}" if self.language else ""
-        if lang_stars and self.stars:
-            lang_stars += f" · ⭐ {self.stars}"
-        elif self.stars:
-            lang_stars = f"⭐ {self.stars}"
+        # Language and stars line
+        lang_stars = f"{record.language}" if record.language else ""
+        if lang_stars and record.stars:
+            lang_stars += f" · ⭐ {record.stars}"
+        elif record.stars:
+            lang_stars = f"⭐ {record.stars}"
 
         # Topics/tags with # prefix
         topics_str = ""
-        if self.topics:
+        if record.topics:
             topics_str = " · " + " ".join(
-                f"#{topic}" for topic in self.topics[:3]
+                f"#{topic}" for topic in record.topics[:3]
             )
 
-        # Create Rich Text with different colors for lang/stars and tags
-        combined_text = Text()
+        # Different colors for lang/stars and tags
+        info = Text()
         if lang_stars:
-            combined_text.append(lang_stars, style="#4c78ae")  # Blue
+            info.append(
+                lang_stars,
+                style=self.get_component_rich_style("bookmark--info"),
+            )
         if topics_str:
-            combined_text.append(
-                topics_str, style="italic #79806e"
-            )  # Gray italic
-
-        # Yield as single Static widget with Rich Text
-        from textual.widgets import Static
-
-        yield Static(combined_text, id="langstarstags")
+            info.append(
+                topics_str,
+                style=self.get_component_rich_style("bookmark--tags"),
+            )
 
         # Description
-        yield TextDisplay(self.description, id="excerpt")
+        description = Text(
+            record.description,
+            style=self.get_component_rich_style("bookmark--excerpt"),
+        )
+        lines = list(description.wrap(self.app.console, max(width, 1)))[:2]
+        return [title, info, *lines, *[Text()] * (2 - len(lines))]
 
     def action_copy(self) -> None:
-        pyperclip.copy(self.url)
+        if (entry := self.current) is not None:
+            pyperclip.copy(entry.url)
 
     def action_enter(self) -> None:
-        webbrowser.open(self.url)
+        if (entry := self.current) is not None:
+            webbrowser.open(entry.url)
 
     async def action_unstar(self) -> None:
-        self.notify(f"Unstar {self.title}")
-        self.add_class("fading")
-        self.app.screen.focus_next()
-        await self.app.unstar_repo(self)  # type: ignore
+        if (entry := self.current) is None:
+            return
+        self.notify(f"Unstar {entry.title}")
+        self.fade(entry)
+        await self.app.unstar_repo(entry)  # type: ignore
 
     async def action_preview(self) -> None:
+        if (entry := self.current) is None:
+            return
         self.notify("Loading README...")
         try:
-            await self.app.preview_github_readme(self)  # type: ignore
+            await self.app.preview_github_readme(entry)  # type: ignore
         except Exception as e:
             self.notify(f"Error loading README: {e}", severity="error")
+            return
@@ -0,0 +1,300 @@
+"""Previews of bookmarks, prefetched in the background.
+
+Extracting an article (login, fetch, parse, pandoc) takes seconds. While
+the user browses the list, the Markdown previews of the current bookmark
+and of the next ones are extracted ahead of time by a few workers, the
+current bookmark first. Previews are saved in an on-disk cache, by
+canonical URL, so that they open at once, also in later sessions.
+
+Extractions which are no longer wanted (the cursor moved away, the preview
+was closed) are cancelled between their stages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+
+import httpx
+
+from kiosque.core.cancel import ExtractionCancelled, cancel_event, checkpoint
+from kiosque.core.canonical import canonical_url
+from kiosque.core.config import cache_dir
+from kiosque.core.website import Website
+
+from .executor import BlockingExecutor
+
+
+def default_preview_dir() -> Path:
+    return cache_dir / "previews"
+
+
+def extract_preview(url: str) -> str:
+    """Return the Markdown preview of an article (blocking).
+
+    Raises:
+        ValueError: If the website is not supported.
+    """
+    return Website.instance(url).full_text(url)
+
+
+def permanent(error: BaseException) -> bool:
+    """Whether a failed extraction would fail again if retried.
+
+    Unsupported websites and client errors (404, 403, paywalls) are
+    permanent; network errors and timeouts are not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.is_client_error
+    return isinstance(error, ValueError)
+
+
+class PreviewCache:
+    """Markdown previews on disk, one compressed file per canonical URL."""
+
+    def __init__(
+        self, directory: Path | None = None, max_age: float = 604800
+    ) -> None:
+        self.directory = directory or default_preview_dir()
+        self.max_age = max_age
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha1(canonical_url(url).encode()).hexdigest()
+        return self.directory / f"{digest}.md.gz"
+
+    def _fresh(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime < self.max_age
+        except OSError:
+            return False
+
+    def __contains__(self, url: str) -> bool:
+        return self._fresh(self._path(url))
+
+    def get(self, url: str) -> str | None:
+        path = self._path(url)
+        if not self._fresh(path):
+            return None
+        try:
+            return gzip.decompress(path.read_bytes()).decode()
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            logging.warning(f"Ignoring corrupted preview {path}: {e}")
+            return None
+
+    def put(self, url: str, text: str) -> None:
+        """Write a preview atomically."""
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_bytes(gzip.compress(text.encode(), compresslevel=1))
+        temp.replace(path)
+
+    def prune(self) -> int:
+        """Remove the previews older than ``max_age``.
+
+        Returns:
+            The number of previews removed.
+        """
+        removed = 0
+        for path in self.directory.glob("*.md.gz"):
+            if not self._fresh(path):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class Priority(IntEnum):
+    """Priority of preview jobs, most urgent first."""
+
+    INTERACTIVE = 0  # The user is waiting for the preview
+    PREFETCH = 1  # The current bookmark
+    BACKGROUND = 2  # The bookmarks after the current one
+
+
+@dataclass(eq=False)
+class PreviewJob:
+    """Extraction of the preview of a bookmark."""
+
+    url: str
+    priority: Priority
+    # Checked by the extraction between its stages (see core/cancel.py)
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    task: asyncio.Task[str] | None = None
+
+
+class PreviewScheduler:
+    """Extract previews in the background, most urgent first.
+
+    Jobs are identified by the canonical URL of bookmarks: asking twice for
+    the same preview returns the same job, with the highest priority of
+    both. Prefetch and background jobs run on a few workers, in order of
+    priority; interactive jobs start at once.
+
+    ``prefetch()`` replaces the jobs of bookmarks around the cursor, and
+    cancels the others, which stop at the next stage of their extraction.
+    Interactive jobs are only cancelled when their preview is closed.
+    """
+
+    def __init__(
+        self,
+        cache: PreviewCache,
+        workers: int = 2,
+        extract: Callable[[str], str] = extract_preview,
+        executor: BlockingExecutor | None = None,
+    ) -> None:
+        self.cache = cache
+        self.workers = workers
+        self.extract = extract
+        # Threads running extractions (the default executor if None)
+        self.executor = executor
+        # Jobs queued or running, by canonical URL
+        self.jobs: dict[str, PreviewJob] = {}
+        self._queue: list[tuple[Priority, int, PreviewJob]] = []
+        self._order = itertools.count()
+        # Bookmarks without preview (e.g. unsupported websites), which are
+        # not prefetched again
+        self.failed: set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers, and cancel all jobs."""
+        for job in list(self.jobs.values()):
+            self._cancel(job)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, url: str, priority: Priority) -> PreviewJob:
+        """Queue the preview of a bookmark, unless it is already queued."""
+        key = canonical_url(url)
+        job = self.jobs.get(key)
+        if job is None:
+            job = self.jobs[key] = PreviewJob(url, priority)
+        elif priority < job.priority:
+            job.priority = priority
+        else:
+            return job
+        if job.task is not None:
+            pass  # Already running
+        elif priority is Priority.INTERACTIVE:
+            self._start(job)
+        else:
+            # Jobs raised to a higher priority are queued again, and their
+            # previous entry in the queue is skipped
+            heapq.heappush(self._queue, (priority, next(self._order), job))
+            self._wakeup.set()
+        return job
+
+    def prefetch(self, urls: list[str]) -> None:
+        """Prefetch the current bookmark, then the next ones.
+
+        Jobs of other bookmarks are cancelled, except interactive ones: the
+        cursor may move (e.g. after a refresh) while a preview is loading.
+        """
+        wanted = {canonical_url(url): url for url in urls}
+        for key, job in list(self.jobs.items()):
+            if key not in wanted and job.priority is not Priority.INTERACTIVE:
+                self._cancel(job)
+        for i, (key, url) in enumerate(wanted.items()):
+            if key in self.failed or url in self.cache:
+                continue
+            self.submit(
+                url, Priority.PREFETCH if i == 0 else Priority.BACKGROUND
+            )
+
+    def cancel(self, url: str) -> None:
+        """Cancel the preview of a bookmark, if queued or running."""
+        if (job := self.jobs.get(canonical_url(url))) is not None:
+            self._cancel(job)
+
+    def _cancel(self, job: PreviewJob) -> None:
+        job.cancelled.set()
+        key = canonical_url(job.url)
+        if self.jobs.get(key) is job:
+            del self.jobs[key]
+
+    async def preview(self, url: str) -> str:
+        """Return the preview of a bookmark.
+
+        Raises:
+            ValueError: If the website is not supported.
+            ExtractionCancelled: If the preview was cancelled meanwhile.
+        """
+        if (text := self.cache.get(url)) is not None:
+            return text
+        job = self.submit(url, Priority.INTERACTIVE)
+        assert job.task is not None
+        # The extraction is only cancelled with the job, not with the caller
+        return await asyncio.shield(job.task)
+
+    def _start(self, job: PreviewJob) -> None:
+        job.task = asyncio.create_task(self._run(job))
+        job.task.add_done_callback(lambda _: self._done(job))
+
+    def _done(self, job: PreviewJob) -> None:
+        key = canonical_url(job.url)
+        if self.jobs.get(key) is job:
+            del self.jobs[key]
+        assert job.task is not None
+        if job.task.cancelled():
+            return
+        error = job.task.exception()
+        if error is not None and permanent(error):
+            self.failed.add(key)
+
+    async def _run(self, job: PreviewJob) -> str:
+        run = asyncio.to_thread if self.executor is None else self.executor.run
+        return await run(self._extract, job)
+
+    def _extract(self, job: PreviewJob) -> str:
+        """Extract a preview and cache it, in a worker thread."""
+        token = cancel_event.set(job.cancelled)
+        try:
+            checkpoint("start")
+            text = self.extract(job.url)
+        finally:
+            cancel_event.reset(token)
+        self.cache.put(job.url, text)
+        return text
+
+    async def _work(self) -> None:
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            priority, _, job = heapq.heappop(self._queue)
+            if (
+                job.task is not None
+                or job.cancelled.is_set()
+                or priority != job.priority
+            ):
+                continue  # Started, cancelled, or queued again
+            if job.url in self.cache:
+                self._cancel(job)
+                continue
+            self._start(job)
+            assert job.task is not None
+            try:
+                await asyncio.shield(job.task)
+            except ExtractionCancelled:
+                logging.debug(f"Preview of {job.url} cancelled")
+            except Exception as e:
+                logging.info(f"No preview for {job.url}: {e}")
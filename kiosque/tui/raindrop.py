@@ -3,27 +3,145 @@
 from __future__ import annotations
 
 import asyncio
-import re
 import webbrowser
-from typing import TYPE_CHECKING
+from datetime import datetime
+from typing import Any, ClassVar
+from urllib.parse import urlparse
 
 import pyperclip
-from textual.app import ComposeResult
-from textual.binding import Binding
-from textual.containers import Horizontal
-from textual.widgets import Button
+from rich.text import Text
+from textual.binding import Binding, BindingType
 
 from kiosque.api.raindrop import RaindropItem
-from kiosque.core.website import Website
+from kiosque.core.cancel import ExtractionCancelled
+from kiosque.core.canonical import canonical_url
+from kiosque.core.stream import NotHTMLError
+
+from .bookmarks import BookmarkList
+
+
+def find_duplicates(entries: list[Entry]) -> dict[Entry, Entry]:
+    """Find bookmarks whose stored article is a near-duplicate of another.
+
+    Only articles in the store have a signature: each bookmark is matched
+    with the oldest bookmark of similar content.
+    """
+    from kiosque.core.dedup import LSHIndex
+    from kiosque.core.store import ArticleStore, default_store_path
+
+    if not default_store_path().exists():
+        return {}
+    with ArticleStore() as store:
+        signatures = store.signatures(entry.canonical_url for entry in entries)
+
+    index = LSHIndex()
+    by_url: dict[str, Entry] = {}
+    duplicates: dict[Entry, Entry] = {}
+    for entry in sorted(entries, key=lambda entry: entry.added):
+        sig = signatures.get(entry.canonical_url)
+        if sig is None:
+            continue
+        if similar := index.query(sig, exclude=entry.canonical_url):
+            duplicates[entry] = by_url[similar[0]]
+        else:
+            index.add(entry.canonical_url, sig)
+            by_url[entry.canonical_url] = entry
+    return duplicates
+
+
+class Entry:
+    """Raindrop.io bookmark, as displayed in the list."""
+
+    __slots__ = (
+        "_github_repo",
+        "_is_starred",
+        "added",
+        "canonical_url",
+        "duplicate_of",
+        "excerpt",
+        "item_id",
+        "tags",
+        "title",
+        "updated",
+        "url",
+    )
+
+    # Fields saved in the TUI snapshot
+    SNAPSHOT_FIELDS: ClassVar[tuple[str, ...]] = (
+        "title",
+        "url",
+        "canonical_url",
+        "added",
+        "updated",
+        "excerpt",
+        "tags",
+        "item_id",
+        "duplicate_of",
+        "_github_repo",
+    )
 
-if TYPE_CHECKING:
-    pass
+    def __init__(self, elt: RaindropItem):
+        from .tui import parse_github_url
 
+        self.title = elt.title
+        self.url = str(elt.link)
+        self.canonical_url = canonical_url(self.url)
+        self.added = elt.created
+        self.excerpt = elt.excerpt or ""
+        self.tags = elt.tags
+        self.item_id = elt.id_
+        self.updated = elt.lastUpdate
+        self.duplicate_of: str | None = None
+        self._is_starred: bool | None = None
+
+        # Check if this is a GitHub URL
+        self._github_repo = parse_github_url(self.url)
+
+    @property
+    def key(self) -> int:
+        return self.item_id
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Entry):
+            return self.item_id == other.item_id
+        return False
 
-class Entry(Button):
-    """Entry for Raindrop.io bookmarks."""
+    def __hash__(self) -> int:
+        return self.item_id
 
-    BINDINGS = [  # noqa: RUF012
+    def dump(self) -> list[Any]:
+        return [getattr(self, name) for name in self.SNAPSHOT_FIELDS]
+
+    @classmethod
+    def restore(cls, values: list[Any]) -> Entry:
+        """Build an entry from the fields saved by ``dump()``."""
+        entry = cls.__new__(cls)
+        for name, value in zip(cls.SNAPSHOT_FIELDS, values):
+            setattr(entry, name, value)
+        entry.added = datetime.fromisoformat(values[3])
+        entry.updated = datetime.fromisoformat(values[4])
+        entry._github_repo = tuple(values[9]) if values[9] else None
+        entry._is_starred = None
+        return entry
+
+    def outdated(self, elt: RaindropItem) -> bool:
+        """Whether the bookmark was edited since the entry was built."""
+        return elt.lastUpdate != self.updated
+
+    def search_fields(self) -> dict[str, str | list[str]]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "domain": urlparse(self.url).netloc.removeprefix("www."),
+            "tags": self.tags,
+            "excerpt": self.excerpt,
+        }
+
+
+class RaindropList(BookmarkList[Entry]):
+    """Virtualized list of Raindrop.io bookmarks."""
+
+    BINDINGS: ClassVar[list[BindingType]] = [
         Binding("o,enter", "enter", "Open in browser", show=False),
         ("c", "copy", "Copy URL"),
         ("d", "delete", "Delete"),
@@ -33,21 +151,43 @@ class Entry(Button):
         ("t", "edit_tags", "Edit tags"),
     ]
 
-    def __init__(self, elt: RaindropItem):
-        from .tui import parse_github_url
-
-        self.title = elt.title
-        self.url = str(elt.link)
-        self.added = elt.created
-        self.excerpt = elt.excerpt
-        self.tags = elt.tags
-        self.item_id = elt.id_
-        self._github_repo: tuple[str, str] | None = None
-        self._is_starred: bool | None = None
-        super().__init__()
+    ROW_HEIGHT: ClassVar[int] = 6
+
+    def render_record(self, record: Entry, width: int) -> list[Text]:
+        title_style = self.get_component_rich_style("bookmark--title")
+        if record.duplicate_of is not None:
+            title_style += self.get_component_rich_style("bookmark--duplicate")
+        date = f" {record.added:%d %b %y}"
+        title = Text(record.title, style=title_style)
+        if record.duplicate_of is not None:
+            title.append(f" (duplicate of: {record.duplicate_of})")
+        title.truncate(width - len(date), overflow="ellipsis", pad=True)
+        title.append(
+            date, style=self.get_component_rich_style("bookmark--date")
+        )
 
-        # Check if this is a GitHub URL
-        self._github_repo = parse_github_url(self.url)
+        excerpt = Text(
+            " ".join(record.excerpt.split()),
+            style=self.get_component_rich_style("bookmark--excerpt"),
+        )
+        lines = excerpt.wrap(self.app.console, max(width, 1))
+        excerpt_lines = list(lines)[:2] or [Text()]
+        if len(lines) > 2:
+            excerpt_lines[-1].append("…")
+            excerpt_lines[-1].truncate(width, overflow="ellipsis")
+
+        return [
+            title,
+            Text(
+                f"#{', #'.join(record.tags)}" if len(record.tags) else "",
+                style=self.get_component_rich_style("bookmark--tags"),
+            ),
+            Text(
+                record.url, style=self.get_component_rich_style("bookmark--url")
+            ),
+            *excerpt_lines,
+            *[Text()] * (2 - len(excerpt_lines)),
+        ]
 
     def check_action(
         self, action: str, parameters: tuple[object, ...]
@@ -57,82 +197,62 @@ class Entry(Button):
         This controls both whether the action can be executed and whether
         it appears in the footer.
         """
+        entry = self.current
         if action == "star_github":
             # Only enable/show for GitHub URLs when configured
             has_github = (
                 hasattr(self.app, "github_client")
                 and self.app.github_client is not None
             )
-            return self._github_repo is not None and has_github
+            return (
+                entry is not None
+                and entry._github_repo is not None
+                and has_github
+            )
         return True
 
-    def __eq__(self, other: object) -> bool:
-        if isinstance(other, Entry):
-            return self.item_id == other.item_id
-        return False
-
-    def __hash__(self) -> int:
-        return self.item_id
-
-    def match(self, pattern: str) -> bool:
-        if pattern == "":
-            return True
-        if next(re.finditer(pattern, self.title, re.IGNORECASE), None):
-            return True
-        if next(re.finditer(pattern, self.url, re.IGNORECASE), None):
-            return True
-        # Search in tags (with or without # prefix)
-        for tag in self.tags:
-            if next(re.finditer(pattern, tag, re.IGNORECASE), None):
-                return True
-        return False
-
-    def on_focus(self) -> None:
-        """Refresh bindings when entry gets focus to update footer."""
+    def watch_cursor(self, cursor: int) -> None:
+        super().watch_cursor(cursor)
+        # Refresh bindings to update the footer
         self.refresh_bindings()
-
-    def compose(self) -> ComposeResult:
-        from .tui import TextDisplay
-
-        yield Horizontal(
-            TextDisplay(self.title, id="title", overflow="ellipsis"),
-            TextDisplay(f"{self.added:%d %b %y}", id="date"),
-            id="entrytitle",
-        )
-        yield TextDisplay(
-            f"#{', #'.join(self.tags)}" if len(self.tags) else "", id="tags"
-        )
-        yield TextDisplay(self.url, id="url", overflow="ellipsis")
-        yield TextDisplay(self.excerpt, id="excerpt")
+        if hasattr(self.app, "prefetch_previews"):
+            self.app.prefetch_previews()
 
     def action_copy(self) -> None:
-        pyperclip.copy(self.url)
+        if (entry := self.current) is not None:
+            pyperclip.copy(entry.url)
 
     def action_enter(self) -> None:
-        webbrowser.open(self.url)
+        if (entry := self.current) is not None:
+            webbrowser.open(entry.url)
 
     async def action_archive(self) -> None:
-        self.notify(f"Archive entry {self.item_id}")
-        self.add_class("fading")
-        self.app.screen.focus_next()
-        await self.app.archive_raindrop(self)  # type: ignore
+        if (entry := self.current) is None:
+            return
+        self.notify(f"Archive entry {entry.item_id}")
+        self.fade(entry)
+        await self.app.archive_raindrop(entry)  # type: ignore
 
     async def action_delete(self) -> None:
-        self.notify(f"Delete entry {self.item_id}")
-        self.add_class("fading")
-        self.app.screen.focus_next()
-        await self.app.delete_raindrop(self)  # type: ignore
+        if (entry := self.current) is None:
+            return
+        self.notify(f"Delete entry {entry.item_id}")
+        self.fade(entry)
+        await self.app.delete_raindrop(entry)  # type: ignore
 
     async def action_preview(self) -> None:
         from .tui import MarkdownModalScreen
 
+        if (entry := self.current) is None:
+            return
+
         # Check if this is a GitHub repo and we have a GitHub client
         if (
-            self._github_repo
+            entry._github_repo
             and hasattr(self.app, "github_client")
             and self.app.github_client
         ):  # type: ignore
-            owner, repo = self._github_repo
+            owner, repo = entry._github_repo
             self.notify("Loading GitHub README...")
             try:
                 # Get README content from GitHub API
@@ -142,9 +262,9 @@ class Entry(Button):
                 if readme:
                     # Add frontmatter for nice display
                     frontmatter = f"""---
-title: {self.title}
+title: {entry.title}
 description: {owner}/{repo}
-url: {self.url}
+url: {entry.url}
 ---
 
 """
@@ -159,50 +279,63 @@ url: {self.url}
                 )
                 return
 
-        # Fall back to website preview
-        try:
-            instance = Website.instance(self.url)
-        except ValueError:
-            self.notify("No preview available", severity="warning")
+        # Fall back to website preview (cached, or prefetched meanwhile)
+        previews = self.app.previews  # type: ignore
+        if (content_markdown := previews.cache.get(entry.url)) is not None:
+            self.app.push_screen(MarkdownModalScreen(content_markdown))
             return
 
-        self.notify("Loading preview...")
-
+        # Closing the modal while loading cancels the extraction
+        modal = MarkdownModalScreen()
+        self.app.push_screen(modal, lambda _: previews.cancel(entry.url))
         try:
-            # Run sync full_text in thread pool to avoid blocking
-            content_markdown = await asyncio.to_thread(
-                instance.full_text, self.url
-            )
-            modal = MarkdownModalScreen(content_markdown)
-            self.app.push_screen(modal)
+            content_markdown = await previews.preview(entry.url)
+        except ExtractionCancelled:
+            return
         except Exception as e:
-            self.notify(f"Error loading preview: {e}", severity="error")
+            if modal.is_attached:
+                modal.dismiss()
+            if isinstance(e, NotHTMLError):
+                # PDF files, images, etc. are left to the browser
+                self.notify(
+                    f"Not a web page ({e.content_type}), "
+                    "press o to open it in the browser",
+                    severity="warning",
+                )
+            elif isinstance(e, ValueError):
+                self.notify("No preview available", severity="warning")
+            else:
+                self.notify(f"Error loading preview: {e}", severity="error")
+            return
+        if modal.is_attached:
+            modal.show(content_markdown)
 
     async def action_star_github(self) -> None:
         """Star a GitHub repository (only shown for GitHub URLs)."""
-        if not self._github_repo:
+        entry = self.current
+        if entry is None or not entry._github_repo:
             return
 
         if not hasattr(self.app, "github_client") or not self.app.github_client:  # type: ignore
             self.notify("GitHub not configured", severity="warning")
             return
 
-        owner, repo = self._github_repo
+        owner, repo = entry._github_repo
 
         # Show immediate feedback with real delay to allow rendering
         self.notify(f"Checking {owner}/{repo}...")
         await asyncio.sleep(0.1)  # Small real delay for UI rendering
 
         # Check if already starred
-        if self._is_starred is None:
+        if entry._is_starred is None:
             try:
-                self._is_starred = (
+                entry._is_starred = (
                     await self.app.github_client.is_starred_async(owner, repo)
                 )  # type: ignore
             except Exception:
-                self._is_starred = False
+                entry._is_starred = False
 
-        if self._is_starred:
+        if entry._is_starred:
             self.notify(
                 f"{owner}/{repo} already starred", severity="information"
             )
@@ -214,7 +347,7 @@ url: {self.url}
 
         try:
             await self.app.github_client.star_repo_async(owner, repo)  # type: ignore
-            self._is_starred = True
+            entry._is_starred = True
             self.notify(f"⭐ Starred {owner}/{repo}")
             await asyncio.sleep(0.1)  # Small real delay for UI rendering
 
@@ -228,6 +361,8 @@ url: {self.url}
 
     def action_edit_tags(self) -> None:
         """Edit tags for this bookmark."""
+        if (entry := self.current) is None:
+            return
         # Get the search bar and switch it to tag mode
         search_bar = self.app.query_one("SearchBar")  # type: ignore
-        search_bar.enter_tag_mode(self)
+        search_bar.enter_tag_mode(entry)
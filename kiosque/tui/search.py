@@ -0,0 +1,427 @@
+"""Search index of bookmarks.
+
+Fields of bookmarks (title, URL, tags, excerpt, etc.) are split into
+normalised tokens (lowercase, without diacritics) and kept in an inverted
+index. Each word of a query matches the tokens it equals, the tokens it is
+a prefix of, and (for words long enough) tokens with one or two typos,
+found through the trigrams of the vocabulary.
+
+Queries may also filter bookmarks:
+
+- ``#tag``: bookmarks with a tag (or GitHub topic) starting with ``tag``;
+- ``site:lemonde``: bookmarks whose domain contains ``lemonde``;
+- ``lang:rust``: repositories in a language starting with ``rust``.
+
+Matching bookmarks are ranked by the weight of the fields they match in,
+and by the quality of matches; ties keep the order of the list.
+
+As a query is typed, each keystroke usually extends the previous query:
+results can then only be among the previous ones, and are looked for there
+(see ``SearchIndex.narrows()``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+from operator import add
+from typing import Generic, Protocol, TypeVar
+
+# Relative importance of matches in each field
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.5,
+    "topics": 2.5,
+    "domain": 2.0,
+    "language": 2.0,
+    "url": 1.0,
+    "description": 1.0,
+    "excerpt": 1.0,
+}
+
+# Quality of matches
+EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.5
+
+# Minimum length of words for typos to be tolerated (1, then 2 typos)
+FUZZY_LENGTHS = (4, 8)
+
+# Tokens too common in URLs to mean anything
+STOP_TOKENS = frozenset({"http", "https", "www", "html", "htm", "php"})
+
+TOKEN = re.compile(r"[^\W_]+[+#]*")
+FILTER = re.compile(r"(#|site:|lang:)(\S+)", re.IGNORECASE)
+
+
+class Searchable(Protocol):
+    @property
+    def key(self) -> int: ...
+
+    def search_fields(self) -> dict[str, str | list[str]]: ...
+
+
+S = TypeVar("S", bound=Searchable)
+
+
+def normalize(text: str) -> str:
+    """Lowercase a text, without diacritics."""
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in TOKEN.findall(normalize(text))
+        if token not in STOP_TOKENS
+    ]
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f" {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def within_distance(a: str, b: str, limit: int) -> bool:
+    """Whether two words differ by at most ``limit`` typos.
+
+    Typos are insertions, deletions, substitutions and transpositions of
+    adjacent letters (optimal string alignment distance).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    before: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            )
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+
+@dataclass
+class Query:
+    words: list[str] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    sites: list[str] = field(default_factory=list)
+    languages: list[str] = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, text: str) -> Query:
+        query = cls()
+        filters = {
+            "#": query.tags,
+            "site:": query.sites,
+            "lang:": query.languages,
+        }
+        for match in FILTER.finditer(text):
+            filters[match.group(1).lower()].append(normalize(match.group(2)))
+        query.words = tokenize(FILTER.sub(" ", text))
+        return query
+
+    def __bool__(self) -> bool:
+        return bool(self.words or self.tags or self.sites or self.languages)
+
+
+class Postings:
+    """Sorted terms, with the keys of the records they appear in.
+
+    Keys are grouped by the weight of the field the term appears in, so
+    that lookups may merge sets instead of iterating over keys.
+    """
+
+    def __init__(self) -> None:
+        self.terms: dict[str, dict[float, set[int]]] = {}
+        self._sorted: list[str] = []
+        self._dirty = False
+
+    def add(self, term: str, key: int, weight: float = 1.0) -> bool:
+        """Add a term to a record; return whether the term is new."""
+        levels = self.terms.get(term)
+        new = levels is None
+        if levels is None:
+            levels = self.terms[term] = {}
+            self._dirty = True
+        levels.setdefault(weight, set()).add(key)
+        return new
+
+    def discard(self, term: str, key: int, weight: float = 1.0) -> None:
+        levels = self.terms[term]
+        levels[weight].discard(key)
+        if not levels[weight]:
+            del levels[weight]
+        if not levels:
+            del self.terms[term]
+            self._dirty = True
+
+    def prefixed(self, prefix: str) -> list[str]:
+        """Return the terms starting with a prefix."""
+        if self._dirty:
+            self._sorted = sorted(self.terms)
+            self._dirty = False
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\uffff", start)
+        return self._sorted[start:end]
+
+    def keys(self, terms: Iterable[str]) -> set[int]:
+        keys: set[int] = set()
+        for term in terms:
+            for level in self.terms.get(term, {}).values():
+                keys |= level
+        return keys
+
+
+class SearchIndex(Generic[S]):
+    """Inverted index of bookmarks, updated as bookmarks change."""
+
+    def __init__(self, records: Iterable[S] = ()) -> None:
+        self.words = Postings()
+        self.tags = Postings()
+        self.languages = Postings()
+        self.domains: dict[str, set[int]] = defaultdict(set)
+        # Trigrams of words, to look for typos
+        self.trigrams: dict[str, set[str]] = defaultdict(set)
+        # What was indexed for each record: words, tags, domain, language
+        self.indexed: dict[int, tuple[dict[str, float], set[str], str, str]]
+        self.indexed = {}
+        # Matches of the words of the last query, most of which are still
+        # in the next query while it is typed
+        self._matches: dict[str, dict[int, float]] = {}
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self.indexed)
+
+    def add(self, record: S) -> None:
+        key = record.key
+        if key in self.indexed:
+            self.remove(record)
+        fields = record.search_fields()
+        self._matches.clear()
+
+        words: dict[str, float] = {}
+        for name, value in fields.items():
+            weight = FIELD_WEIGHTS[name]
+            text = " ".join(value) if isinstance(value, list) else value
+            for word in tokenize(text):
+                if weight > words.get(word, 0):
+                    words[word] = weight
+        terms = self.words.terms
+        for word, weight in words.items():
+            if (levels := terms.get(word)) is None:
+                self.words.add(word, key, weight)
+                for trigram in trigrams(word):
+                    self.trigrams[trigram].add(word)
+            elif (level := levels.get(weight)) is None:
+                levels[weight] = {key}
+            else:
+                level.add(key)
+
+        tags = {
+            normalize(tag)
+            for tag in [*fields.get("tags", []), *fields.get("topics", [])]
+        }
+        for tag in tags:
+            self.tags.add(tag, key)
+        domain = normalize(str(fields.get("domain", "")))
+        self.domains[domain].add(key)
+        language = normalize(str(fields.get("language", "")))
+        self.languages.add(language, key)
+
+        self.indexed[key] = (words, tags, domain, language)
+
+    def remove(self, record: S) -> None:
+        if (indexed := self.indexed.pop(record.key, None)) is None:
+            return
+        key = record.key
+        self._matches.clear()
+        words, tags, domain, language = indexed
+        # Words are left in trigrams, and skipped in lookups
+        for word, weight in words.items():
+            self.words.discard(word, key, weight)
+        for tag in tags:
+            self.tags.discard(tag, key)
+        self.domains[domain].discard(key)
+        if not self.domains[domain]:
+            del self.domains[domain]
+        self.languages.discard(language, key)
+
+    def update(self, record: S) -> None:
+        """Index a record again, after its fields changed."""
+        self.add(record)
+
+    # -- Lookups --
+
+    def _similar(self, word: str) -> list[str]:
+        """Return the words with one typo (two for long words).
+
+        Known words are assumed to be spelled as intended.
+        """
+        if len(word) < FUZZY_LENGTHS[0] or word in self.words.terms:
+            return []
+        limit = 1 if len(word) < FUZZY_LENGTHS[1] else 2
+        grams = trigrams(word)
+        counts: dict[str, int] = defaultdict(int)
+        for trigram in grams:
+            for token in self.trigrams.get(trigram, ()):
+                counts[token] += 1
+        # Each typo alters at most four trigrams (transpositions)
+        least = len(grams) - 4 * limit
+        return [
+            token
+            for token, count in counts.items()
+            if count >= least
+            and token in self.words.terms
+            and within_distance(word, token, limit)
+        ]
+
+    def _match(
+        self, word: str, among: set[int] | None = None
+    ) -> dict[int, float]:
+        """Return the records matching a word, with their score.
+
+        Only records among some keys are returned, unless the word matched
+        the last query: all its matches are then known already.
+        """
+        if (scores := self._matches.get(word)) is not None:
+            return scores
+        levels: dict[float, set[int]] = defaultdict(set)
+        matches = [
+            *(
+                (token, EXACT if token == word else PREFIX)
+                for token in self.words.prefixed(word)
+            ),
+            *((token, FUZZY) for token in self._similar(word)),
+        ]
+        for token, quality in matches:
+            for weight, keys in self.words.terms[token].items():
+                levels[weight * quality] |= keys
+        # Keep the best score of each record
+        scores = {}
+        for score in sorted(levels):
+            keys = levels[score] if among is None else levels[score] & among
+            scores.update(dict.fromkeys(keys, score))
+        if among is None:
+            self._matches[word] = scores
+        return scores
+
+    def _filter(self, query: Query) -> set[int] | None:
+        """Return the records selected by the filters of a query."""
+        selections = [
+            *(self.tags.keys(self.tags.prefixed(tag)) for tag in query.tags),
+            *(
+                set().union(
+                    *(
+                        keys
+                        for domain, keys in self.domains.items()
+                        if site in domain
+                    )
+                )
+                for site in query.sites
+            ),
+            *(
+                self.languages.keys(self.languages.prefixed(language))
+                for language in query.languages
+            ),
+        ]
+        if not selections:
+            return None
+        return set.intersection(*selections)
+
+    def narrows(self, previous: str, text: str) -> bool:
+        """Whether the results of a query are among those of a previous one.
+
+        This is the case when the query extends the previous one with more
+        words or filters, or with longer words or filters, unless the last
+        word, now longer, tolerates typos that the shorter word did not.
+        An empty previous query (e.g. a lone ``#``) narrows nothing.
+        """
+        if not text.startswith(previous):
+            return False
+        before, after = Query.parse(previous), Query.parse(text)
+        if not before:
+            return False
+        for shorter, longer in [
+            (before.words, after.words),
+            (before.tags, after.tags),
+            (before.sites, after.sites),
+            (before.languages, after.languages),
+        ]:
+            if len(longer) < len(shorter):
+                return False
+            if not all(map(str.startswith, longer, shorter)):
+                return False
+        if not before.words:
+            return True
+        # Typos on the last word may match more than the shorter word did
+        last = len(before.words) - 1
+        word = after.words[last]
+        return word == before.words[last] or not self._similar(word)
+
+    def search(
+        self,
+        text: str,
+        position: dict[int, int],
+        among: Collection[int] | None = None,
+    ) -> list[int]:
+        """Return the records matching a query, best matches first.
+
+        Args:
+            text: The query, as typed by the user
+            position: The position of records in the list, by key
+            among: If set, the only keys which may match (e.g. the results
+                of a previous query, see ``narrows()``)
+
+        Returns:
+            The keys of matching records.
+        """
+        query = Query.parse(text)
+        selected = self._filter(query)
+        narrowed = None if among is None else set(among)
+        candidates = position.keys() if narrowed is None else narrowed
+        matches = sorted(
+            (self._match(word, narrowed) for word in query.words), key=len
+        )
+        self._matches = {
+            word: match
+            for word, match in self._matches.items()
+            if word in query.words
+        }
+
+        if not matches:  # Only filters, or an empty query matching all
+            keys = candidates if selected is None else candidates & selected
+            return sorted(keys, key=position.__getitem__)
+
+        # Records must match all words, and the filters
+        keys = matches[0].keys() & candidates
+        for match in matches[1:]:
+            keys &= match.keys()
+        if selected is not None:
+            keys &= selected
+        ranked = sorted(keys, key=position.__getitem__)
+        if len(matches) == 1:
+            scores = matches[0]
+        else:
+            totals = [0.0] * len(ranked)
+            for match in matches:
+                totals = list(map(add, totals, map(match.__getitem__, ranked)))
+            scores = dict(zip(ranked, totals))
+        # Sorting is stable: ties keep the order of the list
+        ranked.sort(key=scores.__getitem__, reverse=True)
+        return ranked
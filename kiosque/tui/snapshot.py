@@ -0,0 +1,78 @@
+"""Snapshot of the TUI state, for an instant start.
+
+When leaving the TUI, the bookmark lists (the fields of their records, the
+cursor and the scroll position), the active tab and the focused list are
+saved in a compressed JSON file. The next start displays them right away,
+while bookmarks are synchronised in the background.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from kiosque.core.config import cache_dir
+
+# Bump when the fields of records change
+SNAPSHOT_VERSION = 1
+
+
+def default_snapshot_path() -> Path:
+    return cache_dir / "tui.json.gz"
+
+
+def _default(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+@dataclass
+class ListState:
+    """State of a bookmark list: records (as saved by ``dump()``)."""
+
+    records: list[list[Any]]
+    cursor: int = 0
+    scroll_y: float = 0
+
+
+@dataclass
+class Snapshot:
+    lists: dict[str, ListState] = field(default_factory=dict)
+    active_tab: str | None = None
+    focused: str | None = None
+    # Count and last update of the Raindrop mirror, when saved
+    mirror: list[Any] | None = None
+    version: int = SNAPSHOT_VERSION
+
+    def save(self, path: Path | None = None) -> None:
+        """Write the snapshot atomically."""
+        path = path or default_snapshot_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        content = json.dumps(asdict(self), default=_default)
+        temp.write_bytes(gzip.compress(content.encode(), compresslevel=1))
+        temp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> Snapshot | None:
+        path = path or default_snapshot_path()
+        if not path.exists():
+            return None
+        try:
+            content = json.loads(gzip.decompress(path.read_bytes()))
+            if content.get("version") != SNAPSHOT_VERSION:
+                return None
+            lists = {
+                list_id: ListState(**state)
+                for list_id, state in content.pop("lists").items()
+            }
+            return cls(lists=lists, **content)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logging.warning(f"Ignoring corrupted snapshot {path}: {e}")
+            return None
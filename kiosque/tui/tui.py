@@ -3,13 +3,13 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 from typing import ClassVar
 
-from rich.text import Text
 from textual import events, on
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.containers import Container, VerticalScroll
+from textual.containers import Container
 from textual.logging import TextualHandler
 from textual.screen import ModalScreen
 from textual.widgets import (
@@ -23,17 +23,36 @@ from textual.widgets import (
 )
 
 from kiosque.api.github import GitHubAPI
-from kiosque.api.raindrop import RaindropAPI
+from kiosque.api.mirror import RaindropMirror
+from kiosque.api.raindrop import RaindropAPI, RaindropItem
 from kiosque.core.config import (
     validate_github_config,
     validate_raindrop_config,
     validate_tui_config,
 )
-from kiosque.tui.github import GitHubEntry
-from kiosque.tui.raindrop import Entry
+from kiosque.tui.bookmarks import BookmarkList
+from kiosque.tui.executor import BlockingExecutor
+from kiosque.tui.github import GitHubEntry, GitHubList
+from kiosque.tui.preview import PreviewCache, PreviewScheduler
+from kiosque.tui.raindrop import Entry, RaindropList, find_duplicates
+from kiosque.tui.snapshot import ListState, Snapshot
 
 logging.basicConfig(handlers=[TextualHandler()])
 
+# Minimum delay (in seconds) between updates of a list being downloaded
+PROGRESS_INTERVAL = 0.2
+
+# Interval (in seconds) between updates of the load of extraction threads
+JOBS_INTERVAL = 0.5
+
+# Delay (in seconds) after a keystroke before filtering: a multiple of the
+# measured cost of filtering, so that cheap filters run as the user types,
+# and costly ones wait for the user to pause
+FILTER_DELAY_FACTOR = 3
+MAX_FILTER_DELAY = 0.3
+# Weight of the last measure in the (exponential) average cost of filtering
+FILTER_COST_SMOOTHING = 0.3
+
 
 def parse_github_url(url: str) -> tuple[str, str] | None:
     """Parse a GitHub URL to extract owner and repo name.
@@ -61,16 +80,6 @@ def parse_github_url(url: str) -> tuple[str, str] | None:
     return None
 
 
-class TextDisplay(Static):
-    def __init__(self, text, id=None, **kwargs):
-        self.text = text
-        self.kwargs = kwargs
-        super().__init__(id=id)
-
-    def compose(self) -> ComposeResult:
-        yield Static(Text(self.text, **self.kwargs))
-
-
 class SearchBar(Input):
     BINDINGS = [  # noqa: RUF012
         Binding("c-c", "clear", show=False),
@@ -151,7 +160,6 @@ class SearchBar(Input):
 
         # Update tags via API
         entry = self.tag_entry
-        entry_to_focus = entry  # Save reference before exit
         self.exit_tag_mode()
 
         try:
@@ -167,85 +175,75 @@ class SearchBar(Input):
             # Restore original tags on error
             entry.tags = self.original_tags
 
-        # Refocus the entry
-        entry_to_focus.focus()
+        # Refocus the list
+        self.app._get_active_container().focus()  # type: ignore
 
     async def action_clear(self) -> None:
         if self.tag_mode:
             # Cancel tag editing
-            entry_to_focus = self.tag_entry
             self.exit_tag_mode()
-            # Refocus the entry
-            if entry_to_focus:
-                entry_to_focus.focus()
-            return
-
-        self.clear()
-        # Get the active tab's container
-        try:
-            tabbed = self.app.query_one(TabbedContent)
-            active_pane = tabbed.get_child_by_id(tabbed.active)
-            container = active_pane.query_one(VerticalScroll)
-            for child in container.children:
-                child.focus()
-                break
-        except Exception:
-            # Fallback for non-tabbed layout
-            container = self.app.query_one(VerticalScroll)
-            for child in container.children:
-                child.focus()
-                break
+        else:
+            self.clear()
+        # Refocus the active list
+        self.app._get_active_container().focus()  # type: ignore
 
 
 class MarkdownModalScreen(ModalScreen):
     BINDINGS: ClassVar = [Binding("space", "close", "Close preview")]
 
-    def __init__(self, markdown_text: str, **kwargs):
+    def __init__(self, markdown_text: str | None = None, **kwargs):
+        """Display a Markdown text, or a placeholder until ``show()``."""
         self.markdown_text = markdown_text
-        # Parse YAML frontmatter if present
-        self.metadata = {}
-        self.content = markdown_text
-
-        if markdown_text.startswith("---\n"):
-            parts = markdown_text.split("---\n", 2)
-            if len(parts) >= 3:
-                # Extract metadata from frontmatter
-                frontmatter = parts[1]
-                for line in frontmatter.strip().split("\n"):
-                    if ": " in line:
-                        key, value = line.split(": ", 1)
-                        self.metadata[key.strip()] = value.strip()
-                # Content is everything after the second ---
-                self.content = parts[2].strip()
-
         super().__init__(**kwargs)
 
+    @staticmethod
+    def format(markdown_text: str) -> str:
+        """Display the YAML frontmatter (if present) as a header."""
+        if not markdown_text.startswith("---\n"):
+            return markdown_text
+        parts = markdown_text.split("---\n", 2)
+        if len(parts) < 3:
+            return markdown_text
+
+        # Extract metadata from frontmatter
+        metadata = {}
+        for line in parts[1].strip().split("\n"):
+            if ": " in line:
+                key, value = line.split(": ", 1)
+                metadata[key.strip()] = value.strip()
+        # Content is everything after the second ---
+        content = parts[2].strip()
+        if not metadata:
+            return markdown_text
+
+        # Build a nice header with metadata
+        header_lines = []
+        if "title" in metadata:
+            header_lines.append(f"# {metadata['title']}\n")
+        if "author" in metadata:
+            header_lines.append(f"**By {metadata['author']}**")
+        if "date" in metadata:
+            header_lines.append(f" · {metadata['date']}")
+        if "author" in metadata or "date" in metadata:
+            header_lines.append("\n\n")
+        if "description" in metadata:
+            header_lines.append(f"*{metadata['description']}*\n\n")
+        if "url" in metadata:
+            header_lines.append("---\n\n")
+        return "".join(header_lines) + content
+
     def compose(self) -> ComposeResult:
-        # If we have metadata, display it nicely above the content
-        if self.metadata:
-            # Build a nice header with metadata
-            header_lines = []
-            if "title" in self.metadata:
-                header_lines.append(f"# {self.metadata['title']}\n")
-            if "author" in self.metadata:
-                header_lines.append(f"**By {self.metadata['author']}**")
-            if "date" in self.metadata:
-                header_lines.append(f" · {self.metadata['date']}")
-            if "author" in self.metadata or "date" in self.metadata:
-                header_lines.append("\n\n")
-            if "description" in self.metadata:
-                header_lines.append(f"*{self.metadata['description']}*\n\n")
-            if "url" in self.metadata:
-                header_lines.append("---\n\n")
-
-            formatted_content = "".join(header_lines) + self.content
-            yield MarkdownViewer(
-                formatted_content, show_table_of_contents=False
-            )
+        if self.markdown_text is None:
+            text = "*Loading preview...*"
         else:
-            yield MarkdownViewer(
-                self.markdown_text, show_table_of_contents=False
-            )
+            text = self.format(self.markdown_text)
+        yield MarkdownViewer(text, show_table_of_contents=False)
+
+    def show(self, markdown_text: str) -> None:
+        """Replace the placeholder with the Markdown text."""
+        self.markdown_text = markdown_text
+        viewer = self.query_one(MarkdownViewer)
+        viewer.document.update(self.format(markdown_text))
 
     def action_close(self):
         self.dismiss()
@@ -270,10 +268,17 @@ class Kiosque(App):
     def __init__(self):
         super().__init__()
         self.raindrop_client: RaindropAPI | None = None
+        self.mirror: RaindropMirror | None = None
         self.github_client: GitHubAPI | None = None
+        self.executor: BlockingExecutor | None = None
+        self.previews: PreviewScheduler | None = None
+        self.prefetch_ahead = 0  # Bookmarks prefetched after the current one
         self.has_raindrop = False
         self.has_github = False
         self._search_timer: asyncio.TimerHandle | None = None
+        self._filter_cost = 0.0  # in seconds, averaged over filters
+        # Sources displayed from the snapshot, and not synchronised yet
+        self.stale: set[str] = set()
 
     def on_load(self, event: events.Load) -> None:
         """Sent before going in to application mode."""
@@ -283,6 +288,7 @@ class Kiosque(App):
 
         if raindrop_config:
             self.raindrop_client = RaindropAPI()
+            self.mirror = RaindropMirror()
             self.has_raindrop = True
 
         if github_config:
@@ -306,9 +312,14 @@ class Kiosque(App):
         except Exception:
             pass
 
+    @property
+    def filter_delay(self) -> float:
+        """Debounce delay of the filter, adapted to its measured cost."""
+        return min(FILTER_DELAY_FACTOR * self._filter_cost, MAX_FILTER_DELAY)
+
     @on(Input.Changed)
     def schedule_filter(self) -> None:
-        """Schedule filter with debouncing - 300ms after last keystroke."""
+        """Schedule filter with debouncing, after the last keystroke."""
         # Don't filter if SearchBar is in tag mode
         search_bar = self.query_one(SearchBar)
         if search_bar.tag_mode:
@@ -318,43 +329,54 @@ class Kiosque(App):
         if self._search_timer is not None:
             self._search_timer.cancel()
 
-        # Schedule new filter execution after 300ms
         loop = asyncio.get_event_loop()
-        self._search_timer = loop.call_later(0.3, self.filter_items)
+        self._search_timer = loop.call_later(
+            self.filter_delay, self.filter_items
+        )
 
     def filter_items(self) -> None:
         search_key = self.query_one(Input).value
 
-        # Filter in all containers (both tabs if present)
-        containers = []
-        try:
-            # Try tabbed layout
-            if self.has_raindrop:
-                pane = self.query_one("#raindrop-tab")
-                containers.append(pane.query_one(VerticalScroll))
-            if self.has_github:
-                pane = self.query_one("#github-tab")
-                containers.append(pane.query_one(VerticalScroll))
-        except Exception:
-            # Fallback for non-tabbed layout
-            try:
-                containers.append(self.query_one(VerticalScroll))
-            except Exception:
-                return
-
-        # Apply filter to all containers
-        for container in containers:
-            for entry in container.children:
-                if isinstance(entry, (Entry, GitHubEntry)):
-                    if entry.match(search_key):
-                        entry.remove_class("hidden")
-                    else:
-                        entry.add_class("hidden")
+        # Filter in all lists (both tabs if present)
+        start = time.perf_counter()
+        for bookmarks in self.query(BookmarkList):
+            bookmarks.filter(search_key)
+        cost = time.perf_counter() - start
+        self._filter_cost += FILTER_COST_SMOOTHING * (cost - self._filter_cost)
 
     async def on_mount(self) -> None:
         # Progressive loading: render UI immediately, then load data
         # Load Raindrop first (faster), then GitHub (slower)
+        # Display the bookmarks of the previous session, then synchronise
+        tui_config = validate_tui_config()
+        self.executor = BlockingExecutor(tui_config.extraction_threads)
+
+        self.restore_snapshot()
+        self._index_tasks = [
+            asyncio.create_task(bookmarks.build_search_index(self.executor))
+            for bookmarks in self.query(BookmarkList)
+            if bookmarks.records
+        ]
+
         if self.has_raindrop:
+            # Previews of the bookmarks around the cursor, ahead of time
+            cache = PreviewCache(max_age=tui_config.preview_max_age)
+            self._prune_task = asyncio.create_task(
+                self.executor.run(cache.prune)
+            )
+            # Keep a thread for the previews asked for while prefetching
+            self.previews = PreviewScheduler(
+                cache,
+                workers=min(
+                    tui_config.preview_workers,
+                    tui_config.extraction_threads - 1,
+                ),
+                executor=self.executor,
+            )
+            self.previews.start()
+            self.prefetch_ahead = tui_config.prefetch_previews
+            self.prefetch_previews()
+
             # Load Raindrop immediately to give user quick feedback
             self._raindrop_task = asyncio.create_task(self._refresh_raindrop())
 
@@ -365,10 +387,99 @@ class Kiosque(App):
             )
 
         # Set up auto-refresh timer
-        tui_config = validate_tui_config()
         self.timer = self.set_interval(
             tui_config.refresh_interval, self.action_refresh
         )
+        self.set_interval(JOBS_INTERVAL, self.update_jobs)
+
+    def restore_snapshot(self) -> None:
+        """Display the lists saved when leaving the previous session."""
+        snapshot = Snapshot.load() or Snapshot()
+        mirror_state = list(self.mirror.state()) if self.mirror else None
+
+        if self.has_raindrop:
+            container = self.query_one(RaindropList)
+            state = snapshot.lists.get("raindrop-entries")
+            if state is not None and snapshot.mirror == mirror_state:
+                records = [Entry.restore(values) for values in state.records]
+                container.restore(records, state.cursor, state.scroll_y)
+            elif self.mirror is not None and len(self.mirror) > 0:
+                # The mirror changed since the snapshot
+                self._sync_raindrop(self.mirror.items())
+            if container.records:
+                self.stale.add("raindrop")
+
+        if self.has_github:
+            container = self.query_one(GitHubList)
+            state = snapshot.lists.get("github-entries")
+            if state is not None:
+                records = [GitHubEntry.restore(v) for v in state.records]
+                container.restore(records, state.cursor, state.scroll_y)
+                self.stale.add("github")
+
+        if snapshot.active_tab is not None:
+            self.action_switch_tab(snapshot.active_tab)
+        if snapshot.focused is not None:
+            for bookmarks in self.query(BookmarkList):
+                if bookmarks.id == snapshot.focused:
+                    bookmarks.focus()
+        self.update_counts()
+
+    def save_snapshot(self) -> None:
+        """Save the lists, to display them when starting next time."""
+        snapshot = Snapshot(
+            mirror=list(self.mirror.state()) if self.mirror else None
+        )
+        for bookmarks in self.query(BookmarkList):
+            snapshot.lists[str(bookmarks.id)] = ListState(
+                records=[record.dump() for record in bookmarks.records],
+                cursor=bookmarks.cursor,
+                scroll_y=bookmarks.scroll_offset.y,
+            )
+        try:
+            snapshot.active_tab = self.query_one(TabbedContent).active
+        except Exception:
+            pass  # Non-tabbed layout
+        if isinstance(self.focused, BookmarkList):
+            snapshot.focused = self.focused.id
+        snapshot.save()
+
+    def mark_fresh(self, source: str) -> None:
+        """Notice a source was synchronised with the network."""
+        self.stale.discard(source)
+        self.update_counts()
+
+    async def action_quit(self) -> None:
+        try:
+            self.save_snapshot()
+        except Exception as exc:
+            logging.warning(f"Could not save the TUI snapshot: {exc}")
+        await super().action_quit()
+
+    async def on_unmount(self) -> None:
+        if self.mirror is not None:
+            self.mirror.close()
+        if self.previews is not None:
+            await self.previews.stop()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def prefetch_previews(self) -> None:
+        """Prefetch the previews of the current bookmark and the next ones."""
+        if self.previews is None or self.prefetch_ahead == 0:
+            return
+        container = self.query_one(RaindropList)
+        start = container.cursor
+        self.previews.prefetch(
+            [
+                entry.url
+                for entry in container.shown[
+                    start : start + self.prefetch_ahead + 1
+                ]
+                # GitHub repositories are previewed with their README
+                if entry._github_repo is None or self.github_client is None
+            ]
+        )
 
     async def _delayed_github_refresh(self) -> None:
         """Load GitHub stars with a small delay to prioritize Raindrop."""
@@ -383,7 +494,9 @@ class Kiosque(App):
             f"https://api.raindrop.io/rest/v1/raindrop/{entry.item_id}"
         )
         c.raise_for_status
-        entry.remove()
+        if self.mirror is not None:
+            self.mirror.delete([entry.item_id])
+        self.query_one(RaindropList).remove(entry)
         self.update_counts()
 
     async def archive_raindrop(self, entry: Entry) -> None:
@@ -391,7 +504,9 @@ class Kiosque(App):
         if not self.raindrop_client:
             return
         await self.raindrop_client.async_action("archive", entry.item_id)
-        entry.remove()
+        if self.mirror is not None:
+            self.mirror.delete([entry.item_id])
+        self.query_one(RaindropList).remove(entry)
         self.update_counts()
 
     async def update_raindrop_tags(self, entry: Entry, tags: list[str]) -> None:
@@ -401,15 +516,15 @@ class Kiosque(App):
         await self.raindrop_client.update_tags_async(entry.item_id, tags)
         # Update the entry's tags locally
         entry.tags = tags
-        # Re-render the entry to show updated tags
-        await entry.recompose()
+        # Render the entry again to show updated tags
+        self.query_one(RaindropList).refresh_record(entry)
 
     async def unstar_repo(self, entry: GitHubEntry) -> None:
         """Unstar a GitHub repository."""
         if not self.github_client:
             return
         await self.github_client.unstar_repo_async(entry.owner, entry.repo_name)
-        entry.remove()
+        self.query_one(GitHubList).remove(entry)
         self.update_counts()
 
     async def preview_github_readme(self, entry: GitHubEntry) -> None:
@@ -439,26 +554,10 @@ url: {entry.url}
         raindrop_count = 0
         github_count = 0
 
-        try:
-            if self.has_raindrop:
-                try:
-                    raindrop_pane = self.query_one("#raindrop-tab")
-                    raindrop_container = raindrop_pane.query_one(VerticalScroll)
-                    raindrop_count = len(raindrop_container.children)
-                except Exception:
-                    container = self.query_one("#raindrop-entries")
-                    raindrop_count = len(container.children)
-
-            if self.has_github:
-                try:
-                    github_pane = self.query_one("#github-tab")
-                    github_container = github_pane.query_one(VerticalScroll)
-                    github_count = len(github_container.children)
-                except Exception:
-                    container = self.query_one("#github-entries")
-                    github_count = len(container.children)
-        except Exception:
-            pass
+        if self.has_raindrop:
+            raindrop_count = len(self.query_one(RaindropList).records)
+        if self.has_github:
+            github_count = len(self.query_one(GitHubList).records)
 
         # Update window title with counts
         total = raindrop_count + github_count
@@ -468,6 +567,17 @@ url: {entry.url}
         if github_count > 0:
             title_parts.append(f"GitHub ({github_count})")
         self.title = " · ".join(title_parts)
+        # Lists displayed from the snapshot may be out of date
+        self.sub_title = "stale, synchronising…" if self.stale else ""
+
+    def update_jobs(self) -> None:
+        """Display the load of the blocking threads, while they work."""
+        if self.executor is None:
+            return
+        stats = self.executor.stats()
+        jobs = self.query_one("#jobs", Static)
+        jobs.display = stats.active + stats.queued > 0
+        jobs.update(f"Background jobs: {stats}")
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -478,52 +588,49 @@ url: {entry.url}
             if self.has_raindrop and self.has_github:
                 with TabbedContent():
                     with TabPane("Raindrop", id="raindrop-tab"):
-                        yield VerticalScroll(id="raindrop-entries")
+                        yield RaindropList(id="raindrop-entries")
                     with TabPane("GitHub", id="github-tab"):
-                        yield VerticalScroll(id="github-entries")
+                        yield GitHubList(id="github-entries")
             elif self.has_raindrop:
-                yield VerticalScroll(id="raindrop-entries")
+                yield RaindropList(id="raindrop-entries")
             elif self.has_github:
-                yield VerticalScroll(id="github-entries")
+                yield GitHubList(id="github-entries")
 
         # Bottom bar with search and footer
         with Container(id="bottom-bar"):
+            yield Static(id="jobs")
             yield SearchBar(placeholder="Search...")
             yield Footer()
 
-    def _get_active_container(self) -> VerticalScroll:
-        """Get the currently active container."""
+    def _get_active_container(self) -> BookmarkList:
+        """Get the currently active list."""
         try:
             tabbed = self.query_one(TabbedContent)
             active_pane = tabbed.get_child_by_id(tabbed.active)
-            return active_pane.query_one(VerticalScroll)
+            return active_pane.query_one(BookmarkList)
         except Exception:
             # Fallback for non-tabbed layout
-            return self.query_one(VerticalScroll)
+            return self.query_one(BookmarkList)
 
     def action_up(self, by=1) -> None:
         container = self._get_active_container()
-        for i, entry in enumerate(container.children):
-            if entry.has_focus:
-                break
-        container.children[max(i - by, 0)].focus()
+        container.move_cursor(-by)
+        container.focus()
 
     def action_down(self, by=1) -> None:
         container = self._get_active_container()
-        for i, entry in enumerate(container.children):
-            if entry.has_focus:
-                break
-        container.children[min(i + by, len(container.children) - 1)].focus()
+        container.move_cursor(by)
+        container.focus()
 
     def action_top(self) -> None:
         container = self._get_active_container()
-        if len(container.children) > 0:
-            container.children[0].focus()
+        container.action_first()
+        container.focus()
 
     def action_bottom(self) -> None:
         container = self._get_active_container()
-        if len(container.children) > 0:
-            container.children[-1].focus()
+        container.action_last()
+        container.focus()
 
     async def action_refresh(self, from_scratch=True) -> None:
         """Refresh all configured bookmark sources."""
@@ -533,52 +640,106 @@ url: {entry.url}
         if self.has_github:
             await self._refresh_github()
 
+    def _sync_raindrop(
+        self, items: list[RaindropItem], partial: bool = False
+    ) -> tuple[int, int, int]:
+        container = self.query_one(RaindropList)
+        # Only build entries for new or edited bookmarks
+        changes = container.sync(
+            items,
+            key=lambda item: item.id_,
+            build=Entry,
+            outdated=Entry.outdated,
+            partial=partial,
+        )
+        if self.focused is None:
+            container.focus()
+        return changes
+
     async def _refresh_raindrop(self) -> None:
-        """Refresh Raindrop bookmarks."""
+        """Refresh Raindrop bookmarks.
+
+        Only the bookmarks updated since the last refresh are downloaded
+        into the mirror, unless the library must be reconciled.
+        """
         if not self.raindrop_client:
             return
 
-        try:
-            pane = self.query_one("#raindrop-tab")
-            container = pane.query_one(VerticalScroll)
-        except Exception:
-            container = self.query_one("#raindrop-entries")
+        container = self.query_one(RaindropList)
+        reconcile_interval = validate_tui_config().reconcile_interval
 
         try:
-            items = await self.raindrop_client.get_items_async()
+            updates = None
+            if self.mirror is not None and not self.mirror.reconcile_due(
+                reconcile_interval
+            ):
+                updates = await self.mirror.update(self.raindrop_client)
+            if updates is None:
+                items = await self._download_raindrop()
+                if self.mirror is not None:
+                    self.mirror.replace(items)
+            elif updates and self.mirror is not None:
+                items = self.mirror.items()
+            else:
+                items = None  # Nothing changed
         except Exception as exc:
             self.notify(
                 f"Raindrop error: {exc}".replace("[", "").replace("]", "")
             )
             return
 
-        new_entries = []
-        for item in items:
-            entry = Entry(item)
-            if entry not in container.children:
-                new_entries.append(entry)
-
-        # Mount new entries at the beginning (most recent first)
-        if new_entries and len(container.children) > 0:
-            for entry in reversed(new_entries):
-                await container.mount(entry, before=container.children[0])
-        elif new_entries:
-            for entry in new_entries:
-                await container.mount(entry)
+        if items is not None:
+            added, updated, removed = self._sync_raindrop(items)
+            logging.info(
+                f"Raindrop: {added} added, {updated} updated, {removed} removed"
+            )
 
         # Update counts after loading
-        self.update_counts()
+        self.mark_fresh("raindrop")
+        await container.build_search_index(self.executor)
+        await self.flag_duplicates(container)
+
+    async def _download_raindrop(self) -> list[RaindropItem]:
+        """Download all Raindrop bookmarks, displaying them as pages land."""
+        assert self.raindrop_client is not None
+
+        def ordered() -> list[RaindropItem]:
+            # Pages come in any order: keep the most recent first
+            return [item for page in sorted(pages) for item in pages[page]]
+
+        # Display bookmarks as pages land, at most every PROGRESS_INTERVAL
+        pages: dict[int, list[RaindropItem]] = {}
+        last_sync = 0.0
+        async for page, items in self.raindrop_client.iter_items_async():
+            pages[page] = items
+            if time.monotonic() - last_sync > PROGRESS_INTERVAL:
+                self._sync_raindrop(ordered(), partial=True)
+                self.update_counts()
+                last_sync = time.monotonic()
+        return ordered()
+
+    async def flag_duplicates(self, container: RaindropList) -> None:
+        """Flag bookmarks with the same content as an older bookmark."""
+        assert self.executor is not None
+        entries = list(container.records)
+        try:
+            duplicates = await self.executor.run(find_duplicates, entries)
+        except Exception as exc:
+            logging.warning(f"Duplicate detection failed: {exc}")
+            return
+        for entry in entries:
+            original = duplicates.get(entry)
+            entry.duplicate_of = original.title if original else None
+        container.refresh_records()
+        if duplicates:
+            self.notify(f"{len(duplicates)} duplicate bookmark(s)")
 
     async def _refresh_github(self) -> None:
         """Refresh GitHub starred repositories."""
         if not self.github_client:
             return
 
-        try:
-            pane = self.query_one("#github-tab")
-            container = pane.query_one(VerticalScroll)
-        except Exception:
-            container = self.query_one("#github-entries")
+        container = self.query_one(GitHubList)
 
         try:
             repos = await self.github_client.get_all_starred_repos_async()
@@ -591,26 +752,23 @@ url: {entry.url}
         # Sort by starred date (most recent first)
         repos.sort(key=lambda r: r.starred_at or r.created_at, reverse=True)
 
-        new_entries = []
-        for repo in repos:
-            entry = GitHubEntry(repo)
-            if entry not in container.children:
-                new_entries.append(entry)
-
-        # Mount new entries
-        if new_entries and len(container.children) > 0:
-            for entry in reversed(new_entries):
-                await container.mount(entry, before=container.children[0])
-        elif new_entries:
-            for entry in new_entries:
-                await container.mount(entry)
-
-        if len(container.children) > 0 and not self.has_raindrop:
+        added, updated, removed = container.sync(
+            repos,
+            key=lambda repo: repo.id,
+            build=GitHubEntry,
+            outdated=GitHubEntry.outdated,
+        )
+        logging.info(
+            f"GitHub: {added} added, {updated} updated, {removed} removed"
+        )
+
+        if len(container.records) > 0 and not self.has_raindrop:
             # Only focus if there's no Raindrop tab (to avoid stealing focus)
-            container.children[0].focus()
+            container.focus()
 
         # Update counts after loading
-        self.update_counts()
+        self.mark_fresh("github")
+        await container.build_search_index(self.executor)
 
 
 def main() -> None:
@@ -6,5 +6,6 @@ from ..core.website import Website  # ty:ignore[unresolved-import]
 class ZeroOneNet(Website):
     base_url = "https://www.01net.com/"
     article_node = "div", {"itemprop": "articleBody"}
+    stop_after_article: ClassVar = True
     clean_nodes: ClassVar = ["figure"]
     clean_attributes: ClassVar = ["h3"]
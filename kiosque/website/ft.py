@@ -6,4 +6,5 @@ from ..core.website import Website
 class FinancialTimes(Website):
     base_url = "https://www.ft.com/"
     article_node = "div", {"class": "article__content-body"}
+    stop_after_article: ClassVar = True
     clean_nodes: ClassVar = ["figure", "div", "aside"]
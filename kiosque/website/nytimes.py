@@ -15,8 +15,8 @@ The cookie typically lasts for several months.
 """
 
 import logging
+import re
 from datetime import datetime, timezone
-from functools import lru_cache
 from typing import ClassVar
 
 from bs4 import BeautifulSoup
@@ -32,6 +32,9 @@ class NewYorkTimes(Website):
 
     article_node = ("section", {"name": "articleBody"})
 
+    # Gift links
+    query_params: ClassVar = ["unlocked_article_code"]
+
     def login(self):
         """Authenticate with NYT using cookie-based authentication.
 
@@ -134,20 +137,22 @@ class NewYorkTimes(Website):
 
         return new_article
 
-    @lru_cache()
     def latest_issue_url(self) -> str:
-        """Get URL for today's front page PDF.
+        """Get URL for today's front page PDF."""
+        return self.issue_url(datetime.now(timezone.utc))
+
+    def issue_url(self, date: datetime) -> str:
+        """Get URL for the front page PDF of a given day.
 
         NYT publishes daily front page PDFs at a predictable URL pattern:
         https://static01.nyt.com/images/YYYY/MM/DD/nytfrontpage/scan.pdf
 
         Returns:
-            URL string for today's front page PDF
+            URL string for the front page PDF
         """
-        today = datetime.now(timezone.utc)
-        year = today.strftime("%Y")
-        month = today.strftime("%m")
-        day = today.strftime("%d")
+        year = date.strftime("%Y")
+        month = date.strftime("%m")
+        day = date.strftime("%d")
 
         url = f"https://static01.nyt.com/images/{year}/{month}/{day}/nytfrontpage/scan.pdf"
         logging.info(f"NYT front page PDF URL: {url}")
@@ -157,11 +162,14 @@ class NewYorkTimes(Website):
         """Generate filename for the downloaded PDF.
 
         Args:
-            c: httpx.Response object (unused, kept for compatibility)
+            c: httpx.Response object, the date is read from its URL
 
         Returns:
             Filename string with date
         """
-        today = datetime.now(timezone.utc)
-        date_str = today.strftime("%Y-%m-%d")
+        match = re.search(r"/images/(\d{4})/(\d{2})/(\d{2})/", str(c.url))
+        if match is not None:
+            date_str = "-".join(match.groups())
+        else:
+            date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         return f"nyt-frontpage-{date_str}.pdf"
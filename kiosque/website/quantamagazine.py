@@ -1,5 +1,6 @@
 from typing import ClassVar
 
+from ..core.alternate import wp_json_page, wp_json_url
 from ..core.website import Website
 
 
@@ -9,12 +10,24 @@ class QuantaMagazine(Website):
     article_node = "div", {"class": "post__content__section"}
     clean_nodes: ClassVar = ["div"]
 
+    def alternate_url(self, url):
+        return wp_json_url(url)
+
+    def alternate_page(self, c):
+        # Same structure as the full page
+        return wp_json_page(
+            c, '<div class="post__content__section"><div>{}</div></div>'
+        )
+
     def article(self, url):
         article = super().article(url)
         return article.find("div")
 
     def author(self, url):
         e = self.bs4(url)
-        author_node = e.find("div", {"class": "sidebar__author"}).find("h3")
+        sidebar = e.find("div", {"class": "sidebar__author"})
+        if sidebar is None:  # Alternate page
+            return super().author(url)
+        author_node = sidebar.find("h3")
         if author_node is not None:
             return author_node.text
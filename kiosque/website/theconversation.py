@@ -7,6 +7,7 @@ class TheConversation(Website):
     base_url = "https://theconversation.com/"
 
     article_node = "div", {"itemprop": "articleBody"}
+    stop_after_article: ClassVar = True
     clean_nodes: ClassVar = ["figure"]
 
     def author(self, url):
@@ -0,0 +1,97 @@
+"""Tests for the alternate representations of articles."""
+
+import httpx
+import pytest
+
+from kiosque.core import alternate as alternate_module
+from kiosque.core import stream as stream_module
+from kiosque.core import website as website_module
+from kiosque.core.alternate import (
+    AlternateStats,
+    amp_url,
+    print_url,
+    wp_json_url,
+)
+from kiosque.website.quantamagazine import QuantaMagazine
+
+URL = "https://www.quantamagazine.org/a-new-proof-20240301/#comments"
+
+POST = {
+    "title": {"rendered": "A New Proof &#8211; Explained"},
+    "excerpt": {"rendered": "<p>Mathematicians did it.</p>"},
+    "date_gmt": "2024-03-01T12:00:00",
+    "link": "https://www.quantamagazine.org/a-new-proof-20240301/",
+    "content": {"rendered": "<p>First paragraph.</p><div>Figure</div>"},
+    "_embedded": {"author": [{"name": "Jane Doe"}]},
+}
+
+FULL_PAGE = b"""<html><head><meta property="og:title" content="Full"></head>
+<body><div class="post__content__section"><div><p>Full text.</p></div></div>
+<div class="sidebar__author"><h3>John Doe</h3></div></body></html>"""
+
+
+def test_alternate_urls():
+    """Test the common alternate URLs."""
+    url = "https://example.com/2024/article-slug/#top"
+    assert amp_url(url) == "https://example.com/2024/article-slug/amp/"
+    assert (
+        print_url(url) == "https://example.com/2024/article-slug/?output=print"
+    )
+    assert wp_json_url(url) == (
+        "https://example.com/wp-json/wp/v2/posts"
+        "?slug=article-slug&_embed=author"
+    )
+
+
+@pytest.fixture
+def requests(monkeypatch) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+    posts = [[], [POST]]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.startswith("/wp-json/"):
+            return httpx.Response(200, json=posts.pop())
+        headers = {"Content-Type": "text/html"}
+        return httpx.Response(200, headers=headers, content=FULL_PAGE)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+    return requests
+
+
+@pytest.fixture
+def stats(monkeypatch) -> AlternateStats:
+    stats = AlternateStats()
+    monkeypatch.setattr(website_module, "alternate_stats", stats)
+    return stats
+
+
+def test_alternate_page(requests, stats):
+    """Test the article is read from the REST API, then from the full page."""
+    website = QuantaMagazine()
+    assert website.title(URL) == "A New Proof \u2013 Explained"
+    assert website.author(URL) == "Jane Doe"
+    assert website.date(URL) == "2024-03-01"
+    assert website.article(URL).get_text() == "First paragraph.Figure"
+    assert len(requests) == 1
+
+    # No post for this slug: fall back to the full page
+    other = URL.replace("new", "old")
+    assert website.author(other) == "John Doe"
+    assert len(requests) == 3
+    assert stats.sites[QuantaMagazine.base_url]["fallbacks"] == 1
+    assert stats.saved(QuantaMagazine.base_url) is not None
+
+
+def test_alternate_stats():
+    """Test alternate pages are disabled after consecutive fallbacks."""
+    stats = AlternateStats()
+    site = "https://example.com/"
+    stats.record(site, "full", 10_000)
+    stats.record(site, "alternate", 1_000)
+    assert stats.saved(site) == 9_000
+    for _ in range(alternate_module.MAX_FALLBACKS):
+        assert stats.enabled(site)
+        stats.fallback(site)
+    assert not stats.enabled(site)
@@ -0,0 +1,142 @@
+"""Tests for the WARC archive of fetched pages."""
+
+import httpx
+import pytest
+import stamina
+
+from kiosque.core import archive as archive_module
+from kiosque.core import batch as batch_module
+from kiosque.core import canonical as canonical_module
+from kiosque.core import client as client_module
+from kiosque.core import stream as stream_module
+from kiosque.core.archive import (
+    ReplayTransport,
+    WarcArchive,
+    archived_articles,
+    load_records,
+    read_archive,
+)
+from kiosque.core.batch import BatchResult
+from kiosque.core.canonical import CanonicalIndex, normalize_url
+from kiosque.website.theconversation import TheConversation
+
+URL = "https://theconversation.com/some-article-123456"
+PAGE = b"""<html><head><meta property="og:title" content="Some article">
+</head><body><div itemprop="articleBody"><p>Text.</p></div>
+<footer>...</footer></body></html>"""
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch) -> WarcArchive:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/old-url":
+            return httpx.Response(301, headers={"Location": URL})
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        return httpx.Response(200, headers=headers, content=PAGE)
+
+    client = httpx.Client(
+        transport=httpx.MockTransport(handler), follow_redirects=True
+    )
+    archive = WarcArchive(tmp_path)
+    monkeypatch.setattr(stream_module, "client", client)
+    monkeypatch.setattr(archive_module, "archive", archive)
+    return archive
+
+
+def test_archive_records(archive):
+    """Test fetched pages are archived and tagged with their article."""
+    assert TheConversation().title(URL) == "Some article"
+    stream_module.fetch_until("https://theconversation.com/old-url")
+
+    (path,) = archive.directory.glob("*.warc.gz")
+    records = list(read_archive(path))
+    assert [record.url for record in records] == [
+        URL,
+        "https://theconversation.com/old-url",
+    ]
+    assert records[0].article == URL
+    assert records[0].truncated  # stopped after the article node
+    assert records[1].article is None
+    assert records[1].status_code == 200  # final response, after redirect
+
+    assert list(archived_articles(archive.directory)) == [URL]
+
+
+def test_archive_original_url(archive):
+    """Test pages are fetched at their own URL, and tagged with the key."""
+    mobile = "https://m.theconversation.com/some-article-123456?utm_source=x"
+    website = TheConversation()
+    assert website.title(mobile) == "Some article"
+    assert website.title(mobile.replace("x", "y")) == "Some article"
+
+    (path,) = archive.directory.glob("*.warc.gz")
+    (record,) = read_archive(path)  # fetched once
+    assert record.url == mobile
+    assert record.article == normalize_url(mobile)
+
+
+def test_replay(archive, monkeypatch):
+    """Test archived pages are replayed without network access."""
+    TheConversation().bs4(URL)
+    stream_module.fetch_until("https://theconversation.com/old-url")
+    TheConversation().bs4(URL)
+    locations = archived_articles(archive.directory)[URL]
+    assert [location.url for location in locations] == [URL]
+    assert locations[0].offset > 0  # the latest record of the URL
+    records = load_records(locations)
+    assert [record.url for record in records] == [URL]
+
+    client = httpx.Client(transport=ReplayTransport(records))
+    monkeypatch.setattr(stream_module, "client", client)
+    monkeypatch.setattr(archive_module, "archive", None)
+
+    article = TheConversation().article(URL)
+    assert article.get_text(strip=True) == "Text."
+    with pytest.raises(httpx.ConnectError, match="not archived"):
+        client.get("https://theconversation.com/other-article")
+
+
+def test_select_archived(archive, monkeypatch):
+    """Test articles are selected by their URL, or their canonical URL."""
+    index = CanonicalIndex(None)
+    monkeypatch.setattr(canonical_module, "canonical_index", index)
+    monkeypatch.setattr(batch_module, "canonical_index", index)
+    mobile = "https://m.theconversation.com/some-article-123456"
+    TheConversation().bs4(mobile)
+    articles = archived_articles(archive.directory)
+    index.learn(normalize_url(mobile), URL + "-canonical")
+
+    # The key of the archive, not the canonical URL learned since
+    for url in [mobile, URL + "-canonical"]:
+        selected = batch_module._select_archived(articles, [url], BatchResult())
+        assert list(selected) == [normalize_url(mobile)]
+
+    result = BatchResult()
+    assert batch_module._select_archived(articles, [URL], result) == {}
+    assert result.failed == {URL: "not archived"}
+
+
+def test_replay_shared_client(archive, monkeypatch):
+    """Test website modules using the shared client do not reach the network.
+
+    The transport of the shared client is replaced in worker processes.
+    """
+    mobile = "https://m.theconversation.com/some-article-123456"
+    TheConversation().bs4(mobile)
+    (locations,) = archived_articles(archive.directory).values()
+
+    shared = client_module.client
+    monkeypatch.setattr(shared, "_transport", shared._transport)
+    monkeypatch.setattr(shared, "_mounts", shared._mounts)
+    monkeypatch.setattr(stream_module, "client", shared)
+    monkeypatch.setattr(archive_module, "archive", archive)
+    monkeypatch.setattr(canonical_module.canonical_index, "state_file", None)
+    active = stamina.is_active()
+    batch_module._init_replay()
+    stamina.set_active(active)
+
+    batch_module.replay.load(load_records(locations))
+    article = TheConversation().article(mobile)
+    assert article.get_text(strip=True) == "Text."
+    with pytest.raises(httpx.ConnectError, match="not archived"):
+        shared.get("https://www.washingtonpost.com/")
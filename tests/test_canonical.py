@@ -0,0 +1,78 @@
+"""Tests for the normalization of URLs."""
+
+import pytest
+
+from kiosque.core.canonical import CanonicalIndex, normalize_url
+from kiosque.core.website import Website
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        (
+            "http://www.lemonde.fr/article.html?utm_source=rss&xtor=RSS-3208",
+            "https://www.lemonde.fr/article.html",
+        ),
+        (
+            "https://www.lemonde.fr/article.html?at_medium=cpc#comments",
+            "https://www.lemonde.fr/article.html",
+        ),
+        (
+            "https://m.example.com/news/article/amp/?b=2&a=1",
+            "https://www.example.com/news/article/?a=1&b=2",
+        ),
+        (
+            "https://example.com/amp/news/article.amp.html",
+            "https://example.com/news/article.html",
+        ),
+        (
+            "https://en.m.wikipedia.org/wiki/Kiosk",
+            "https://en.wikipedia.org/wiki/Kiosk",
+        ),
+        ("HTTPS://Example.COM:443", "https://example.com/"),
+        ("nyt", "nyt"),
+    ],
+)
+def test_normalize_url(url, expected):
+    """Test the noise is removed from URLs."""
+    assert normalize_url(url) == expected
+
+
+def test_query_allowlist():
+    """Test per-site allowlists of query parameters."""
+    url = "https://www.nytimes.com/a.html?unlocked_article_code=x&smid=url"
+    assert Website.website_class(url).canonical(url) == (
+        "https://www.nytimes.com/a.html?unlocked_article_code=x"
+    )
+    assert normalize_url(url, []) == "https://www.nytimes.com/a.html"
+
+
+def test_canonical_index(tmp_path):
+    """Test canonical URLs are learned and remembered."""
+    index = CanonicalIndex(tmp_path / "canonical.json")
+
+    url = normalize_url("https://www.example.com/article?id=12&utm_medium=x")
+    index.learn(url, "https://www.example.com/2024/some-article#top")
+    index.learn(url, "https://www.other.com/2024/some-article")
+    assert index.get(url) == "https://www.example.com/2024/some-article"
+    assert CanonicalIndex(tmp_path / "canonical.json").canonical == {
+        url: "https://www.example.com/2024/some-article"
+    }
+
+
+def test_canonical_index_implausible(tmp_path):
+    """Test home pages and much shorter paths are not taken as canonical."""
+    index = CanonicalIndex(tmp_path / "canonical.json")
+    url = normalize_url("https://www.example.com/2024/03/some-long-article")
+
+    index.learn(url, "https://www.example.com/")
+    index.learn(url, "https://www.example.com/consent")
+    assert index.get(url) == url
+
+    # A fresh fetch replaces the canonical URL learned before
+    index.learn(url, "https://www.example.com/2024/some-long-article")
+    index.learn(url, "https://www.example.com/2024/some-article")
+    assert index.get(url) == "https://www.example.com/2024/some-article"
+    index.learn(url, "https://www.example.com/")
+    assert index.get(url) == url
+    assert CanonicalIndex(tmp_path / "canonical.json").canonical == {}
@@ -0,0 +1,21 @@
+"""Tests for the shared HTTP clients."""
+
+from kiosque.core.client import ConnectionStats
+
+
+def test_connection_stats():
+    """Test connection reuse statistics from httpcore trace events."""
+    stats = ConnectionStats()
+    stats.trace("connection.connect_tcp.complete", {})
+    stats.trace("connection.start_tls.complete", {})
+    for _ in range(3):
+        stats.trace("http11.send_request_headers.started", {})
+    stats.trace("http2.send_request_headers.started", {})
+
+    assert stats.as_dict() == {
+        "requests": 4,
+        "connections": 1,
+        "reused": 3,
+        "tls_handshakes": 1,
+        "http2_requests": 1,
+    }
@@ -0,0 +1,94 @@
+"""Tests for the Zstandard compression with per-site dictionaries."""
+
+import httpx
+import pytest
+
+from kiosque.core import compress as compress_module
+from kiosque.core.archive import (
+    WarcArchive,
+    archived_articles,
+    current_article,
+    load_records,
+    read_archive,
+)
+from kiosque.core.compress import DictionaryStore, read_export, write_export
+
+zstandard = pytest.importorskip("zstandard")
+
+URL = "https://www.lemonde.fr/politique/article/2024/03/01/titre_123.html"
+
+
+def make_page(i: int) -> bytes:
+    words = " ".join(f"mot{(i * 7 + j) % 50}" for j in range(100))
+    return (
+        '<html><head><meta property="og:site_name" content="Le Monde">'
+        f"<title>Article {i}</title></head><body><nav>Politique Économie "
+        "International Culture</nav><article class='article__content'>"
+        f"<p>{words}</p></article><footer>Le Monde - Tous droits réservés"
+        "</footer></body></html>"
+    ).encode()
+
+
+@pytest.fixture
+def dictionaries(tmp_path, monkeypatch) -> DictionaryStore:
+    dictionaries = DictionaryStore(tmp_path / "dictionaries", size=4096)
+    monkeypatch.setattr(compress_module, "dictionaries", dictionaries)
+    monkeypatch.setattr(compress_module, "enabled", True)
+    return dictionaries
+
+
+def test_versioned_dictionaries(dictionaries, tmp_path):
+    """Test entries remain readable after the dictionary is retrained."""
+    samples = [make_page(i) for i in range(50)]
+    page = make_page(100)
+
+    plain = dictionaries.compress(page, "lemonde.fr", "html")
+    path = dictionaries.train("lemonde.fr", "html", samples)
+    assert path.name == "lemonde.fr.html.v1.zdict"
+    first = dictionaries.compress(page, "lemonde.fr", "html")
+    assert len(first) < len(plain)
+
+    dictionaries.train("lemonde.fr", "html", samples[::-1])
+    assert dictionaries.versions("lemonde.fr", "html") == [1, 2]
+    second = dictionaries.compress(page, "lemonde.fr", "html")
+
+    frame_id = zstandard.get_frame_parameters
+    assert frame_id(first).dict_id != frame_id(second).dict_id
+    for frame in [plain, first, second]:
+        assert dictionaries.decompress(frame) == page
+
+    with pytest.raises(ValueError, match="Not enough samples"):
+        dictionaries.train("lemonde.fr", "md", samples[:2])
+
+
+def test_compressed_exports(dictionaries, tmp_path):
+    """Test exports are compressed with the dictionary of their site."""
+    text = make_page(0).decode()
+    path = write_export(tmp_path / "article.md", text, URL)
+    assert path.name == "article.md.zst"
+    assert read_export(path) == text
+
+
+def test_compressed_archive(dictionaries, tmp_path):
+    """Test archived pages are compressed one record at a time."""
+    dictionaries.train("lemonde.fr", "html", [make_page(i) for i in range(50)])
+    archive = WarcArchive(tmp_path / "archive", compressed=True)
+    token = current_article.set(URL)
+    try:
+        for i in range(3):
+            request = httpx.Request("GET", f"{URL}?page={i}")
+            response = httpx.Response(
+                200, request=request, content=make_page(i)
+            )
+            archive.write(response, make_page(i))
+    finally:
+        current_article.reset(token)
+
+    (path,) = archive.directory.glob("*.warc.zst")
+    records = list(read_archive(path))
+    assert [record.content for record in records] == [
+        make_page(i) for i in range(3)
+    ]
+    locations = archived_articles(archive.directory)[URL]
+    assert load_records(locations[1:]) == records[1:]
+    assert path.stat().st_size < sum(len(make_page(i)) for i in range(3))
@@ -4,6 +4,8 @@ import pytest
 from pydantic import ValidationError
 
 from kiosque.core.config import (
+    HTTPConfig,
+    ProxyConfig,
     RaindropConfig,
     WebsiteCredentials,
 )
@@ -53,3 +55,42 @@ def test_raindrop_config_strips_whitespace():
     """Test that token whitespace is stripped."""
     config = RaindropConfig(token="  test_token_123  ")
     assert config.token == "test_token_123"
+
+
+def test_http_config_defaults():
+    """Test default HTTP client configuration."""
+    config = HTTPConfig()
+    assert config.http2 is False
+    assert config.max_connections == 100
+    assert config.keepalive_expiry == 30.0
+
+
+def test_http_config_from_strings():
+    """Test HTTP configuration parsed from the INI file."""
+    config = HTTPConfig(http2="true", max_keepalive_connections="5")  # type: ignore
+    assert config.http2 is True
+    assert config.max_keepalive_connections == 5
+
+    with pytest.raises(ValidationError):
+        HTTPConfig(max_connections="0")  # type: ignore
+
+
+def test_proxy_config_pool_and_hosts():
+    """Test proxy pool and host rules parsed from the INI file."""
+    config = ProxyConfig(
+        url="socks5://localhost:1080",
+        pool="socks5://backup:1080, http://proxy:8080",  # type: ignore
+        hosts="lesechos.fr, .courrierinternational.com",  # type: ignore
+        mode="auto",
+    )
+    assert config.urls == [
+        "socks5://localhost:1080",
+        "socks5://backup:1080",
+        "http://proxy:8080",
+    ]
+    assert config.hosts == ["lesechos.fr", "courrierinternational.com"]
+
+    with pytest.raises(ValidationError):
+        ProxyConfig(url="socks5://localhost:1080", pool="ftp://x")  # type: ignore
+    with pytest.raises(ValidationError):
+        ProxyConfig(url="socks5://localhost:1080", mode="sometimes")  # type: ignore
@@ -0,0 +1,75 @@
+"""Tests for the detection of near-duplicate articles."""
+
+from kiosque.core.dedup import LSHIndex, signature, similarity
+from kiosque.core.store import Article, ArticleStore
+
+WIRE = (
+    "Le gouvernement a présenté mercredi en Conseil des ministres un projet "
+    "de loi visant à simplifier les démarches administratives des "
+    "entreprises, a annoncé le porte-parole à l'issue de la réunion. Le "
+    "texte prévoit notamment la suppression de plusieurs formulaires, la "
+    "généralisation des échanges dématérialisés et un délai de réponse "
+    "maximal de deux mois pour les services de l'État. Les organisations "
+    "patronales ont salué une avancée, tout en regrettant l'absence de "
+    "mesures sur la fiscalité locale. Le projet sera examiné au Sénat à "
+    "partir du mois prochain, avant une adoption espérée avant l'été."
+)
+
+
+def test_signature():
+    """Test the similarity of wire stories published by two newspapers."""
+    # Same story, different casing, accents, and a newspaper footer
+    copy = WIRE.upper().replace("é", "e") + " Lire aussi : notre dossier."
+    other = "Le XV de France s'est imposé face à l'Irlande samedi soir. " * 3
+
+    assert similarity(signature(WIRE), signature(WIRE)) == 1
+    assert similarity(signature(WIRE), signature(copy)) > 0.8
+    assert similarity(signature(WIRE), signature(other)) < 0.1
+
+    # Too short to be compared
+    assert signature("") is None
+    assert signature("Abonnez-vous pour lire la suite de cet article.") is None
+
+
+def test_lsh_index():
+    """Test only the first article of a story is claimed."""
+    index = LSHIndex()
+    sig = signature(WIRE)
+    copy = signature(f"{WIRE} (avec AFP)")
+
+    assert index.claim("https://www.lefigaro.fr/a", sig) is None
+    assert index.claim("https://www.lefigaro.fr/a", sig) is None  # same URL
+    assert index.claim("https://www.lemonde.fr/b", copy) == (
+        "https://www.lefigaro.fr/a"
+    )
+    assert len(index) == 1
+
+    index.remove("https://www.lefigaro.fr/a")
+    assert index.query(copy) == []
+
+
+def test_stored_signatures(tmp_path):
+    """Test signatures are stored with articles and survive updates."""
+    article = Article(
+        url="https://www.ladepeche.fr/a",
+        site="https://www.ladepeche.fr/",
+        title="Simplification",
+        author=None,
+        date=None,
+        description=None,
+        text=WIRE,
+        signature=signature(WIRE),
+    )
+    with ArticleStore(tmp_path / "articles.db") as store:
+        store.add(article)
+        store.add(article)
+        assert store.signatures() == {article.url: article.signature}
+        assert store.signatures(["https://www.lemonde.fr/b"]) == {}
+
+        stored = store.get(article.url)
+        assert stored is not None
+        assert stored.signature == article.signature
+
+        index = LSHIndex(store.signatures())
+        copy = signature(WIRE.replace("mercredi", "jeudi"))
+        assert index.query(copy) == [article.url]
@@ -0,0 +1,88 @@
+"""Tests for streamed downloads."""
+
+import hashlib
+import re
+
+import httpx
+import pytest
+
+from kiosque.core import download as download_module
+from kiosque.core.download import download, partial_path
+
+URL = "https://example.com/issue.pdf"
+PAYLOAD = bytes(range(256)) * 1000
+
+
+def make_client(requests: list[httpx.Request]) -> httpx.Client:
+    """Return a client serving PAYLOAD with support for range requests."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": 'attachment; filename="issue.pdf"',
+        }
+        if range_header := request.headers.get("Range"):
+            match = re.match(r"bytes=(\d+)-(\d*)", range_header)
+            assert match is not None
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(PAYLOAD) - 1
+            if start >= len(PAYLOAD):
+                return httpx.Response(416, headers=headers)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(PAYLOAD)}"
+            return httpx.Response(
+                206, headers=headers, content=PAYLOAD[start : end + 1]
+            )
+        return httpx.Response(200, headers=headers, content=PAYLOAD)
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def requests(monkeypatch) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+    monkeypatch.setattr(download_module, "client", make_client(requests))
+    return requests
+
+
+def test_download(tmp_path, requests):
+    """Test a plain download is written under its final name."""
+    progress = []
+    path = download(
+        URL,
+        tmp_path,
+        lambda c: "issue.pdf",
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert path == tmp_path / "issue.pdf"
+    assert path.read_bytes() == PAYLOAD
+    assert not partial_path(tmp_path, URL).exists()
+    assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+    assert len(requests) == 1
+
+
+def test_download_resume(tmp_path, requests):
+    """Test that a partial download is resumed with a range request."""
+    partial_path(tmp_path, URL).write_bytes(PAYLOAD[:1000])
+    path = download(URL, tmp_path, lambda c: "issue.pdf")
+    assert path.read_bytes() == PAYLOAD
+    assert requests[0].headers["Range"] == "bytes=1000-"
+
+
+def test_download_segments(tmp_path, requests):
+    """Test a download in parallel segments."""
+    path = download(URL, tmp_path, lambda c: "issue.pdf", segments=4)
+    assert path.read_bytes() == PAYLOAD
+    assert sum("Range" in request.headers for request in requests) == 4
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_download_checksum(tmp_path, requests):
+    """Test checksum verification."""
+    sha256 = hashlib.sha256(PAYLOAD).hexdigest()
+    path = download(URL, tmp_path, lambda c: "issue.pdf", sha256=sha256)
+    assert path.exists()
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        download(URL, tmp_path, lambda c: "other.pdf", sha256="0" * 64)
+    assert not (tmp_path / "other.pdf").exists()
@@ -0,0 +1,41 @@
+"""Tests for the executor of blocking work in the TUI."""
+
+import asyncio
+import threading
+
+from kiosque.core.cancel import cancel_event
+from kiosque.tui.executor import BlockingExecutor
+
+
+def test_executor_stats():
+    """Test the executor counts queued and running jobs, and latencies."""
+    executor = BlockingExecutor(workers=1)
+    release = threading.Event()
+    event = threading.Event()
+
+    async def main() -> None:
+        # Functions run with the context variables of the caller
+        cancel_event.set(event)
+        blocked = asyncio.create_task(executor.run(release.wait))
+        waiting = asyncio.create_task(executor.run(cancel_event.get))
+        dropped = asyncio.create_task(executor.run(cancel_event.get))
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        assert (stats.active, stats.queued) == (1, 2)
+        assert stats.last_run is None
+
+        # Jobs cancelled before they start are dropped
+        dropped.cancel()
+        await asyncio.gather(dropped, return_exceptions=True)
+        assert executor.stats().queued == 1
+
+        release.set()
+        assert await blocked
+        assert await waiting is event
+        stats = executor.stats()
+        assert (stats.active, stats.queued) == (0, 0)
+        assert stats.last_wait is not None and stats.last_wait > 0
+        assert "0/1 running, 0 queued" in str(stats)
+
+    asyncio.run(main())
+    executor.shutdown()
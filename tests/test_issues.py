@@ -0,0 +1,91 @@
+"""Tests for the synchronisation of PDF issues."""
+
+from datetime import datetime, timezone
+
+import httpx
+
+from kiosque.core import download as download_module
+from kiosque.core import issues as issues_module
+from kiosque.core.issues import (
+    IssueState,
+    dates,
+    issue_websites,
+    sync_website,
+)
+from kiosque.website.nytimes import NewYorkTimes
+
+
+def test_dates():
+    """Test iteration over a date range."""
+    days = list(
+        dates(
+            datetime(2024, 2, 27, tzinfo=timezone.utc),
+            datetime(2024, 3, 1, tzinfo=timezone.utc),
+        )
+    )
+    assert [day.day for day in days] == [27, 28, 29, 1]
+
+
+def test_issue_websites(monkeypatch, caplog):
+    """Test only website sections of the configuration are considered."""
+    config = {
+        "http": {"http2": "true"},
+        "https://www.nytimes.com/": {"username": "", "password": ""},
+        "https://www.lemonde.fr/": {"username": "", "password": ""},
+    }
+    monkeypatch.setattr(issues_module, "config_dict", config)
+    assert issue_websites() == [NewYorkTimes]
+    assert "Unsupported website" not in caplog.text
+
+
+def test_issue_state(tmp_path):
+    """Test conditional headers are only sent for files still present."""
+    state = IssueState(tmp_path)
+    url = "https://example.com/issue.pdf"
+    state.record(
+        url,
+        tmp_path / "issue.pdf",
+        httpx.Headers({"ETag": '"abc"', "Last-Modified": "yesterday"}),
+    )
+    assert state.conditional_headers(url) == {}
+
+    (tmp_path / "issue.pdf").write_bytes(b"%PDF")
+    assert state.conditional_headers(url) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "yesterday",
+    }
+
+    state.save()
+    assert IssueState(tmp_path).entries == state.entries
+
+
+def test_sync_website_date_range(tmp_path, monkeypatch):
+    """Test downloading a range of NYT front pages, then skipping them."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "2024/01/02" in str(request.url):
+            return httpx.Response(404)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"%PDF")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(download_module, "client", client)
+
+    state = IssueState(tmp_path)
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    until = datetime(2024, 1, 3, tzinfo=timezone.utc)
+    downloaded = sync_website(NewYorkTimes, tmp_path, state, since, until)
+    assert [path.name for path in downloaded] == [
+        "nyt-frontpage-2024-01-01.pdf",
+        "nyt-frontpage-2024-01-03.pdf",
+    ]
+
+    requests.clear()
+    downloaded = sync_website(NewYorkTimes, tmp_path, state, since, until)
+    assert downloaded == []
+    for request in requests:
+        if "2024/01/02" not in str(request.url):
+            assert request.headers["If-None-Match"] == '"v1"'
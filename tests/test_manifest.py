@@ -0,0 +1,139 @@
+"""Tests for incremental exports."""
+
+from pathlib import Path
+
+import httpx
+
+from kiosque.core import batch as batch_module
+from kiosque.core import stream as stream_module
+from kiosque.core.batch import Extraction, run_batch
+from kiosque.core.manifest import (
+    ExportManifest,
+    ManifestEntry,
+    check_unchanged,
+    extraction_version,
+)
+from kiosque.core.store import Article
+from kiosque.website.theconversation import TheConversation
+
+URL = "https://theconversation.com/some-article-123456"
+
+
+def test_check_unchanged(monkeypatch):
+    """Test conditional requests and modification times."""
+    requests: list[httpx.Request] = []
+    modified = "2024-03-01T10:00:00Z"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v2"':
+            return httpx.Response(304)
+        page = (
+            '<html><head><meta property="article:modified_time" '
+            f'content="{modified}"></head><body></body></html>'
+        )
+        headers = {"Content-Type": "text/html", "ETag": '"v2"'}
+        return httpx.Response(200, headers=headers, content=page.encode())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+    website = TheConversation()
+    entry = ManifestEntry(
+        path="article.md",
+        hash="...",
+        version=extraction_version(website),
+        etag='"v1"',
+        updated_time=modified,
+    )
+
+    # Same modification time: unchanged, with the new ETag
+    refreshed = check_unchanged(website, URL, entry)
+    assert refreshed is not None
+    assert refreshed.etag == '"v2"'
+
+    # Not modified
+    assert check_unchanged(website, URL, refreshed) == refreshed
+    assert requests[-1].headers["If-None-Match"] == '"v2"'
+
+    # Modified since the export
+    modified = "2024-03-02T08:00:00Z"
+    assert check_unchanged(website, URL, entry) is None
+
+    # New extraction rules, without any request
+    monkeypatch.setattr(TheConversation, "version", website.version + 1)
+    count = len(requests)
+    assert check_unchanged(website, URL, refreshed) is None
+    assert len(requests) == count
+
+
+def test_check_unchanged_validators(monkeypatch):
+    """Test validators are recorded, and used without modification time."""
+    etags = ['"v1"']
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = b"<html><head><title>Title</title></head><body></body></html>"
+        headers = {"Content-Type": "text/html"}
+        if etags:
+            headers["ETag"] = etags[0]
+        return httpx.Response(200, headers=headers, content=page)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+    website = TheConversation()
+    etag, last_modified = website.validators(URL)
+    assert (etag, last_modified) == ('"v1"', None)
+    entry = ManifestEntry(
+        path="article.md",
+        hash="...",
+        version=extraction_version(website),
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+    # Conditional requests are ignored, but the ETag is the same
+    assert check_unchanged(website, URL, entry) == entry
+    etags[0] = '"v2"'
+    assert check_unchanged(website, URL, entry) is None
+    etags.clear()
+    assert check_unchanged(website, URL, entry) is None
+
+
+def test_incremental_batch(tmp_path, monkeypatch):
+    """Test unchanged articles are neither extracted nor written again."""
+    texts = {f"https://example.com/{i}": "Text" for i in range(3)}
+    extracted: list[str] = []
+
+    def extract_article(url: str, index=None, signed=False) -> Extraction:
+        extracted.append(url)
+        article = Article(url, None, None, None, None, None, texts[url])
+        name = url.split("/")[-1]
+        return Extraction(article, Path(f"{name}.md"), "1")
+
+    def check_unchanged(website, url: str, entry: ManifestEntry):
+        return entry if url.endswith("0") else None
+
+    monkeypatch.setattr(batch_module, "extract_article", extract_article)
+    monkeypatch.setattr(batch_module, "check_unchanged", check_unchanged)
+    monkeypatch.setattr(batch_module.Website, "instance", lambda url: None)
+
+    export = tmp_path / "export"
+    result = run_batch(texts, directory=export)
+    assert len(result.written) == 3
+    assert set(ExportManifest(export).entries) == set(texts)
+
+    # Article 0 is unchanged, article 1 has the same text, article 2 changed
+    texts["https://example.com/2"] = "New text"
+    extracted.clear()
+    result = run_batch(texts, directory=export)
+    assert result.unchanged == ["https://example.com/0"]
+    assert sorted(extracted) == [
+        "https://example.com/1",
+        "https://example.com/2",
+    ]
+    assert result.written == [export / "2.md"]
+    assert (export / "2.md").read_text() == "New text"
+
+    # Exported files which have been deleted are written again
+    (export / "0.md").unlink()
+    result = run_batch(texts, directory=export)
+    assert export / "0.md" in result.written
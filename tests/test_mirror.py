@@ -0,0 +1,80 @@
+"""Tests for the local mirror of Raindrop.io bookmarks."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from kiosque.api import raindrop
+from kiosque.api.mirror import RaindropMirror
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def raindrop_item(item_id: int, updated: int = 0) -> dict:
+    return {
+        "_id": item_id,
+        "title": f"Article {item_id}",
+        "link": f"https://example.com/{item_id}",
+        "created": (START + timedelta(days=item_id)).isoformat(),
+        "lastUpdate": (START + timedelta(days=item_id + updated)).isoformat(),
+        "tags": [],
+        "collection": {"$id": 0},
+        "type": "link",
+        "user": {"$id": 1},
+    }
+
+
+def test_mirror_sync(tmp_path, monkeypatch):
+    """Test only updated bookmarks are downloaded, until a deletion."""
+    library = {i: raindrop_item(i) for i in range(120)}
+    requested: list[tuple[str, int]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        perpage = int(request.url.params["perpage"])
+        sort = request.url.params["sort"]
+        requested.append((sort, page))
+        field = sort.lstrip("-")
+        items = sorted(library.values(), key=lambda i: i[field], reverse=True)
+        return httpx.Response(
+            200,
+            json={
+                "items": items[page * perpage : (page + 1) * perpage],
+                "count": len(library),
+            },
+        )
+
+    monkeypatch.setattr(raindrop, "config_dict", {"raindrop.io": {}})
+    api = raindrop.RaindropAPI()
+    api.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run(mirror: RaindropMirror) -> None:
+        assert mirror.reconcile_due(3600)
+        mirror.replace(await api.get_items_async())
+        assert not mirror.reconcile_due(3600)
+        assert [item.id_ for item in mirror.items()] == list(
+            reversed(range(120))
+        )
+
+        # Nothing changed: a single page is read
+        requested.clear()
+        assert await mirror.update(api) == []
+        assert requested == [("-lastUpdate", 0)]
+
+        # Tags edited on an old bookmark
+        library[3] = {**raindrop_item(3, updated=200), "tags": ["python"]}
+        updates = await mirror.update(api)
+        assert updates is not None
+        assert [item.id_ for item in updates] == [3]
+        (item,) = [item for item in mirror.items() if item.id_ == 3]
+        assert item.tags == ["python"]
+
+        # Deletions are only noticed by reconciliation
+        del library[50]
+        assert await mirror.update(api) is None
+        assert mirror.replace(await api.get_items_async()) == 1
+        assert len(mirror) == 119
+
+    with RaindropMirror(tmp_path / "raindrop.db") as mirror:
+        asyncio.run(run(mirror))
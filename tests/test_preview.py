@@ -0,0 +1,187 @@
+"""Tests for the prefetched previews of bookmarks."""
+
+import asyncio
+import os
+import threading
+
+import httpx
+import pytest
+
+from kiosque.core.cancel import ExtractionCancelled, checkpoint
+from kiosque.tui.preview import PreviewCache, PreviewScheduler, Priority
+
+
+def test_preview_cache(tmp_path):
+    """Test previews are cached by canonical URL, until they expire."""
+    cache = PreviewCache(tmp_path, max_age=3600)
+    url = "https://example.com/article"
+
+    assert cache.get(url) is None
+    cache.put(url, "# Article")
+    assert url in cache
+    assert cache.get(f"{url}?utm_source=rss") == "# Article"
+
+    # Expired previews are ignored, then pruned
+    path = next(tmp_path.glob("*.md.gz"))
+    os.utime(path, (0, 0))
+    assert url not in cache
+    assert cache.get(url) is None
+    assert cache.prune() == 1
+    assert not path.exists()
+
+
+def test_preview_scheduler(tmp_path):
+    """Test previews are prefetched in order, once, and cached."""
+    calls: list[str] = []
+
+    def extract(url: str) -> str:
+        calls.append(url)
+        if "unsupported" in url:
+            raise ValueError(f"Unsupported URL: {url}")
+        return f"# {url}"
+
+    first, second = "https://example.com/1", "https://example.com/2"
+    unsupported = "https://unsupported.com/3"
+
+    async def main() -> None:
+        scheduler = PreviewScheduler(
+            PreviewCache(tmp_path), workers=1, extract=extract
+        )
+        scheduler.start()
+        scheduler.prefetch([first, second, unsupported])
+        assert scheduler.jobs[first].priority is Priority.PREFETCH
+        assert scheduler.jobs[second].priority is Priority.BACKGROUND
+        while scheduler.jobs:
+            await asyncio.sleep(0.01)
+        assert calls == [first, second, unsupported]
+
+        # Cached previews are neither prefetched nor extracted again
+        scheduler.prefetch([first, second, unsupported])
+        assert scheduler.jobs == {}
+        assert await scheduler.preview(f"{first}#top") == f"# {first}"
+        assert len(calls) == 3
+
+        # Failed previews are only extracted again when asked
+        with pytest.raises(ValueError):
+            await scheduler.preview(unsupported)
+        assert len(calls) == 4
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+
+def test_preview_failures(tmp_path):
+    """Test only permanent failures stop the prefetch of a bookmark."""
+    calls: list[str] = []
+
+    def extract(url: str) -> str:
+        calls.append(url)
+        request = httpx.Request("GET", url)
+        if url.endswith("timeout"):
+            raise httpx.ConnectTimeout("Timeout", request=request)
+        response = httpx.Response(404, request=request)
+        response.raise_for_status()
+        return ""
+
+    timeout = "https://example.com/timeout"
+    missing = "https://example.com/missing"
+
+    async def main() -> None:
+        scheduler = PreviewScheduler(
+            PreviewCache(tmp_path), workers=1, extract=extract
+        )
+        scheduler.start()
+        for _ in range(2):
+            scheduler.prefetch([timeout, missing])
+            while scheduler.jobs:
+                await asyncio.sleep(0.01)
+        assert calls == [timeout, missing, timeout]
+        assert scheduler.failed == {missing}
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+
+def test_preview_cancel(tmp_path):
+    """Test stale jobs are cancelled, and interactive ones come first."""
+    started = threading.Event()
+    resume = threading.Event()
+    calls: list[str] = []
+
+    def extract(url: str) -> str:
+        calls.append(url)
+        if url.endswith("slow"):
+            started.set()
+            resume.wait()
+            checkpoint("parse")
+        return f"# {url}"
+
+    slow, other = "https://example.com/slow", "https://example.com/other"
+    urgent = "https://example.com/urgent"
+
+    async def main() -> None:
+        scheduler = PreviewScheduler(
+            PreviewCache(tmp_path), workers=1, extract=extract
+        )
+        scheduler.start()
+        scheduler.prefetch([slow, other])
+        await asyncio.to_thread(started.wait)
+        job = scheduler.jobs[slow]
+
+        # The only worker is busy: interactive jobs do not wait for it
+        assert await scheduler.preview(urgent) == f"# {urgent}"
+
+        # The cursor moves: the extraction stops at the next stage
+        scheduler.prefetch([other])
+        assert slow not in scheduler.jobs
+        resume.set()
+        with pytest.raises(ExtractionCancelled):
+            await job.task
+        while scheduler.jobs:
+            await asyncio.sleep(0.01)
+        assert calls == [slow, urgent, other]
+        assert slow not in scheduler.cache
+        assert slow not in scheduler.failed
+        await scheduler.stop()
+
+    asyncio.run(main())
+
+
+def test_preview_interactive(tmp_path):
+    """Test interactive jobs are only cancelled when their preview closes."""
+    started = threading.Event()
+    resume = threading.Event()
+
+    def extract(url: str) -> str:
+        started.set()
+        resume.wait()
+        checkpoint("parse")
+        return f"# {url}"
+
+    opened, other = "https://example.com/opened", "https://example.com/other"
+
+    async def main() -> None:
+        scheduler = PreviewScheduler(
+            PreviewCache(tmp_path), workers=1, extract=extract
+        )
+        preview = asyncio.create_task(scheduler.preview(opened))
+        await asyncio.to_thread(started.wait)
+
+        # The cursor moves while the preview is loading
+        scheduler.prefetch([other])
+        assert opened in scheduler.jobs
+        resume.set()
+        assert await preview == f"# {opened}"
+
+        # Closing the preview cancels its job
+        resume.clear()
+        started.clear()
+        preview = asyncio.create_task(scheduler.preview(other))
+        await asyncio.to_thread(started.wait)
+        scheduler.cancel(other)
+        resume.set()
+        with pytest.raises(ExtractionCancelled):
+            await preview
+        await scheduler.stop()
+
+    asyncio.run(main())
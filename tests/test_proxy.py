@@ -142,3 +142,53 @@ def test_proxy(proxy_url: str | None = None):
 if __name__ == "__main__":
     proxy = sys.argv[1] if len(sys.argv) > 1 else None
     test_proxy(proxy)
+
+
+def make_routing_transport(mode, hosts="", state_file=None):
+    """Return a routing transport with mock direct and proxy transports."""
+    from kiosque.core.config import ProxyConfig
+    from kiosque.core.proxy import ProxyRouter, RoutingTransport
+
+    config = ProxyConfig(url="socks5://localhost:1080", mode=mode, hosts=hosts)  # type: ignore
+    transport = RoutingTransport(ProxyRouter(config, state_file))
+
+    def direct(request: httpx.Request) -> httpx.Response:
+        blocked = request.url.host.endswith("lesechos.fr")
+        return httpx.Response(403 if blocked else 200, text="direct")
+
+    transport.direct = httpx.MockTransport(direct)  # type: ignore
+    transport.proxies = [
+        httpx.MockTransport(lambda request: httpx.Response(200, text="proxy"))
+    ]
+    return transport
+
+
+def test_proxy_mode_all():
+    """Test that all traffic goes through the proxy by default."""
+    client = httpx.Client(transport=make_routing_transport("all"))
+    assert client.get("https://www.lemonde.fr/").text == "proxy"
+
+
+def test_proxy_mode_hosts():
+    """Test that only configured hosts go through the proxy."""
+    transport = make_routing_transport("hosts", "courrierinternational.com")
+    client = httpx.Client(transport=transport)
+    url = "https://secure.courrierinternational.com/"
+    assert client.get(url).text == "proxy"
+    assert client.get("https://www.lemonde.fr/").text == "direct"
+    assert client.get("https://www.lesechos.fr/").status_code == 403
+
+
+def test_proxy_mode_auto(tmp_path):
+    """Test that geo-blocked hosts are retried and remembered."""
+    state_file = tmp_path / "proxy-hosts.json"
+    transport = make_routing_transport("auto", state_file=state_file)
+    client = httpx.Client(transport=transport)
+    assert client.get("https://www.lemonde.fr/").text == "direct"
+    assert client.get("https://www.lesechos.fr/").text == "proxy"
+    assert transport.router.learned == {"www.lesechos.fr"}
+
+    # The learned host is routed through the proxy on the next run
+    transport = make_routing_transport("auto", state_file=state_file)
+    assert transport.router.use_proxy("www.lesechos.fr")
+    assert not transport.router.use_proxy("www.lemonde.fr")
@@ -64,3 +64,56 @@ def test_raindrop_item_cover_empty_string():
     }
     item = RaindropItem(**item_data)
     assert item.cover is None
+
+
+def test_get_items_async(monkeypatch):
+    """Test pages after the first one are fetched concurrently."""
+    import asyncio
+
+    import httpx
+
+    from kiosque.api import raindrop
+
+    count = 120
+    in_flight: list[int] = []
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal max_in_flight
+        page = int(request.url.params["page"])
+        perpage = int(request.url.params["perpage"])
+        assert perpage == raindrop.MAX_PER_PAGE
+        in_flight.append(page)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        # The second page is the slowest one
+        await asyncio.sleep(0.05 if page == 1 else 0.01)
+        in_flight.remove(page)
+        ids = range(page * perpage, min((page + 1) * perpage, count))
+        items = [
+            {
+                "_id": i,
+                "title": f"Article {i}",
+                "link": f"https://example.com/{i}",
+                "created": "2024-01-01T00:00:00Z",
+                "lastUpdate": "2024-01-01T00:00:00Z",
+                "collection": {"_id": 1},
+                "type": "link",
+                "user": {"_id": 1},
+            }
+            for i in ids
+        ]
+        return httpx.Response(200, json={"items": items, "count": count})
+
+    monkeypatch.setattr(raindrop, "config_dict", {"raindrop.io": {}})
+    api = raindrop.RaindropAPI()
+    api.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run() -> None:
+        pages = [page async for page, _ in api.iter_items_async()]
+        assert pages == [0, 2, 1]
+        assert max_in_flight == 2
+
+        items = await api.get_items_async()
+        assert [item.id_ for item in items] == list(range(count))
+
+    asyncio.run(run())
@@ -0,0 +1,108 @@
+"""Tests for the search index of bookmarks."""
+
+from dataclasses import dataclass, field
+
+from kiosque.tui.search import Query, SearchIndex, tokenize
+
+
+@dataclass
+class Bookmark:
+    key: int
+    title: str
+    url: str = "https://example.com/"
+    tags: list[str] = field(default_factory=list)
+    language: str = ""
+
+    def search_fields(self) -> dict[str, str | list[str]]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "domain": self.url.split("/")[2],
+            "tags": self.tags,
+            "language": self.language,
+        }
+
+
+BOOKMARKS = [
+    Bookmark(0, "Réformes des retraites", "https://www.lemonde.fr/a"),
+    Bookmark(1, "Modern C++ tips", tags=["programming"]),
+    Bookmark(2, "Rust for Python developers", language="Rust"),
+    Bookmark(3, "Notes", tags=["python", "tutorial"]),
+    Bookmark(4, "Python packaging", "https://packaging.python.org/"),
+]
+
+
+def search(index: SearchIndex, query: str) -> list[int]:
+    return index.search(query, {b.key: i for i, b in enumerate(BOOKMARKS)})
+
+
+def test_query():
+    """Test queries are split into words and filters."""
+    query = Query.parse("C++ #Python site:lemonde.fr lang:rust été")
+    assert query.words == ["c++", "ete"]
+    assert query.tags == ["python"]
+    assert query.sites == ["lemonde.fr"]
+    assert query.languages == ["rust"]
+    assert tokenize("https://www.lemonde.fr/a") == ["lemonde", "fr", "a"]
+
+
+def test_search():
+    """Test matches are ranked, with prefixes, typos and filters."""
+    index = SearchIndex(BOOKMARKS)
+
+    # Title matches first, then tags, then URLs
+    assert search(index, "python") == [2, 4, 3]
+    assert search(index, "pyth") == [2, 4, 3]
+    assert search(index, "pyhton") == [2, 4, 3]  # typo
+    assert search(index, "retraite") == [0]  # accents
+    assert search(index, "c++") == [1]  # not a regular expression
+    assert search(index, "python rust") == [2]
+    assert search(index, "#pyth") == [3]
+    assert search(index, "site:lemonde") == [0]
+    assert search(index, "lang:rust") == [2]
+    assert search(index, "python site:python.org") == [4]
+    assert search(index, "(unbalanced") == []
+
+    index.remove(BOOKMARKS[4])
+    assert search(index, "packaging") == []
+    BOOKMARKS[3].tags = ["rust"]
+    index.update(BOOKMARKS[3])
+    assert search(index, "#python") == []
+    assert search(index, "rust") == [2, 3]
+    BOOKMARKS[3].tags = ["python", "tutorial"]
+
+
+def test_narrows():
+    """Test extended queries are only searched among previous results."""
+    index = SearchIndex(BOOKMARKS)
+
+    assert index.narrows("pyth", "python")
+    assert index.narrows("python", "python rust")
+    assert index.narrows("#py", "#python")
+    assert not index.narrows("", "site:lemonde")
+    assert not index.narrows("#", "#py")  # empty queries match all records
+    assert not index.narrows("python", "pyth")  # deletion
+    assert not index.narrows("rust", "python")
+    assert not index.narrows("site", "site:lemonde")  # now a filter
+    assert not index.narrows("pyh", "pyhton")  # typos are now tolerated
+
+    position = {b.key: i for i, b in enumerate(BOOKMARKS)}
+    previous = index.search("pyth", position)
+    assert index.search("python", position, previous) == search(index, "python")
+    assert index.search("python rust", position, previous) == [2]
+
+
+def test_narrows_empty():
+    """Test typing a filter one key at a time, from a lone ``#``."""
+    index = SearchIndex(BOOKMARKS)
+    position = {b.key: i for i, b in enumerate(BOOKMARKS)}
+
+    previous = ""
+    shown = None
+    for i in range(1, len("#py") + 1):
+        text = "#py"[:i]
+        among = shown if index.narrows(previous, text) else None
+        shown = index.search(text, position, among)
+        previous = text
+    assert shown == search(index, "#py") == [3]
+    assert search(index, "#") == search(index, "-") == [0, 1, 2, 3, 4]
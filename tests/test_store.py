@@ -0,0 +1,97 @@
+"""Tests for the article store and batch extraction."""
+
+from pathlib import Path
+
+import pytest
+
+from kiosque.core import batch as batch_module
+from kiosque.core.batch import Extraction, run_batch
+from kiosque.core.store import Article, ArticleStore
+
+
+def make_article(url: str, title: str, text: str) -> Article:
+    return Article(
+        url=url,
+        site="https://example.com/",
+        title=title,
+        author="Jane Doe",
+        date="2024-03-01",
+        description=None,
+        text=f"---\ntitle: {title}\n---\n\n{text}",
+    )
+
+
+def test_store_search(tmp_path):
+    """Test full-text search of stored articles."""
+    with ArticleStore(tmp_path / "articles.db") as store:
+        store.add_many(
+            [
+                make_article(
+                    "https://example.com/1", "Élections", "Le scrutin..."
+                ),
+                make_article(
+                    "https://example.com/2", "Rugby", "Les élections à la FFR"
+                ),
+            ]
+        )
+        assert len(store) == 2
+        assert "https://example.com/1" in store
+
+        # Diacritics are ignored, matches in the title rank first
+        results = store.search("elections")
+        assert [r.url for r in results] == [
+            "https://example.com/1",
+            "https://example.com/2",
+        ]
+        assert "[élections]" in results[1].snippet
+
+        # Updates are reflected in the index
+        store.add(make_article("https://example.com/2", "Rugby", "Le XV"))
+        assert len(store.search("elections")) == 1
+
+        article = store.get(results[0].id)
+        assert article is not None
+        assert article.title == "Élections"
+        assert store.get("https://example.com/3") is None
+
+        with pytest.raises(ValueError, match="Invalid search query"):
+            store.search('"unbalanced')
+
+
+def test_run_batch(tmp_path, monkeypatch):
+    """Test stored URLs are skipped and writes are batched."""
+    extracted: list[str] = []
+
+    def extract_article(url: str, index=None, signed=False) -> Extraction:
+        extracted.append(url)
+        if url.endswith("fail"):
+            raise ValueError("Unsupported URL")
+        name = url.split("/")[-1]
+        return Extraction(
+            make_article(url, name, "Text"), Path(f"{name}.md"), "1"
+        )
+
+    monkeypatch.setattr(batch_module, "extract_article", extract_article)
+    monkeypatch.setattr(batch_module, "BATCH_SIZE", 2)
+    urls = [f"https://example.com/{i}" for i in range(5)]
+
+    with ArticleStore(tmp_path / "articles.db") as store:
+        store.add(make_article(urls[0], "0", "Text"))
+        result = run_batch(
+            [*urls, urls[1], "https://example.com/fail"], store=store
+        )
+        assert len(store) == 5
+
+        assert result.skipped == [urls[0]]
+        assert result.stored == 4
+        assert list(result.failed) == ["https://example.com/fail"]
+        assert sorted(extracted) == sorted(
+            [*urls[1:], "https://example.com/fail"]
+        )
+
+        # Stored articles are not skipped when exported to a directory
+        extracted.clear()
+        result = run_batch(urls, directory=tmp_path / "export", store=store)
+        assert result.skipped == []
+        assert sorted(extracted) == sorted(urls)
+        assert len(list((tmp_path / "export").glob("*.md"))) == 5
@@ -0,0 +1,197 @@
+"""Tests for the incremental parsing of streamed pages."""
+
+import re
+
+import httpx
+import pytest
+import stamina
+from lxml import etree
+
+from kiosque.core import stream as stream_module
+from kiosque.core.stream import (
+    NotHTMLError,
+    PageTooLargeError,
+    fetch_limited,
+    fetch_until,
+    node_matcher,
+    page_budget,
+)
+
+URL = "https://example.com/article.html"
+CHUNKS = [
+    b"<html><head><title>Title</title>",
+    b'<meta name="author" content="Jane Doe">',
+    b'<meta property="og:title" content="Title"></head><body>',
+    b'<article class="main story"><div><p>First</p></div>',
+    b"<div><p>Second</p></div></article>",
+    b"<footer>" + b"<script>var x = 1;</script>" * 100 + b"</footer>",
+    b"</body></html>",
+]
+
+
+@pytest.fixture
+def sent(monkeypatch) -> list[bytes]:
+    sent: list[bytes] = []
+
+    def content():
+        for chunk in CHUNKS:
+            sent.append(chunk)
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html; charset=utf-8"},
+            content=content(),
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+    return sent
+
+
+def test_node_matcher():
+    """Test the BeautifulSoup semantics of node selectors."""
+    element = etree.fromstring('<div class="main story" id="content"/>')
+    assert node_matcher("div")(element)
+    assert node_matcher(("div", {"class": "story"}))(element)
+    assert node_matcher(("div", {"class": ["other", "main"]}))(element)
+    assert node_matcher(("div", {"id": re.compile("^cont")}))(element)
+    assert not node_matcher(("div", {"class": "other"}))(element)
+    assert not node_matcher(("article", {"class": "story"}))(element)
+
+
+def test_fetch_until_article(sent):
+    """Test reading stops once the article node has been closed."""
+    page = fetch_until(URL, node_matcher(("article", {"class": "main"})))
+    assert not page.complete
+    assert len(sent) == 5
+    assert page.content.endswith(b"</article>")
+    assert page.find_meta({"name": "author"}) == "Jane Doe"
+
+
+def test_fetch_until_head(sent):
+    """Test reading stops at the end of the head."""
+    page = fetch_until(URL, head_only=True)
+    assert not page.complete
+    assert len(sent) == 3
+    assert page.find_meta({"property": ["og:title", "title"]}) == "Title"
+
+
+def test_fetch_until_missing_node(sent):
+    """Test the whole page is read if the node never shows up."""
+    page = fetch_until(URL, node_matcher("section"))
+    assert page.complete
+    assert len(sent) == len(CHUNKS)
+
+
+def test_fetch_until_no_stop(sent, monkeypatch):
+    """Test pages are not parsed without a condition to stop early."""
+
+    def parser(*args, **kwargs):
+        raise AssertionError("The page should not be parsed")
+
+    monkeypatch.setattr(stream_module.etree, "HTMLPullParser", parser)
+    page = fetch_until(URL)
+    assert page.complete
+    assert page.content == b"".join(CHUNKS)
+    assert page.meta == []
+
+
+def test_fetch_until_retries(monkeypatch):
+    """Test only network errors and server errors are retried."""
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(int(request.url.path.strip("/")))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+
+    stamina.set_testing(True, attempts=3)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_until("https://example.com/404")
+        assert requests == ["/404"]
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_until("https://example.com/503")
+        assert requests == ["/404"] + ["/503"] * 3
+
+        # Missing alternate pages fall back to the full page at once
+        requests.clear()
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_limited("https://example.com/404", 2**20)
+        assert requests == ["/404"]
+    finally:
+        stamina.set_testing(False)
+
+
+def test_page_metadata(monkeypatch):
+    """Test header fields are filled from meta tags, then from JSON-LD."""
+    from kiosque.core.website import Website
+
+    head = (
+        b"""<html><head><title>Fallback</title>
+    <meta property="og:title" content="Title">
+    <script type="application/ld+json">{"@graph": [{"@type": "NewsArticle",
+    "author": [{"name": "Jane Doe"}, {"name": "John Doe"}],
+    "datePublished": "2024-03-01T08:00:00Z",
+    "description": "First line\\nSecond line"}]}</script>
+    </head><body>"""
+        + b"<p>Lorem ipsum</p>" * 1000
+        + b"</body></html>"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=iter([head]))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+
+    page = fetch_until(URL, head_only=True)
+    assert Website.page_metadata(page) == {
+        "title": "Title",
+        "author": "Jane Doe, John Doe",
+        "date": "2024-03-01",
+        "description": "First line",
+    }
+
+
+def test_fetch_until_guards(monkeypatch):
+    """Test non-HTML resources and large pages are rejected early."""
+    sent: list[bytes] = []
+
+    def content():
+        for _ in range(100):
+            sent.append(b"x" * 1024)
+            yield sent[-1]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith(".pdf"):
+            headers = {"Content-Type": "application/pdf"}
+            return httpx.Response(200, headers=headers, content=content())
+        if request.url.path.endswith(".mp4"):
+            headers = {"Content-Type": "video/mp4", "Content-Length": "1"}
+            return httpx.Response(200, headers=headers, content=content())
+        return httpx.Response(200, content=content())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(stream_module, "client", client)
+
+    with pytest.raises(NotHTMLError, match="application/pdf"):
+        fetch_until("https://example.com/issue.pdf")
+    with pytest.raises(NotHTMLError, match="video/mp4"):
+        fetch_until("https://example.com/video.mp4")
+    assert sent == []
+
+    with pytest.raises(PageTooLargeError):
+        fetch_until("https://example.com/endless.html", max_bytes=10_000)
+    assert len(sent) == 10
+
+
+def test_page_budget(monkeypatch):
+    """Test per-site maximum page sizes."""
+    monkeypatch.setattr(stream_module, "page_sizes", {"example.com": 1})
+    assert page_budget("https://www.example.com/page.html") == 2**20
+    assert page_budget("https://example.org/", 2) == 2 * 2**20
@@ -0,0 +1,162 @@
+"""Tests for the bookmark lists of the TUI."""
+
+import asyncio
+from datetime import UTC, datetime
+
+from textual.app import App, ComposeResult
+
+from kiosque.api.raindrop import RaindropItem
+from kiosque.tui.executor import BlockingExecutor
+from kiosque.tui.raindrop import Entry, RaindropList
+from kiosque.tui.snapshot import ListState, Snapshot
+
+
+def raindrop_item(item_id: int, tags: list[str]) -> RaindropItem:
+    item_data = {
+        "_id": item_id,
+        "title": f"Article {item_id}",
+        "link": f"https://example.com/{item_id}",
+        "created": "2024-01-01T00:00:00Z",
+        "lastUpdate": "2024-01-01T00:00:00Z",
+        "tags": tags,
+        "collection": {"_id": 1},
+        "type": "link",
+        "user": {"_id": 1},
+    }
+    return RaindropItem(**item_data)
+
+
+class ListApp(App):
+    def compose(self) -> ComposeResult:
+        yield RaindropList(id="raindrop-entries")
+
+
+def test_bookmark_list():
+    """Test the list only renders, filters and moves over records."""
+
+    async def run() -> None:
+        app = ListApp()
+        async with app.run_test(size=(80, 20)) as pilot:
+            bookmarks = app.query_one(RaindropList)
+            entries = [
+                Entry(raindrop_item(i, ["python"] if i % 2 else []))
+                for i in range(1000)
+            ]
+            bookmarks.extend(entries)
+            bookmarks.focus()
+            await pilot.pause()
+
+            # The index is built in the pool of blocking threads
+            executor = BlockingExecutor(2)
+            await bookmarks.build_search_index(executor)
+            executor.shutdown()
+            assert executor.stats().last_run is not None
+
+            assert len(bookmarks.shown) == 1000
+            assert bookmarks.virtual_size.height == 1000 * 6
+            assert "Article 0" in bookmarks.render_line(0).text
+
+            await pilot.press("down", "down", "end")
+            assert bookmarks.current == entries[-1]
+            await pilot.press("home", "down")
+            assert bookmarks.current == entries[1]
+
+            # The cursor stays on the current entry when refreshing
+            bookmarks.filter("python")
+            assert len(bookmarks.shown) == 500
+            await pilot.press("down")
+            assert bookmarks.current == entries[3]
+            bookmarks.filter("python")
+            assert bookmarks.current == entries[3]
+
+            bookmarks.remove(entries[3])
+            assert bookmarks.current == entries[5]
+            assert len(bookmarks.records) == 999
+
+            entries[5].tags = ["rust"]
+            bookmarks.refresh_record(entries[5])
+            bookmarks.filter("python")
+            assert entries[5] not in bookmarks.shown
+            bookmarks.filter("#rust")
+            assert bookmarks.shown == [entries[5]]
+
+    asyncio.run(run())
+
+
+def test_bookmark_list_sync():
+    """Test refreshes only build records for new or edited bookmarks."""
+
+    async def run() -> None:
+        app = ListApp()
+        async with app.run_test(size=(80, 20)):
+            bookmarks = app.query_one(RaindropList)
+            items = [raindrop_item(i, []) for i in range(5)]
+
+            def sync(items: list[RaindropItem]) -> tuple[int, int, int]:
+                return bookmarks.sync(
+                    items,
+                    key=lambda item: item.id_,
+                    build=Entry,
+                    outdated=Entry.outdated,
+                )
+
+            assert sync(items) == (5, 0, 0)
+            first = bookmarks.index[0]
+
+            # Tags edited elsewhere, one bookmark deleted, one added
+            edited = items[1].model_copy(
+                update={
+                    "tags": ["python"],
+                    "lastUpdate": datetime(2024, 2, 1, tzinfo=UTC),
+                }
+            )
+            fresh = [raindrop_item(5, []), items[0], edited, *items[3:]]
+            assert sync(fresh) == (1, 1, 1)
+            assert [entry.item_id for entry in bookmarks.records] == [
+                5,
+                0,
+                1,
+                3,
+                4,
+            ]
+            assert bookmarks.index[0] is first
+            assert bookmarks.index[1].tags == ["python"]
+            assert 2 not in bookmarks.index
+
+            bookmarks.filter("python")
+            assert bookmarks.shown == [bookmarks.index[1]]
+
+    asyncio.run(run())
+
+
+def test_snapshot(tmp_path):
+    """Test records are restored from a snapshot as they were saved."""
+    entries = [Entry(raindrop_item(i, ["python"])) for i in range(3)]
+    entries[1].duplicate_of = "Article 0"
+    github = Entry(raindrop_item(3, []))
+    github.url = "https://github.com/xoolive/kiosque"
+    github._github_repo = ("xoolive", "kiosque")
+
+    snapshot = Snapshot(mirror=[4, "2024-01-01T00:00:00+00:00"])
+    snapshot.lists["raindrop-entries"] = ListState(
+        records=[entry.dump() for entry in [*entries, github]],
+        cursor=2,
+        scroll_y=6,
+    )
+    snapshot.save(tmp_path / "tui.json.gz")
+
+    loaded = Snapshot.load(tmp_path / "tui.json.gz")
+    assert loaded is not None
+    assert loaded.mirror == snapshot.mirror
+    state = loaded.lists["raindrop-entries"]
+    assert (state.cursor, state.scroll_y) == (2, 6)
+
+    restored = [Entry.restore(values) for values in state.records]
+    for entry, original in zip(restored, [*entries, github]):
+        for name in Entry.SNAPSHOT_FIELDS:
+            assert getattr(entry, name) == getattr(original, name)
+    assert restored[3]._github_repo == ("xoolive", "kiosque")
+
+    # Corrupted snapshots are ignored
+    (tmp_path / "tui.json.gz").write_bytes(b"garbage")
+    assert Snapshot.load(tmp_path / "tui.json.gz") is None
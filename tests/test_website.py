@@ -84,3 +84,92 @@ def test_latest_issue_not_implemented():
     with pytest.raises(NotImplementedError) as exc_info:
         website.latest_issue_url()
     assert "does not support downloading" in str(exc_info.value)
+
+
+def test_issue_file_name():
+    """Test the default file name is read from the issue URL."""
+    import httpx
+
+    request = httpx.Request("GET", "https://test.example.com/issues/42.pdf")
+    redirect = httpx.Response(302, request=request)
+    c = httpx.Response(
+        200,
+        request=httpx.Request("GET", "https://cdn.example.com/a1b2c3"),
+        history=[redirect],
+    )
+    website = MockWebsite()
+    with patch.object(MockWebsite, "latest_issue_url") as latest_issue_url:
+        assert website.file_name(c) == "42.pdf"
+    latest_issue_url.assert_not_called()
+
+
+def test_aliases_from_config(monkeypatch):
+    """Test that configured aliases are indexed without importing modules."""
+    import sys
+
+    from kiosque.core import website as website_module
+
+    monkeypatch.setattr(Website, "_module_cache", {})
+    monkeypatch.setitem(
+        website_module.config_dict,
+        "https://www.theguardian.com",
+        {"alias": "guardian, tg"},
+    )
+    monkeypatch.delitem(
+        sys.modules, "kiosque.website.theguardian", raising=False
+    )
+
+    aliases = Website.aliases()
+    assert aliases["guardian"] == "kiosque.website.theguardian"
+    assert aliases["tg"] == "kiosque.website.theguardian"
+    # Built-in aliases are still there
+    assert aliases["nyt"] == "kiosque.website.nytimes"
+    # Nothing has been imported yet
+    assert "kiosque.website.theguardian" not in sys.modules
+
+
+def test_aliases_in_multi_website_modules(monkeypatch):
+    """Test that configured aliases resolve to the class of their website."""
+    from kiosque.core import website as website_module
+
+    monkeypatch.setattr(Website, "_module_cache", {})
+    monkeypatch.setattr(Website, "_alias_urls", {})
+    for url, alias in [
+        ("https://www.nikkei.com", "nk"),
+        ("https://asia.nikkei.com", "nka"),
+    ]:
+        monkeypatch.setitem(website_module.config_dict, url, {"alias": alias})
+
+    assert Website.website_class("nk").base_url == "https://www.nikkei.com/"
+    assert Website.website_class("nka").base_url == "https://asia.nikkei.com/"
+
+
+def test_instance_picks_matching_class():
+    """Test that the right class is selected in multi-website modules."""
+    Website._build_module_cache()
+    instance = Website.instance("https://asia.nikkei.com/some-article")
+    assert instance.base_url == "https://asia.nikkei.com/"
+    instance = Website.instance("https://www.nikkei.com/article/123")
+    assert instance.base_url == "https://www.nikkei.com/"
+
+
+def test_concurrent_login(monkeypatch):
+    """Test threads extracting articles of a website log in only once."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    logins = []
+
+    def login(self):
+        logins.append(threading.get_ident())
+        time.sleep(0.05)
+        self.__class__.connected = True
+
+    monkeypatch.setattr(MockWebsite, "login", login)
+    monkeypatch.setattr(MockWebsite, "connected", False)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(MockWebsite().ensure_login)
+    assert len(logins) == 1
+    assert MockWebsite.connected